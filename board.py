@@ -5,7 +5,14 @@ for setting and getting text to/from various locations outside of the grid.  It
 also draws an exit and reset button and provides methods for checking for mouse
 clicks inside of those regions.'''
 
+from contextlib import contextmanager
+
 from graphics import *
+from bogglehitmap import HitMap, EXIT, RESET, GRID
+from bogglewordlist import WordListView
+
+# spacing of the rows of the text area right of the grid
+_ROW_HEIGHT = 18
 
 class Board:
     # _win: graphical window on which we will draw our board
@@ -17,7 +24,8 @@ class Board:
 
     __slots__ = [ '_xInset', '_yInset', '_rows', '_cols', '_size', \
                   '_win', '_exitButton', '_resetButton', \
-                  '_textArea', '_lowerWord', '_upperWord', '_foundWords', '_scroll_position', '_max_visible_words']
+                  '_wordRows', '_lowerWord', '_upperWord', '_wordList', '_max_visible_words', \
+                  '_hitMap']
 
     def __init__(self, win, xInset=50, yInset=50, rows=3, cols=3, size=50):
         # update class attributes
@@ -26,10 +34,10 @@ class Board:
         self._size = size
         self._win = win
 
-        # Scroll-related attributes
-        self._foundWords = []
-        self._scroll_position = 0  # Starting at the top
+        # Scroll-related attributes: the text area right of the grid shows
+        # a window of _max_visible_words rows onto the lines in _wordList
         self._max_visible_words = 15  # Max number of words to display at once
+        self._wordList = WordListView(self._max_visible_words)
         
         self.drawBoard()
 
@@ -55,6 +63,27 @@ class Board:
     def getBoard(self):
         return self
 
+    @contextmanager
+    def batch(self):
+        '''
+        Holds back redrawing the window while the body of a with block
+        changes the board, then sends the changes to Tk in one batch
+        (see GraphWin.batch) and draws everything in one update.  Inside
+        another batch the outermost one does both.
+        '''
+        win = self._win
+        if win.isBatching():
+            yield self
+            return
+        autoflush = win.autoflush
+        win.autoflush = False
+        try:
+            with win.batch():
+                yield self
+        finally:
+            win.autoflush = autoflush
+            win.flush()
+
     def __makeTextArea(self, point, fontsize=18, color="black", text=""):
         """Creates a text area"""
         textArea = Text(point, text)
@@ -69,16 +98,20 @@ class Board:
         rect = Rectangle(point1, point2, fillcolor)
         rect.setWidth(2)
         rect.draw(self._win)
-        text = Text(rect.getCenter(), text)
-        text.setTextColor("black")
-        text.draw(self._win)
+        if text:
+            label = Text(rect.getCenter(), text)
+            label.setTextColor("black")
+            label.draw(self._win)
         return rect
 
     def __drawTextAreas(self):
         """Draw the text areas to the right/lower/upper side of main grid"""
-        # draw main text area (right of grid)
-        self._textArea = self.__makeTextArea(Point(self._xInset * self._rows + self._size * 2,
-                                                   self._yInset + 165), 14, color="#3F7D58")
+        # draw main text area (right of grid): one Text per visible row,
+        # reused for whichever lines are scrolled into view
+        x = self._xInset * self._rows + self._size * 2
+        top = self._yInset + 165 - (self._max_visible_words - 1) * _ROW_HEIGHT / 2
+        self._wordRows = [self.__makeTextArea(Point(x, top + _ROW_HEIGHT * i), 14, color="#3F7D58")
+                          for i in range(self._max_visible_words)]
         #draw the text area below grid
         self._lowerWord = self.__makeTextArea(Point(160, 275), color="#EF9651")
         #draw the text area above grid
@@ -114,6 +147,17 @@ class Board:
         self.__drawGrid()
         self.__drawTextAreas()
         self.__drawButtons()
+        self._hitMap = HitMap.forBoard(self._xInset, self._yInset, self._rows, self._cols,
+                                       self._size, self._resetButton._bounds(),
+                                       self._exitButton._bounds())
+
+    def hitTest(self, point):
+        '''
+        Returns what a Point (point) is on as (region, position): region is
+        EXIT, RESET, GRID or None, and position is the (col, row) of a GRID
+        hit and None otherwise.  One lookup in the map made by drawBoard.
+        '''
+        return self._hitMap.lookup(point.getX(), point.getY())
 
     # convert Point to grid position (tuple)
     def getPosition(self, point):
@@ -135,67 +179,63 @@ class Board:
             col = int((pX - self._xInset) / self._size)
         return (col, row)
 
-    # check for click inside specific rectangular region
-    def __inRect(self, point, rect):
-        '''
-        Returns True if a Point (point) exists inside a specific
-        Rectangle (rect) on screen.
-        '''
-        pX = point.getX()
-        pY = point.getY()
-        rLeft = rect.getP1().getX()
-        rTop = rect.getP1().getY()
-        rRight = rect.getP2().getX()
-        rBottom = rect.getP2().getY()
-        return pX > rLeft and pX < rRight and pY > rTop and pY < rBottom
-
     # check for click in grid
     def inGrid(self, point):
         '''
         Returns True if a Point (point) exists inside the grid of squares.
         '''
-        ptX = point.getX()
-        ptY = point.getY()
-        maxY = self._size * (self._rows + 1)
-        maxX = self._size * (self._cols + 1)
-        return ptX <= maxX and ptY <= maxY and ptX >= self._xInset and ptY >= self._yInset
+        return self.hitTest(point)[0] == GRID
 
     # clicked in exit button?
     def inExit(self, point):
         '''
         Returns true if point is inside exit button (rectangle)
         '''
-        return self.__inRect(point, self._exitButton)
+        return self.hitTest(point)[0] == EXIT
 
     # clicked in reset button?
     def inReset(self, point):
         '''
-        Returns true if point is inside exit button (rectangle)
+        Returns true if point is inside reset button (rectangle)
         '''
-        return self.__inRect(point, self._resetButton)
+        return self.hitTest(point)[0] == RESET
 
     # set text to text area on right
     def getStringFromTextArea(self):
         '''
-        Get text from text area to right of grid.
+        Get the visible text from text area to right of grid.
         '''
-        return self._textArea.getText()
+        return "\n".join(self._wordList.getVisible())
 
     # set text to text area on right
     def setStringToTextArea(self, text):
         '''
         Sets text to text area to right of grid. Overwrites existing text.
+        Lines that do not fit are reached by scrolling.
         '''
-        words_list = text.split("\n")  # Split words into list
-        start_idx = self._scroll_position
-        end_idx = min(self._scroll_position + self._max_visible_words, len(words_list))
-        
-        # Get only the portion of words that should be visible
-        visible_words = "\n".join(words_list[start_idx:end_idx])
+        self._wordList.setWords(text.split("\n") if text else [])
+        self.updateTextArea()
 
-        # Update the Text area with visible words
-        self._textArea.setText(visible_words)
-        #self._textArea.setText(text)
+    def getWordList(self):
+        '''
+        Returns the WordListView of the lines in the text area on right.
+        '''
+        return self._wordList
+
+    def getScrollPosition(self):
+        return self._wordList.getTop()
+
+    def updateTextArea(self):
+        '''
+        Shows the visible lines of the text area on right.  Only rows whose
+        text changed are redrawn, so this costs at most one Tk call per row
+        however long the list is.
+        '''
+        visible = self._wordList.getVisible()
+        for i, row in enumerate(self._wordRows):
+            text = visible[i] if i < len(visible) else ""
+            if row.getText() != text:
+                row.setText(text)
 
     # add text to text area below grid
     def getStringFromLowerText(self):
@@ -226,21 +266,38 @@ class Board:
         '''
         self._upperWord.setText(text)
 
+    def scrollWords(self, steps):
+        """
+        Scroll the word list down by steps rows (up if steps is negative).
+        """
+        if self._wordList.scroll(steps):
+            self.updateTextArea()
+
     def scrollWordsUp(self):
         """
-        Scroll the word list upwards by adjusting the scroll position.
+        Scroll the word list upwards, showing earlier words.
         """
-        if len(self.getStringFromTextArea().split("\n")) > self.max_visible_words:
-            self.scroll_position = min(self.scroll_position + 1, len(self.getStringFromTextArea().split("\n")) - self.max_visible_words)
-            self.setStringToTextArea(self.getStringFromTextArea())
+        self.scrollWords(-1)
 
     def scrollWordsDown(self):
         """
-        Scroll the word list downwards by adjusting the scroll position.
+        Scroll the word list downwards, showing later words.
+        """
+        self.scrollWords(1)
+
+    def setWordSort(self, sort):
+        """
+        Shows the word list in the order named sort (see bogglewordlist.SORTS).
+        """
+        self._wordList.setSort(sort)
+        self.updateTextArea()
+
+    def setWordFilter(self, text):
+        """
+        Shows only the words containing text ('' shows every word).
         """
-        if self.scroll_position > 0:
-            self.scroll_position -= 1
-            self.setStringToTextArea(self.getStringFromTextArea())
+        self._wordList.setFilter(text)
+        self.updateTextArea()
 
 
 if __name__ == "__main__":
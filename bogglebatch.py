@@ -0,0 +1,149 @@
+"""
+Solves a stream of boards from the command line, one board per input
+line (as written by boggledice.boardToText), and writes one JSON object
+per board to stdout:
+
+    {"line": 1, "board": "QuABC...", "count": 42, "score": 57, "words": [...]}
+
+score is the most a player could score on the board (every word found).
+A line that is not a board gets {"line": n, "error": "..."} instead.
+
+Lines are read lazily and handed to a pool of worker processes in
+chunks, with at most a few chunks per worker in flight; a chunk is only
+read once the oldest one has been written.  Memory therefore stays fixed
+however large the input, and a slow reader of stdout slows the whole
+pipeline instead of filling memory.  Results come out in input order.
+Nothing here imports Tk.
+
+Run with:  python -m bogglegame solve boards.txt --workers 4 > solutions.jsonl
+"""
+
+import json
+import math
+import sys
+from collections import deque
+from itertools import islice
+from multiprocessing import Pool
+
+from boggledice import boardFromText
+from bogglelexicon import readLexicon
+from bogglesolver import scoreWord, solveCached
+
+# set in every worker process by _initWorker
+_lexicon = None
+_shape = None
+
+def _initWorker(lexiconName, rows, cols):
+    global _lexicon, _shape
+    _lexicon = readLexicon(lexiconName)
+    _shape = (rows, cols)
+
+def solveLine(lineNumber, text, lexicon, rows=None, cols=None):
+    """
+    Returns the JSON result line for one input line.  Without rows and
+    cols the board must be square.
+    >>> from bogglelexicon import Lexicon
+    >>> solveLine(1, 'CATS', Lexicon(['cat', 'cats', 'act']))
+    '{"line": 1, "board": "CATS", "count": 3, "score": 3, "words": ["ACT", "CAT", "CATS"]}'
+    >>> solveLine(2, 'CAT', Lexicon(['cat']))
+    '{"line": 2, "error": "3 faces is not a square board"}'
+    """
+    text = text.strip()
+    try:
+        faces = boardFromText(text)
+        if rows is None or cols is None:
+            side = math.isqrt(len(faces))
+            if side * side != len(faces):
+                raise ValueError("{} faces is not a square board".format(len(faces)))
+            rows = cols = side
+        elif len(faces) != rows * cols:
+            raise ValueError("{} faces is not a {}x{} board".format(len(faces), rows, cols))
+    except ValueError as error:
+        return json.dumps({'line': lineNumber, 'error': str(error)})
+    words = sorted(solveCached(faces, rows, cols, lexicon))
+    return json.dumps({'line': lineNumber, 'board': text, 'count': len(words),
+                       'score': sum(scoreWord(word) for word in words), 'words': words})
+
+def _solveChunk(chunk):
+    """Solves (line number, text) pairs in a worker; returns the output text."""
+    return ''.join(solveLine(number, text, _lexicon, *_shape) + '\n' for number, text in chunk)
+
+def readChunks(lines, size):
+    """
+    Generates lists of at most size (line number, text) pairs, skipping
+    blank lines, reading lines only as chunks are asked for.
+    >>> list(readChunks(['AB', '', 'CD', 'EF'], 2))
+    [[(1, 'AB'), (3, 'CD')], [(4, 'EF')]]
+    """
+    numbered = ((number, text) for number, text in enumerate(lines, 1) if text.strip())
+    while True:
+        chunk = list(islice(numbered, size))
+        if not chunk:
+            return
+        yield chunk
+
+def solveStream(lines, out, workers=1, chunkSize=256, inFlight=4,
+                lexiconName='bogwords.txt', rows=None, cols=None):
+    """
+    Solves every board in lines (an iterable of text lines) and writes
+    the results to out in input order.  At most inFlight chunks per
+    worker are queued at once.  Returns the number of boards read.
+    """
+    chunks = readChunks(lines, chunkSize)
+    boards = 0
+    if workers == 1:
+        _initWorker(lexiconName, rows, cols)
+        for chunk in chunks:
+            out.write(_solveChunk(chunk))
+            boards += len(chunk)
+        return boards
+
+    with Pool(workers, _initWorker, (lexiconName, rows, cols)) as pool:
+        pending = deque()
+        for chunk in chunks:
+            # wait for the oldest chunk once the window is full
+            if len(pending) >= workers * inFlight:
+                out.write(pending.popleft().get())
+            pending.append(pool.apply_async(_solveChunk, (chunk,)))
+            boards += len(chunk)
+        while pending:
+            out.write(pending.popleft().get())
+    return boards
+
+
+def main(argv=None):
+    import argparse
+    import os
+    import time
+    parser = argparse.ArgumentParser(prog='python -m bogglegame solve',
+                                     description="Solve boards read one per line, as JSON Lines")
+    parser.add_argument('input', nargs='?', default='-', help="file of boards (- for stdin)")
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--chunk', type=int, default=256, help="boards per task")
+    parser.add_argument('--in-flight', type=int, default=4,
+                        help="chunks queued per worker before reading more input")
+    parser.add_argument('--rows', type=int, help="rows of every board (default: square boards)")
+    parser.add_argument('--cols', type=int)
+    parser.add_argument('--lexicon', default='bogwords.txt')
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    lines = sys.stdin if args.input == '-' else open(args.input)
+    try:
+        boards = solveStream(lines, sys.stdout, args.workers, args.chunk, args.in_flight,
+                             args.lexicon, args.rows, args.cols)
+    except BrokenPipeError:
+        # the reader went away (e.g. piped into head); stop quietly
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return
+    finally:
+        if lines is not sys.stdin:
+            lines.close()
+    sys.stdout.flush()
+    seconds = time.perf_counter() - start
+    print("{} boards in {:.1f}s ({:.0f} boards/s)".format(
+        boards, seconds, boards / seconds if seconds else 0.0), file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,262 @@
+"""
+Micro-benchmarks of the graphical front end.  Each one drives a real
+GraphWin and BoggleBoard (so it needs a display) and reports what one
+user action costs.  clickAllocations checks the memory cost of a click
+on a HeadlessBoard, so its doctest guards against regressions anywhere.
+
+    clicks   memory, Points and time per handled mouse click: the Point
+             made by checkMouse plus the hit test BoggleGame runs on it
+    words    time and Text updates per scroll step of the found words list,
+             for lists of growing length
+    reshake  Tk canvas calls, time and items left on the canvas per shake
+             of the board
+    recolour Tcl round trips and time to recolour every tile of grids of
+             growing size, one call per change and batched (GraphWin.batch)
+
+Run with:  python bogglebench.py clicks --count 10000
+"""
+
+import time
+import tracemalloc
+
+def _clickSpots():
+    """Window coordinates of every tile, both buttons and an empty spot."""
+    spots = [(75 + 50 * col, 75 + 50 * row) for col in range(4) for row in range(4)]
+    return spots + [(100, 325), (210, 325), (350, 350)]
+
+def _handleClick(win, board, x, y):
+    """Queues a click at (x, y) as Tk's handler would, then does what
+    BoggleGame.doOneClick does before it looks at the game."""
+    win.mouseX = x
+    win.mouseY = y
+    point = win.checkMouse()
+    return board.hitTest(point)
+
+def _measureClicks(handle, count, spots=None):
+    """Calls handle(x, y) count times over spots (by default the click
+    spots of _clickSpots).  Returns
+    (peak bytes, Points created) per click.  Peak bytes is the most
+    memory held at once while one click is handled, measured by
+    tracemalloc; it is freed again when the click is done."""
+    import graphics
+    spots = spots or _clickSpots()
+    peak = 0
+    tracemalloc.start()
+    for i in range(count):
+        x, y = spots[i % len(spots)]
+        tracemalloc.reset_peak()
+        base = tracemalloc.get_traced_memory()[0]
+        handle(x, y)
+        peak += tracemalloc.get_traced_memory()[1] - base
+    tracemalloc.stop()
+
+    # count Points by wrapping the constructor for one more pass
+    created = [0]
+    init = graphics.Point.__init__
+    def countingInit(self, x, y):
+        created[0] += 1
+        init(self, x, y)
+    graphics.Point.__init__ = countingInit
+    try:
+        for i in range(count):
+            handle(*spots[i % len(spots)])
+    finally:
+        graphics.Point.__init__ = init
+    return (peak / count, created[0] / count)
+
+def benchClicks(win, board, count=10000):
+    """
+    Handles count clicks spread over the board.  Returns (peak bytes,
+    Points created, microseconds) per click (see _measureClicks).
+    """
+    spots = _clickSpots()
+
+    # time without tracing, which slows every allocation down
+    start = time.perf_counter()
+    for i in range(count):
+        _handleClick(win, board, *spots[i % len(spots)])
+    micros = (time.perf_counter() - start) / count * 1e6
+
+    peak, points = _measureClicks(lambda x, y: _handleClick(win, board, x, y), count)
+    return (peak, points, micros)
+
+def clickAllocations(count=1000):
+    """
+    Returns (peak bytes, Points created) per click for BoggleGame.doOneClick
+    on a HeadlessBoard, given the graphics.Point a window's checkMouse
+    makes, so no display is needed.  Clicks go to every tile, the exit
+    button and an empty spot (not reset, which starts a new round).
+    Before Point had __slots__ and shared its default config, the same
+    clicks peaked at 408 bytes; they now peak at 136.
+    >>> peak, points = clickAllocations()
+    >>> peak < 408 / 2, points
+    (True, 1.0)
+    """
+    from random import Random
+    from graphics import Point
+    from bogglegame import BoggleGame
+    from headlessboard import HeadlessBoard
+    game = BoggleGame(None, board=HeadlessBoard(rng=Random(0)))
+    spots = _clickSpots()
+    del spots[-3]
+
+    def handle(x, y):
+        game.doOneClick(Point(x, y))
+
+    # warm up, so caches filled by the first calls are not counted
+    for x, y in spots:
+        handle(x, y)
+    return _measureClicks(handle, count, spots)
+
+
+def benchWordList(board, sizes=(100, 1000, 10000), count=2000):
+    """
+    Fills the found words list with each number of words in sizes and
+    scrolls through it a row at a time.  Returns a list of (size, Text
+    updates, microseconds) per scroll step.
+    """
+    import graphics
+    updates = [0]
+    setText = graphics.Text.setText
+    def countingSetText(self, text):
+        updates[0] += 1
+        setText(self, text)
+
+    results = []
+    for size in sizes:
+        board.setFoundWords(['W{:06d}'.format(i) for i in range(size)])
+        span = max(size - board.getWordList().getRows(), 1)
+        graphics.Text.setText = countingSetText
+        updates[0] = 0
+        start = time.perf_counter()
+        try:
+            for i in range(count):
+                # down to the end and back up again
+                board.scrollWords(1 if i // span % 2 == 0 else -1)
+        finally:
+            graphics.Text.setText = setText
+        results.append((size, updates[0] / count, (time.perf_counter() - start) / count * 1e6))
+    return results
+
+
+# the canvas methods that each make one round trip to Tcl
+_CANVAS_CALLS = ['create_rectangle', 'create_text', 'create_image', 'create_line',
+                 'create_oval', 'create_polygon', 'itemconfig', 'itemconfigure',
+                 'coords', 'delete', 'tag_raise', '_itemconfigBatch']
+
+def benchReshake(win, board, count=1000):
+    """
+    Shakes the board count times.  Returns (Tk calls, microseconds, items
+    added to the window) per shake; the calls are counted by wrapping
+    the window's canvas methods.
+    """
+    calls = [0]
+    def counting(method):
+        def call(*args, **options):
+            calls[0] += 1
+            return method(*args, **options)
+        return call
+
+    items = len(win.items)
+    start = time.perf_counter()
+    for i in range(count):
+        board.shakeCubes()
+    micros = (time.perf_counter() - start) / count * 1e6
+    added = (len(win.items) - items) / count
+
+    for name in _CANVAS_CALLS:
+        setattr(win, name, counting(getattr(win, name)))
+    try:
+        for i in range(count):
+            board.shakeCubes()
+    finally:
+        for name in _CANVAS_CALLS:
+            delattr(win, name)
+    return (calls[0] / count, micros, added)
+
+
+def benchRecolour(sides=(4, 6, 8, 10, 12), count=200):
+    """
+    Draws a side x side grid of tiles for each side in sides and
+    recolours every tile count times, first unbatched and then in one
+    batch.  Returns a list of (tiles, Tcl round trips, microseconds,
+    batched round trips, batched microseconds) per recolour.
+    """
+    from graphics import GraphWin
+    from board import Board
+    from boggleletter import BoggleLetter
+    colors = [('black', 'white'), ('blue', 'powder blue')]
+
+    results = []
+    for side in sides:
+        size = 300 // side
+        win = GraphWin("Boggle benchmark", 400, 400, autoflush=False)
+        try:
+            board = Board(win, rows=side, cols=side, size=size)
+            letters = [BoggleLetter(board, col, row, 'A')
+                       for col in range(side) for row in range(side)]
+            calls = [0]
+            def counting(method):
+                def call(*args, **options):
+                    calls[0] += 1
+                    return method(*args, **options)
+                return call
+            win.itemconfig = counting(win.itemconfig)
+            win._itemconfigBatch = counting(win._itemconfigBatch)
+
+            def recolour(i):
+                for letter in letters:
+                    letter.setColors(*colors[i % 2])
+            result = [len(letters)]
+            for batched in (False, True):
+                calls[0] = 0
+                start = time.perf_counter()
+                for i in range(count):
+                    if batched:
+                        with win.batch():
+                            recolour(i)
+                    else:
+                        recolour(i)
+                result += [calls[0] / count, (time.perf_counter() - start) / count * 1e6]
+            results.append(tuple(result))
+        finally:
+            win.close()
+    return results
+
+
+def main(argv=None):
+    import argparse
+    from graphics import GraphWin
+    from boggleboard import BoggleBoard
+    parser = argparse.ArgumentParser(description="Benchmark the graphical front end")
+    parser.add_argument('bench', choices=['clicks', 'words', 'reshake', 'recolour'])
+    parser.add_argument('--sprites', action='store_true', help="draw tiles as sprites")
+    parser.add_argument('--count', type=int, default=10000)
+    args = parser.parse_args(argv)
+
+    win = GraphWin("Boggle benchmark", 400, 400)
+    board = BoggleBoard(win, sprites=args.sprites)
+    try:
+        if args.bench == 'clicks':
+            peak, points, micros = benchClicks(win, board, args.count)
+            print("{:.0f} bytes peak, {:.1f} Points, {:.1f} us per click".format(
+                peak, points, micros))
+        elif args.bench == 'words':
+            for size, updates, micros in benchWordList(board, count=args.count):
+                print("{} words: {:.1f} Text updates, {:.1f} us per scroll step".format(
+                    size, updates, micros))
+        elif args.bench == 'reshake':
+            calls, micros, added = benchReshake(win, board, args.count)
+            print("{:.1f} Tk calls, {:.1f} us, {:.1f} items added per shake".format(
+                calls, micros, added))
+        elif args.bench == 'recolour':
+            for tiles, calls, micros, batchCalls, batchMicros in benchRecolour(
+                    count=max(args.count // 50, 1)):
+                print("{} tiles: {:.0f} round trips, {:.0f} us; batched {:.0f}, {:.0f} us".format(
+                    tiles, calls, micros, batchCalls, batchMicros))
+    finally:
+        win.close()
+
+
+if __name__ == "__main__":
+    main()
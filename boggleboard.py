@@ -4,88 +4,61 @@ Extends the Board class with specific features required for Boggle
 
 from graphics import *
 from brandom import *
+from boggledice import CUBES, rollDie, shakeDice
+from bogglehitmap import GRID
 from boggleletter import BoggleLetter
+from bogglesprites import SpriteCache, SpriteLetter
 from board import Board
 
 class BoggleBoard(Board):
     """Boggle Board class implements the functionality of a Boggle board.
     It inherits from the Board class and extends it by creating a grid
-    of BoggleLetters, shaken appropriately to randomize play."""
+    of BoggleLetters, shaken appropriately to randomize play.
+    With sprites=True the tiles are drawn as cached sprite images
+    (see bogglesprites) instead of a Rectangle and Text each."""
 
-    __slots__ = ['_grid', "_cubes"]
+    __slots__ = ['_grid', "_cubes", "_dice", "_sprites"]
 
-    def __init__(self, win):
+    def __init__(self, win, sprites=False):
         super().__init__(win, rows=4, cols=4)
+        self._sprites = SpriteCache(win, self._size) if sprites else None
+
+        self._cubes = CUBES
+        self._dice = None
 
-        self._foundWords = []  # Track found words
-        self._max_visible_words = 15  # Max number of words that can be visible at once
-        self._scroll_position = 0
-
-        self._cubes =  [[ "A", "A", "C", "I", "O", "T" ],
-                        [ "T", "Y", "A", "B", "I", "L" ],
-                        [ "J", "M", "O", "Qu", "A", "B"],
-                        [ "A", "C", "D", "E", "M", "P" ],
-                        [ "A", "C", "E", "L", "S", "R" ],
-                        [ "A", "D", "E", "N", "V", "Z" ],
-                        [ "A", "H", "M", "O", "R", "S" ],
-                        [ "B", "F", "I", "O", "R", "X" ],
-                        [ "D", "E", "N", "O", "S", "W" ],
-                        [ "D", "K", "N", "O", "T", "U" ],
-                        [ "E", "E", "F", "H", "I", "Y" ],
-                        [ "E", "G", "I", "N", "T", "V" ],
-                        [ "E", "G", "K", "L", "U", "Y" ],
-                        [ "E", "H", "I", "N", "P", "S" ],
-                        [ "E", "L", "P", "S", "T", "U" ],
-                        [ "G", "I", "L", "R", "U", "W" ]]
- 
         self._grid = [] #initializes empty list of lists
         for col in range(self._cols):
             grid_col = [] #iterate over each column to create the inner lists
             for row in range(self._rows): #for every instance of row in the columns
-                letter = BoggleLetter(self.getBoard(), col, row) #create new boggle letter
+                letter = self._makeLetter(col, row) #create new boggle letter
                 grid_col.append(letter) #add empty boggle letters to column
             self._grid.append(grid_col) #add column to the grid
         self.shakeCubes()
         
+    def _makeLetter(self, col, row, face=""):
+        """Draws a new tile at (col, row) in the board's rendering mode."""
+        if self._sprites is not None:
+            return SpriteLetter(self.getBoard(), self._sprites, col, row, face)
+        return BoggleLetter(self.getBoard(), col, row, face)
+
     def addFoundWord(self, word):
         """
-        Add a found word to the list, update the text area, and trigger scroll functionality.
+        Add a found word to the list and update the text area, scrolling
+        to show the newest word.
         """
-        if word not in self._foundWords:
-            self._foundWords.append(word)
-        if len(self._foundWords) > self._max_visible_words:
-            self._scroll_position += 1
+        if word not in self._wordList:
+            self._wordList.addWord(word)
         self.updateTextArea()
 
-    def updateTextArea(self):
-        """
-        This method updates the text area to display the current found words list
-        based on the scroll position.
-        """
-        # Get the words to display (consider scroll position)
-        visible_words = self._foundWords[self._scroll_position:self._scroll_position + self._max_visible_words]
-
-        # Join the words into a string
-        wordsString = '\n'.join(visible_words)
-
-        # Update the text area
-        self.setStringToTextArea(wordsString)
-
-    def scrollWordsUp(self):
-        """
-        Override the scroll behavior to update the text area with new words.
-        """
-        if self._scroll_position > 0:
-            self._scroll_position -= 1
-            self.updateTextArea() 
+    def getFoundWords(self):
+        return self._wordList.getWords()
 
-    def scrollWordsDown(self):
+    def setFoundWords(self, words, scrollPosition=0):
         """
-        Scroll down the word list if the user scrolls down.
+        Replaces the found words list and its scroll position.
         """
-        if self._scroll_position + self._max_visible_words < len(self._foundWords):
-            self._scroll_position += 1
-            self.updateTextArea() 
+        self._wordList.setWords(words, scrollPosition)
+        self.updateTextArea()
 
     def getBoggleLetterAtPoint(self, point):
         """
@@ -105,77 +78,110 @@ class BoggleBoard(Board):
         >>> win.close()
         """
         # If we click inside of the grid... 
-        if self.inGrid(point):
-            (col, row) = self.getPosition(point)
+        region, position = self.hitTest(point)
+        if region == GRID:
             # retrieve the grid coordinates of the click
+            (col, row) = position
             return self._grid[col][row]
         else:
             return None
 
+    def getBoggleLetter(self, col, row):
+        """
+        Returns the BoggleLetter at grid position (col, row).
+        """
+        return self._grid[col][row]
+
+    def getFaces(self):
+        """
+        Returns the list of faces on the board, column by column (the
+        order in which shakeCubes fills the grid).
+        """
+        return [letter.getLetter() for column in self._grid for letter in column]
+
+    def getCubes(self):
+        """Returns the dice shakeCubes rolls."""
+        return self._cubes
+
+    def getDice(self):
+        """Returns the die (index into getCubes()) in every cell, column
+        by column, or None if the faces were not shaken."""
+        return self._dice
+
     def resetColors(self):
         """
         "Unclicks" all boggle letters on the board without changing any
         other attributes.  (Change letter colors back to default values.)
         """
-        # Go through every square on the grid and reset text and square colors to default.
-        for col in self._grid:
-            for row in col:
-                row.setTextColor('black')
-                row.setFillColor('white')
+        # Go through every square on the grid and reset text and square colors
+        # to default, sending every change to Tk at once.
+        with self.batch():
+            for col in self._grid:
+                for row in col:
+                    row.setColors('black', 'white')
 
-    def reset(self):
+    def reset(self, rng=None):
         """
         Clears the boggle board by clearing letters and colors,
         clears all text areas (right, lower, upper) on board
-        and resets the letters on board by calling shakeCubes.
+        and resets the letters on board by calling shakeCubes(rng).
         """
         # Reset colors, clear all text areas, and shake the cubes for a new pattern.
-        self.resetColors()
-        self._foundWords = [] 
-        self._scroll_position = 0
-        self.setStringToTextArea('')
-        self.setStringToUpperText('')
-        self.setStringToLowerText('')
-        self.shakeCubes()
+        with self.batch():
+            self.resetColors()
+            self.setStringToTextArea('')
+            self.setStringToUpperText('')
+            self.setStringToLowerText('')
+            self.shakeCubes(rng)
 
-    def shakeCubes(self):
+    def shakeCubes(self, rng=None):
         """
         Shakes the boggle board and sets letters as described by the handout.
+        Random numbers come from rng (e.g. brandom.boardRandom) if given,
+        otherwise from the global generator.
         """
-        faceList = []
-        # Shuffle the lists representing cubes in the list of lists self._cubes
-        shuffledVersion = shuffled(self._cubes)
-        # Iterating through each die
-        for dieList in shuffledVersion:
-            # Call a random face for each die
-            face = dieList[randomInt(0, 5)]
-            # Append the random face to a list of faces
-            faceList.append(face)
-          
-        x = 0
-        for col in range(self._cols):
-            for row in range(self._rows):
-                # For each coordinate in the grid, give it a face value from the list of faces.
-                face = faceList[x] 
-                x += 1
-                self._grid[col][row] = BoggleLetter(self.getBoard(), col, row, face)
-                
+        # Shuffle the cubes and pick a random face for each die; the tiles
+        # already drawn just show the new faces
+        dice, faces = shakeDice(self._cubes, rng)
+        self.setFaces(faces)
+        # remember which die is in each cell so it can be rolled again
+        self._dice = dice
 
+    def rerollDie(self, col, row, rng=None):
+        """
+        Rolls the die at (col, row) again and shows its new face, which is
+        returned.  Returns None if the dice are not known (the faces were
+        set with setFaces rather than shaken).
+        """
+        if self._dice is None:
+            return None
+        face = rollDie(self._cubes[self._dice[col * self._rows + row]], rng)
+        self._grid[col][row].setLetter(face)
+        return face
 
+    def setFaces(self, faces):
+        """
+        Sets the letters on the board to faces (listed column by column, as
+        returned by getFaces) without creating new graphical objects.
+        """
+        self._dice = None
+        x = 0
+        with self.batch():
+            for col in range(self._cols):
+                for row in range(self._rows):
+                    self._grid[col][row].setLetter(faces[x])
+                    x += 1
 
     def __str__(self):
         """
         Returns a string representation of this BoggleBoard
         """
-        board = ''
+        lines = []
         for r in range(self._rows):
-            for c in range(self._cols):
-                boggleLetter = self._grid[c][r]
-                color = boggleLetter.getTextColor()
-                letter = boggleLetter.getLetter()
-                board += '[{}:{}] '.format(letter,color)
-            board += '\n'
-        return board
+            lines.append(''.join('[{}:{}] '.format(self._grid[c][r].getLetter(),
+                                                   self._grid[c][r].getTextColor())
+                                 for c in range(self._cols)))
+        return '\n'.join(lines) + '\n'
 
 
 if __name__ == "__main__":
@@ -195,8 +201,10 @@ if __name__ == "__main__":
     
     keepGoing = True
     while keepGoing:
-        pt = win.getMouse()
-        if board.inExit(pt):
+        pt = win.checkMouse()
+        if pt is None:
+            update(30)
+        elif board.inExit(pt):
             keepGoing = False
         elif board.inGrid(pt):
             (col, row) = board.getPosition(pt)
@@ -0,0 +1,94 @@
+"""
+Generates shaken boards in bulk with NumPy.  A batch of N boards is an
+(N, 16) uint8 array of face codes (indices into boggledice.FACES), laid
+out column by column like boggledice faces, produced in a few vectorized
+passes instead of one shuffle and sixteen randomInt calls per board.
+
+Requires NumPy; the rest of the game does not.
+"""
+
+import numpy as np
+
+from boggledice import CUBES, FACES, FACE_CODES
+
+def cubeCodes(cubes=CUBES):
+    """
+    Returns the dice as a (dice, sides) uint8 array of face codes.
+    >>> cubeCodes([['A', 'Qu'], ['B', 'Z']]).tolist()
+    [[0, 26], [1, 25]]
+    """
+    return np.array([[FACE_CODES[face] for face in die] for die in cubes], dtype=np.uint8)
+
+def generateBoards(count, rng=None, cubes=CUBES):
+    """
+    Returns a (count, dice) uint8 array of shaken boards.  rng is a
+    numpy.random.Generator (a fresh unseeded one if None).  Every row is a
+    random permutation of the dice with one random face rolled per die.
+    Makes about 8.5 million boards a second (bogglebulk.py --boards
+    5000000), against 9.2 million when the dice were ordered by float32
+    keys, which sometimes tied.
+    >>> boards = generateBoards(1000, np.random.default_rng(0))
+    >>> boards.shape, boards.dtype.name
+    ((1000, 16), 'uint8')
+    >>> int((boards == FACE_CODES['Qu']).sum(axis=1).max())   # one die has Qu
+    1
+    """
+    if rng is None:
+        rng = np.random.default_rng()
+    codes = cubeCodes(cubes)
+    dice, sides = codes.shape
+    # sorting random keys gives an independent permutation of the dice per
+    # row; float32 keys have only 24 random bits, so about one board in
+    # 140,000 had tied keys and kept those dice in order, and 64 bit keys
+    # make that about one in 10**17
+    keys = rng.integers(0, np.iinfo(np.uint64).max, size=(count, dice),
+                        dtype=np.uint64, endpoint=True)
+    order = np.argsort(keys, axis=1)
+    rolls = rng.integers(0, sides, size=(count, dice), dtype=np.uint8)
+    return codes.ravel()[order * sides + rolls]
+
+def boardChunks(total, seed=0, chunkSize=1 << 20, cubes=CUBES):
+    """
+    Generates total boards as successive arrays of at most chunkSize rows.
+    Chunk k is drawn from its own stream seeded by (seed, k), so any chunk
+    can be regenerated, or handed to another process, on its own.
+    """
+    chunk = 0
+    while total > 0:
+        count = min(total, chunkSize)
+        yield generateBoards(count, np.random.default_rng([seed, chunk]), cubes)
+        total -= count
+        chunk += 1
+
+def facesFromCodes(row):
+    """
+    Returns the list of faces for one row of a board array.
+    >>> facesFromCodes(np.array([26, 0, 19], dtype=np.uint8))
+    ['Qu', 'A', 'T']
+    """
+    return [FACES[code] for code in row.tolist()]
+
+def codesFromFaces(faces):
+    """Returns the uint8 array row for a list of faces."""
+    return np.array([FACE_CODES[face] for face in faces], dtype=np.uint8)
+
+
+def main(argv=None):
+    import argparse
+    import time
+    parser = argparse.ArgumentParser(description="Benchmark bulk board generation")
+    parser.add_argument('--boards', type=int, default=10_000_000)
+    parser.add_argument('--chunk', type=int, default=1 << 20)
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    generated = 0
+    for boards in boardChunks(args.boards, chunkSize=args.chunk):
+        generated += len(boards)
+    elapsed = time.perf_counter() - start
+    print("{} boards in {:.2f}s ({:.1f} million boards/s)".format(
+        generated, elapsed, generated / elapsed / 1e6))
+
+
+if __name__ == "__main__":
+    main()
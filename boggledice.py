@@ -0,0 +1,96 @@
+"""
+The sixteen Boggle dice and the headless parts of shaking them, so that
+boards can be generated without opening a graphics window.
+
+A board is described by its list of faces (strs such as "A" or "Qu").
+Faces are listed in the order BoggleBoard.shakeCubes fills the grid,
+column by column, so the face at (col, row) is faces[col * rows + row].
+"""
+
+import re
+
+from brandom import shuffled, randomInt, boardRandom
+
+CUBES = [[ "A", "A", "C", "I", "O", "T" ],
+         [ "T", "Y", "A", "B", "I", "L" ],
+         [ "J", "M", "O", "Qu", "A", "B"],
+         [ "A", "C", "D", "E", "M", "P" ],
+         [ "A", "C", "E", "L", "S", "R" ],
+         [ "A", "D", "E", "N", "V", "Z" ],
+         [ "A", "H", "M", "O", "R", "S" ],
+         [ "B", "F", "I", "O", "R", "X" ],
+         [ "D", "E", "N", "O", "S", "W" ],
+         [ "D", "K", "N", "O", "T", "U" ],
+         [ "E", "E", "F", "H", "I", "Y" ],
+         [ "E", "G", "I", "N", "T", "V" ],
+         [ "E", "G", "K", "L", "U", "Y" ],
+         [ "E", "H", "I", "N", "P", "S" ],
+         [ "E", "L", "P", "S", "T", "U" ],
+         [ "G", "I", "L", "R", "U", "W" ]]
+
+# every face that can appear on a die, in code order: a face is stored as
+# its index in FACES wherever boards are packed into bytes or arrays
+FACES = [chr(ord('A') + i) for i in range(26)] + ['Qu']
+FACE_CODES = {face: code for code, face in enumerate(FACES)}
+
+_FACE = re.compile('[A-Z]u?')
+
+def shakeDice(cubes=CUBES, rng=None):
+    """
+    Shuffles the dice and rolls each one.  Returns (dice, faces): the
+    index in cubes of the die at each cell, and the face it shows.  Makes
+    the same random calls as shakeFaces.
+    >>> dice, faces = shakeDice()
+    >>> sorted(dice) == list(range(16)), all(face in CUBES[die] for die, face in zip(dice, faces))
+    (True, True)
+    """
+    dice = shuffled(range(len(cubes)), rng)
+    return dice, [rollDie(cubes[die], rng) for die in dice]
+
+def shakeFaces(cubes=CUBES, rng=None):
+    """
+    Shuffles the dice and rolls each one, returning the list of faces.
+    Random numbers come from rng if given (see brandom).
+    >>> faces = shakeFaces()
+    >>> len(faces)
+    16
+    """
+    return shakeDice(cubes, rng)[1]
+
+def rollDie(die, rng=None):
+    """Returns a random face of die (a list of faces)."""
+    return die[randomInt(0, len(die) - 1, rng)]
+
+def shakeBoard(boardId, seed=0, cubes=CUBES):
+    """
+    Returns the faces of board number boardId in the sequence of boards
+    generated from seed.  The result does not depend on which boards were
+    generated before, or where.
+    >>> shakeBoard(12, seed=3) == shakeBoard(12, seed=3)
+    True
+    """
+    return shakeFaces(cubes, boardRandom(boardId, seed))
+
+def boardToText(faces):
+    """
+    Returns a compact text form of a board, e.g. "QuABC...".
+    >>> boardToText(['Qu', 'A', 'B'])
+    'QuAB'
+    """
+    return ''.join(faces)
+
+def boardFromText(text):
+    """
+    Returns the list of faces described by text (see boardToText).
+    >>> boardFromText('QuAB')
+    ['Qu', 'A', 'B']
+    """
+    faces = _FACE.findall(text)
+    if ''.join(faces) != text:
+        raise ValueError("not a board: {!r}".format(text))
+    return faces
+
+
+if __name__ == "__main__":
+    from doctest import testmod
+    testmod()
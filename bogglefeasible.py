@@ -0,0 +1,144 @@
+"""
+Finds the lexicon words that some roll of a set of dice can spell.  A
+word is feasible if its letters can be split into faces ("Qu" counts as
+one face) and every face given a different die showing it: a bipartite
+matching of faces to dice.  Words needing three Zs, or a Q without its
+U, can never be on a board of the standard dice, so solvers and the
+server can work from the smaller, feasible lexicon and refuse such
+words without searching a board.
+"""
+
+from boggledice import CUBES
+from bogglelexicon import readLexicon
+
+class DiceIndex:
+    """A dice index has the following attributes:
+       *  _dice is the number of dice
+       *  _diceByFace maps an upper case face ("QU") to the tuple of dice
+          (indices) that have it
+       *  _longest is the length of the longest face
+       *  _known caches feasibility by sorted tuple of faces, so every
+          anagram of a word is matched once
+    """
+
+    __slots__ = ['_dice', '_diceByFace', '_longest', '_known']
+
+    def __init__(self, cubes=CUBES):
+        self._dice = len(cubes)
+        diceByFace = {}
+        for die, faces in enumerate(cubes):
+            for face in set(faces):
+                diceByFace.setdefault(face.upper(), []).append(die)
+        self._diceByFace = {face: tuple(dice) for face, dice in diceByFace.items()}
+        self._longest = max(len(face) for face in self._diceByFace)
+        self._known = {}
+
+    def spellings(self, word):
+        """
+        Returns every way of splitting word into faces of the dice.
+        >>> index = DiceIndex([['Qu', 'I'], ['T', 'U'], ['Q', 'A']])
+        >>> index.spellings('QUIT')
+        [('Q', 'U', 'I', 'T'), ('QU', 'I', 'T')]
+        >>> DiceIndex().spellings('QAT')
+        []
+        """
+        word = word.upper()
+        found = []
+
+        def split(start, faces):
+            if start == len(word):
+                found.append(tuple(faces))
+                return
+            for end in range(start + 1, min(start + self._longest, len(word)) + 1):
+                face = word[start:end]
+                if face in self._diceByFace:
+                    faces.append(face)
+                    split(end, faces)
+                    faces.pop()
+
+        split(0, [])
+        return found
+
+    def __matches(self, faces):
+        """Returns True if every face can be given a different die."""
+        owner = [None] * self._dice
+
+        def augment(i, seen):
+            # Kuhn's augmenting path search
+            for die in self._diceByFace[faces[i]]:
+                if die not in seen:
+                    seen.add(die)
+                    if owner[die] is None or augment(owner[die], seen):
+                        owner[die] = i
+                        return True
+            return False
+
+        return all(augment(i, set()) for i in range(len(faces)))
+
+    def canSpell(self, word):
+        """
+        Returns True if some roll of the dice shows every face of word
+        (on any board, not necessarily along a path).
+        >>> index = DiceIndex()
+        >>> index.canSpell('QUIZ'), index.canSpell('QAT'), index.canSpell('PIZZAZZ')
+        (True, False, False)
+        """
+        for faces in self.spellings(word):
+            if len(faces) > self._dice:
+                continue
+            key = tuple(sorted(faces))
+            feasible = self._known.get(key)
+            if feasible is None:
+                feasible = self._known[key] = self.__matches(key)
+            if feasible:
+                return True
+        return False
+
+    def prune(self, lexicon):
+        """Returns a Lexicon of the words of lexicon the dice can spell.
+        The prefix tree is shared with lexicon wherever nothing was removed."""
+        lexicon = lexicon.snapshot()
+        return lexicon.withChanges(removals=[word for word in lexicon
+                                             if not self.canSpell(word)])
+
+
+# indexes and pruned lexicons already built, keyed by dice set
+_indexes = {}
+_pruned = {}
+
+def _diceKey(cubes):
+    return tuple(tuple(die) for die in cubes)
+
+def diceIndex(cubes=CUBES):
+    """Returns the DiceIndex of cubes, shared by every caller."""
+    key = _diceKey(cubes)
+    index = _indexes.get(key)
+    if index is None:
+        index = _indexes[key] = DiceIndex(cubes)
+    return index
+
+def feasibleLexicon(lexicon=None, cubes=CUBES):
+    """
+    Returns the words of lexicon (a Lexicon or LiveLexicon) that the dice
+    can spell, as a Lexicon.  Any word on a board rolled with these dice
+    is in it, so solving such a board with it gives the same words.  The
+    result is kept until the lexicon is updated.
+    >>> from bogglelexicon import Lexicon
+    >>> sorted(feasibleLexicon(Lexicon(['quiz', 'qat', 'zoo', 'buzz'])))
+    ['QUIZ', 'ZOO']
+    """
+    if lexicon is None:
+        lexicon = readLexicon()
+    snapshot = lexicon.snapshot()
+    key = _diceKey(cubes)
+    cached = _pruned.get(key)
+    if cached is not None and cached[0] is snapshot:
+        return cached[1]
+    pruned = diceIndex(cubes).prune(snapshot)
+    _pruned[key] = (snapshot, pruned)
+    return pruned
+
+
+if __name__ == "__main__":
+    from doctest import testmod
+    testmod()
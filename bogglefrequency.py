@@ -0,0 +1,237 @@
+"""
+Estimates how often each lexicon word appears on a randomly shaken board,
+for puzzle design.  Worker processes shake and solve boards in batches
+and add the words found to shared counters: one array per worker (its
+last slot counting that worker's boards), each with its own lock, so
+workers never wait for one another.  The parent reads the counters
+while the workers run and stops them once every word's probability is
+known to the requested precision (the half-width of its Wilson score
+interval), or once enough boards have been solved.
+
+Board n is always brandom.boardRandom(n, seed) shaken, so estimates for
+a seed are reproducible up to where the run stopped.
+
+Run with:  python bogglefrequency.py --precision 0.005 --workers 4
+"""
+
+import math
+import time
+from collections import Counter
+from multiprocessing import Array, Event, Process
+
+from boggledice import CUBES, shakeFaces
+from bogglefeasible import feasibleLexicon
+from bogglelexicon import readLexicon
+from bogglesolver import solveFrom
+from brandom import boardRandom
+
+def wilsonInterval(hits, trials, z=1.96):
+    """
+    Returns the (low, high) Wilson score interval of the probability of
+    an event seen hits times in trials trials (95% for z=1.96).
+    >>> low, high = wilsonInterval(50, 100)
+    >>> round(low, 3), round(high, 3)
+    (0.404, 0.596)
+    >>> wilsonInterval(0, 0)
+    (0.0, 1.0)
+    """
+    if not trials:
+        return (0.0, 1.0)
+    p = hits / trials
+    z2 = z * z
+    center = (p + z2 / (2 * trials)) / (1 + z2 / trials)
+    spread = z * math.sqrt(p * (1 - p) / trials + z2 / (4 * trials * trials)) / (1 + z2 / trials)
+    return (max(0.0, center - spread), min(1.0, center + spread))
+
+def halfWidth(counts, trials, z=1.96):
+    """
+    Returns the widest interval half-width over the words counted.  The
+    Wilson interval is widest for the probability nearest 1/2, so only
+    that count is checked.
+    >>> round(halfWidth([3, 40, 7], 100), 4)
+    0.0943
+    """
+    if not trials:
+        return 1.0
+    nearest = min(counts, key=lambda hits: abs(2 * hits - trials), default=0)
+    low, high = wilsonInterval(nearest, trials, z)
+    return (high - low) / 2
+
+
+class OccurrenceEstimate:
+    """The result of a run:
+       *  words is the sorted list of words counted
+       *  counts[i] is the number of boards words[i] appeared on
+       *  boards is the number of boards solved
+       *  seconds is the elapsed time and workers the number of processes
+    """
+
+    __slots__ = ['words', 'counts', 'boards', 'seconds', 'workers', '_index']
+
+    def __init__(self, words, counts, boards, seconds=0.0, workers=1):
+        self.words = words
+        self.counts = counts
+        self.boards = boards
+        self.seconds = seconds
+        self.workers = workers
+        self._index = None
+
+    def getCount(self, word):
+        if self._index is None:
+            self._index = {word: i for i, word in enumerate(self.words)}
+        i = self._index.get(word.upper())
+        return 0 if i is None else self.counts[i]
+
+    def probability(self, word):
+        """Returns the fraction of boards word appeared on."""
+        return self.getCount(word) / self.boards if self.boards else 0.0
+
+    def interval(self, word, z=1.96):
+        """Returns the Wilson interval of the probability of word."""
+        return wilsonInterval(self.getCount(word), self.boards, z)
+
+    def halfWidth(self, z=1.96):
+        return halfWidth(self.counts, self.boards, z)
+
+    def getTop(self, n=20):
+        """Returns the n most frequent words as (word, count) pairs."""
+        order = sorted(range(len(self.words)), key=lambda i: (-self.counts[i], self.words[i]))
+        return [(self.words[i], self.counts[i]) for i in order[:n]]
+
+    def boardsPerCoreSecond(self):
+        return self.boards / (self.seconds * self.workers) if self.seconds else 0.0
+
+    def report(self, n=20):
+        """Returns a multi-line summary: throughput and the top n words."""
+        lines = ["{} boards in {:.1f}s on {} workers: {:.0f} boards/s, "
+                 "{:.0f} boards/s per core".format(
+                     self.boards, self.seconds, self.workers,
+                     self.boards / self.seconds if self.seconds else 0.0,
+                     self.boardsPerCoreSecond()),
+                 "widest 95% interval +/- {:.4f}".format(self.halfWidth())]
+        for word, count in self.getTop(n):
+            low, high = wilsonInterval(count, self.boards)
+            lines.append("{:<12} {:.4f}  [{:.4f}, {:.4f}]".format(
+                word, count / self.boards, low, high))
+        return '\n'.join(lines)
+
+
+def countedWords(lexiconName='bogwords.txt', cubes=CUBES):
+    """Returns (lexicon, sorted words, index of each word) for the words
+    some roll of cubes can spell; every process builds the same list."""
+    lexicon = feasibleLexicon(readLexicon(lexiconName), cubes)
+    words = sorted(lexicon)
+    return lexicon, words, {word: i for i, word in enumerate(words)}
+
+def _countBatch(lexicon, index, first, count, seed, cubes, rows, cols):
+    """Shakes and solves boards first .. first+count-1; returns a Counter
+    of word indices."""
+    hits = Counter()
+    starts = [(cell,) for cell in range(len(cubes))]
+    for boardId in range(first, first + count):
+        faces = shakeFaces(cubes, boardRandom(boardId, seed))
+        hits.update(index[word] for word in solveFrom(faces, starts, rows, cols, lexicon))
+    return hits
+
+def _addBatch(counters, hits, boards):
+    with counters.get_lock():
+        for i, count in hits.items():
+            counters[i] += count
+        counters[-1] += boards
+
+def _worker(counters, stop, worker, workers, seed, batch, maxBoards, lexiconName, cubes,
+            rows, cols):
+    """Counts batches worker, worker+workers, ... until told to stop."""
+    lexicon, words, index = countedWords(lexiconName, cubes)
+    first = worker * batch
+    while first < maxBoards and not stop.is_set():
+        count = min(batch, maxBoards - first)
+        _addBatch(counters, _countBatch(lexicon, index, first, count, seed, cubes, rows, cols),
+                  count)
+        first += workers * batch
+
+def _readCounters(allCounters, size):
+    """Sums the workers' counters; returns (counts, boards)."""
+    counts = [0] * size
+    boards = 0
+    for counters in allCounters:
+        with counters.get_lock():
+            snapshot = counters[:]
+        boards += snapshot[-1]
+        counts = [a + b for a, b in zip(counts, snapshot)]
+    return counts, boards
+
+def estimateOccurrence(precision=0.01, maxBoards=1000000, workers=1, seed=0, batch=250,
+                       lexiconName='bogwords.txt', cubes=CUBES, z=1.96, interval=0.5,
+                       rows=4, cols=4):
+    """
+    Solves random boards until every word's interval is within
+    +/- precision (or maxBoards boards) and returns an OccurrenceEstimate.
+    With several workers the counters are checked every interval seconds.
+    The boards are rows x cols, one die per cell.
+    >>> estimate = estimateOccurrence(precision=0.2, batch=10)
+    >>> estimate.boards, estimate.halfWidth() <= 0.2
+    (20, True)
+    >>> estimateOccurrence(rows=5, cols=5)
+    Traceback (most recent call last):
+    ...
+    ValueError: 16 dice do not fill a 5x5 board
+    """
+    if rows * cols != len(cubes):
+        raise ValueError("{} dice do not fill a {}x{} board".format(len(cubes), rows, cols))
+    lexicon, words, index = countedWords(lexiconName, cubes)
+    start = time.perf_counter()
+    if workers == 1:
+        counts = [0] * len(words)
+        boards = 0
+        while boards < maxBoards and halfWidth(counts, boards, z) > precision:
+            count = min(batch, maxBoards - boards)
+            for i, hits in _countBatch(lexicon, index, boards, count, seed, cubes,
+                                       rows, cols).items():
+                counts[i] += hits
+            boards += count
+        return OccurrenceEstimate(words, counts, boards, time.perf_counter() - start)
+
+    # one counter array per worker; the last slot counts its boards
+    allCounters = [Array('Q', len(words) + 1) for i in range(workers)]
+    stop = Event()
+    processes = [Process(target=_worker, args=(allCounters[i], stop, i, workers, seed, batch,
+                                                maxBoards, lexiconName, cubes, rows, cols))
+                 for i in range(workers)]
+    for process in processes:
+        process.start()
+    try:
+        while any(process.is_alive() for process in processes):
+            time.sleep(interval)
+            counts, boards = _readCounters(allCounters, len(words))
+            if boards and halfWidth(counts, boards, z) <= precision:
+                break
+    finally:
+        stop.set()
+        for process in processes:
+            process.join()
+    counts, boards = _readCounters(allCounters, len(words))
+    return OccurrenceEstimate(words, counts, boards, time.perf_counter() - start, workers)
+
+
+def main(argv=None):
+    import argparse
+    import os
+    parser = argparse.ArgumentParser(description="Estimate how often each word appears on a board")
+    parser.add_argument('--precision', type=float, default=0.01,
+                        help="stop when every 95%% interval is within +/- this")
+    parser.add_argument('--max-boards', type=int, default=1000000)
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--batch', type=int, default=250, help="boards per worker batch")
+    parser.add_argument('--top', type=int, default=20)
+    parser.add_argument('--lexicon', default='bogwords.txt')
+    args = parser.parse_args(argv)
+
+    estimate = estimateOccurrence(args.precision, args.max_boards, args.workers, args.seed,
+                                  args.batch, args.lexicon)
+    print(estimate.report(args.top))
+
+
+if __name__ == "__main__":
+    main()
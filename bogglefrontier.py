@@ -0,0 +1,249 @@
+"""
+Solves boards in bulk with NumPy, a whole batch at a time.  Instead of
+one recursive search per board, every partial path of every board in a
+batch is a row of the frontier:
+
+    board   the row of the batch the path is on
+    cell    the cell it ends at
+    visited a bit mask of the cells it has used
+    node    the prefix tree node it has reached
+
+and each step lengthens every path by one cell at once, with array
+lookups into a neighbours table and a (node, face code) table of the
+prefix tree's edges.  Paths the lexicon cannot continue are dropped, so
+the frontier dies out after the longest word.  Boards are the uint8
+arrays of face codes made by bogglebulk.generateBoards.
+
+Requires NumPy; the rest of the game does not.
+
+Run with:  python bogglefrontier.py --boards 20000
+"""
+
+import numpy as np
+
+from boggledice import FACES
+from bogglelexicon import END, readLexicon
+from bogglesolver import neighbours
+
+class LexiconArrays:
+    """The prefix tree of a lexicon as arrays:
+       *  children[node, code] is the node reached from node by the face
+          with that code (see boggledice.FACES), or -1; node 0 is the root
+       *  wordIds[node] is the index in words of the word ending at node,
+          or -1
+       *  words is the sorted list of the lexicon's words
+    """
+
+    __slots__ = ['children', 'wordIds', 'words']
+
+    def __init__(self, lexicon):
+        words = sorted(lexicon)
+        index = {word: i for i, word in enumerate(words)}
+        # number the nodes breadth first, remembering each one's edges
+        nodes = [lexicon.getRoot()]
+        edges = []
+        wordIds = []
+        i = 0
+        while i < len(nodes):
+            node = nodes[i]
+            wordIds.append(index[node[END]] if END in node else -1)
+            for ch, child in node.items():
+                if ch != END:
+                    edges.append((i, ch, len(nodes)))
+                    nodes.append(child)
+            i += 1
+        numbers = {id(node): n for n, node in enumerate(nodes)}
+
+        children = np.full((len(nodes), len(FACES)), -1, dtype=np.int32)
+        codes = {face.upper(): code for code, face in enumerate(FACES)}
+        for parent, ch, child in edges:
+            if ch in codes:
+                children[parent, codes[ch]] = child
+        # faces of several letters ("Qu") follow one edge per letter
+        for face, code in codes.items():
+            if len(face) > 1:
+                for n, node in enumerate(nodes):
+                    for ch in face:
+                        node = node.get(ch)
+                        if node is None:
+                            break
+                    else:
+                        children[n, code] = numbers[id(node)]
+        self.children = children
+        self.wordIds = np.array(wordIds, dtype=np.int32)
+        self.words = words
+
+    def getNodeCount(self):
+        return len(self.wordIds)
+
+
+# the arrays of the last lexicon encoded, kept until it is updated
+_encoded = None
+
+def lexiconArrays(lexicon=None):
+    """
+    Returns the LexiconArrays of lexicon (a Lexicon or LiveLexicon).
+    >>> from bogglelexicon import Lexicon
+    >>> arrays = lexiconArrays(Lexicon(['quit', 'quiz']))
+    >>> arrays.words, arrays.getNodeCount()
+    (['QUIT', 'QUIZ'], 6)
+    """
+    global _encoded
+    if lexicon is None:
+        lexicon = readLexicon()
+    snapshot = lexicon.snapshot()
+    if _encoded is None or _encoded[0] is not snapshot:
+        _encoded = (snapshot, LexiconArrays(snapshot))
+    return _encoded[1]
+
+def neighbourLists(rows=4, cols=4):
+    """
+    Returns the neighbours of every cell as flat arrays (degree, first,
+    adjacent): the neighbours of cell are adjacent[first[cell]:first[cell]
+    + degree[cell]].
+    >>> degree, first, adjacent = neighbourLists(2, 2)
+    >>> degree.tolist(), first.tolist(), adjacent[first[3]:].tolist()
+    ([3, 3, 3, 3], [0, 3, 6, 9], [0, 1, 2])
+    """
+    lists = neighbours(rows, cols)
+    degree = np.array([len(adjacent) for adjacent in lists], dtype=np.intp)
+    first = np.cumsum(degree) - degree
+    adjacent = np.array([cell for adjacent in lists for cell in adjacent], dtype=np.intp)
+    return degree, first, adjacent
+
+def solveArrays(boards, arrays, rows=4, cols=4):
+    """
+    Solves a (count, rows*cols) array of face codes and returns the words
+    found as a sorted array of board * len(arrays.words) + word index,
+    each word once per board.  Boards are limited to 64 cells (the
+    visited masks are at most 64 bit).
+    """
+    count, cells = boards.shape
+    if cells != rows * cols:
+        raise ValueError("boards have {} cells, not {}x{}".format(cells, rows, cols))
+    if cells > 64:
+        raise ValueError("boards of more than 64 cells are not supported")
+    children = arrays.children
+    wordIds = arrays.wordIds
+    wordCount = len(arrays.words)
+    degree, first, adjacent = neighbourLists(rows, cols)
+    # the narrowest masks halve the memory each step copies
+    maskType = np.uint16 if cells <= 16 else np.uint32 if cells <= 32 else np.uint64
+    bits = np.left_shift(maskType(1), np.arange(cells, dtype=maskType))
+    codes = boards.astype(np.intp).ravel()
+
+    # the paths of one cell, on every board; base is the board's first
+    # cell in codes
+    base = np.repeat(np.arange(count, dtype=np.intp) * cells, cells)
+    cell = np.tile(np.arange(cells, dtype=np.intp), count)
+    node = children[0, codes]
+    live = np.flatnonzero(node >= 0)
+    base, cell, node = base[live], cell[live], node[live]
+    visited = bits[cell]
+
+    found = []
+    while len(node):
+        ending = wordIds[node]
+        hits = np.flatnonzero(ending >= 0)
+        if len(hits):
+            found.append(base[hits] // cells * wordCount + ending[hits])
+        # lengthen every path by each of its neighbours at once: path is
+        # the row being lengthened, nth the neighbour's place in its list
+        degrees = degree[cell]
+        path = np.repeat(np.arange(len(cell)), degrees)
+        nth = np.arange(len(path)) - np.repeat(np.cumsum(degrees) - degrees, degrees)
+        nextCell = adjacent[first[cell][path] + nth]
+        fresh = np.flatnonzero((visited[path] & bits[nextCell]) == 0)
+        path, nextCell = path[fresh], nextCell[fresh]
+        nextNode = children[node[path], codes[base[path] + nextCell]]
+        live = np.flatnonzero(nextNode >= 0)
+        path = path[live]
+        cell = nextCell[live]
+        node = nextNode[live]
+        base = base[path]
+        visited = visited[path] | bits[cell]
+    if not found:
+        return np.zeros(0, dtype=np.intp)
+    return np.unique(np.concatenate(found))
+
+def solveBatch(boards, lexicon=None, rows=4, cols=4, batch=512):
+    """
+    Returns the set of words on every board of a (count, rows*cols) array
+    of face codes, solving batch boards at a time (the frontier of a
+    batch is held in memory at once).
+    >>> from bogglebulk import codesFromFaces
+    >>> from bogglelexicon import Lexicon
+    >>> boards = np.array([codesFromFaces(['C', 'A', 'T', 'S']),
+    ...                    codesFromFaces(['Qu', 'I', 'T', 'Z'])])
+    >>> [sorted(words) for words in solveBatch(boards, Lexicon(['cat', 'cats', 'quit', 'quiz']), 2, 2)]
+    [['CAT', 'CATS'], ['QUIT', 'QUIZ']]
+    """
+    arrays = lexiconArrays(lexicon)
+    words = arrays.words
+    solved = []
+    for first in range(0, len(boards), batch):
+        chunk = boards[first:first + batch]
+        sets = [set() for row in chunk]
+        for board, word in zip(*np.divmod(solveArrays(chunk, arrays, rows, cols), len(words))):
+            sets[board].add(words[word])
+        solved.extend(sets)
+    return solved
+
+def countWords(boards, lexicon=None, rows=4, cols=4, batch=512):
+    """
+    Returns (words, counts) for a (count, rows*cols) array of boards:
+    counts[i] is the number of boards words[i] is on.  Nothing per board
+    is built in Python, so this is the fastest way to survey many boards.
+    """
+    arrays = lexiconArrays(lexicon)
+    counts = np.zeros(len(arrays.words), dtype=np.int64)
+    for first in range(0, len(boards), batch):
+        found = solveArrays(boards[first:first + batch], arrays, rows, cols)
+        counts += np.bincount(found % len(arrays.words), minlength=len(arrays.words))
+    return arrays.words, counts
+
+
+def main(argv=None):
+    import argparse
+    import time
+    from bogglebulk import facesFromCodes, generateBoards
+    from bogglefeasible import feasibleLexicon
+    from bogglesolver import solve
+    parser = argparse.ArgumentParser(description="Benchmark the vectorized solver")
+    parser.add_argument('--boards', type=int, default=20000)
+    parser.add_argument('--batch', type=int, default=512, help="boards per frontier")
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--check', type=int, default=2000,
+                        help="boards also solved one at a time, to compare")
+    args = parser.parse_args(argv)
+
+    lexicon = feasibleLexicon(readLexicon())
+    start = time.perf_counter()
+    lexiconArrays(lexicon)
+    print("lexicon arrays built in {:.2f}s".format(time.perf_counter() - start))
+    boards = generateBoards(args.boards, np.random.default_rng(args.seed))
+
+    start = time.perf_counter()
+    solved = solveBatch(boards, lexicon, batch=args.batch)
+    vectorized = time.perf_counter() - start
+    print("vectorized: {} boards in {:.2f}s ({:.0f} boards/s)".format(
+        args.boards, vectorized, args.boards / vectorized))
+    start = time.perf_counter()
+    countWords(boards, lexicon, batch=args.batch)
+    counting = time.perf_counter() - start
+    print("counting:   {} boards in {:.2f}s ({:.0f} boards/s)".format(
+        args.boards, counting, args.boards / counting))
+
+    check = min(args.check, args.boards)
+    if check:
+        start = time.perf_counter()
+        expected = [set(solve(facesFromCodes(row), 4, 4, lexicon)) for row in boards[:check]]
+        recursive = time.perf_counter() - start
+        print("recursive:  {} boards in {:.2f}s ({:.0f} boards/s)".format(
+            check, recursive, check / recursive))
+        if expected != solved[:check]:
+            raise SystemExit("the solvers disagree")
+
+
+if __name__ == "__main__":
+    main()
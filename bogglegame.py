@@ -1,36 +1,74 @@
 """Implements the logic of the game of boggle."""
 
-from graphics import GraphWin
-from boggleboard import BoggleBoard
-from boggleletter import BoggleLetter
+import time
+
 from brandom import randomize
+from bogglelexicon import watchLexicon
+from boggleround import isNewValidWord
+from bogglesolver import PathFinder
+from bogglefeasible import feasibleLexicon
+from bogglehints import HintIndex
+from bogglewordindex import WordIndex
+from bogglehitmap import EXIT, RESET, GRID
+from bogglewordlist import SORTS
+
+# rows (or, for Prior/Next, pages) each key scrolls the found words by
+_SCROLL_KEYS = {'Up': -1, 'Down': 1, 'Prior': -1, 'Next': 1}
+
+# seconds between checks of the lexicon file for edits
+LEXICON_POLL_SECONDS = 2.0
 
 class BoggleGame:
 
-    __slots__ = [ "_validWords", "_board", "_foundWords", "_selectedLetters" ]
+    __slots__ = [ "_validWords", "_board", "_foundWords", "_selectedLetters", "_log",
+                  "_typing", "_hints", "_timer", "_message", "_wordIndex", "_rerolling",
+                  "_nextPoll" ]
 
-    def __init__(self, win):
+    def __init__(self, win, board=None, log=None, timer=None):
         """
         Create a new Boggle Game and load in our lexicon.
+        board replaces the BoggleBoard drawn in win (e.g. a HeadlessBoard),
+        and log is an optional EventLog that records shakes and clicks.
+        timer is an optional RoundTimer; once it runs out, tiles and keys
+        are ignored until RESET starts a new round.
         """
         # set up the set of valid words we can match
         self._validWords = self.__readLexicon()
-        self._board = BoggleBoard(win)
+        if board is None:
+            # imported here so headless games never need a display
+            from boggleboard import BoggleBoard
+            board = BoggleBoard(win)
+        self._board = board
         self._selectedLetters = []
         self._foundWords = []
+        self._log = log
+        if log:
+            log.recordShake(board.getFaces())
+        # finds paths for words typed at the keyboard (rebuilt every shake)
+        self._typing = PathFinder(board.getFaces(), board.getRows(), board.getCols())
+        # unfound words to give hints for (rebuilt every shake)
+        self._hints = HintIndex(board.getFaces(), board.getRows(), board.getCols(),
+                                feasibleLexicon(self._validWords, board.getCubes()))
+        # the upper text shows the time left and then the latest message
+        self._timer = None
+        self._message = ''
+        self.setTimer(timer)
+        # the words on the board kept up to date as dice are rolled again
+        # (built at the first reroll of every shake)
+        self._wordIndex = None
+        self._rerolling = False
+        # when tick next checks the lexicon file for edits
+        self._nextPoll = time.monotonic() + LEXICON_POLL_SECONDS
 
         # init other attributes here.
 
     def __readLexicon(self, lexiconName='bogwords.txt'):
         """
-        A helper method to read the lexicon and return it as a set.
+        A helper method to read the lexicon.  The lexicon is shared by
+        every game (and the server) reading the same file, and follows
+        edits to it, which tick checks for (see bogglelexicon.LiveLexicon).
         """
-        validWords = set()
-        with open(lexiconName) as f:
-          for line in f:
-            validWords.add(line.strip().upper())
-
-        return validWords
+        return watchLexicon(lexiconName)
 
     def doOneClick(self, point):
         """
@@ -40,25 +78,41 @@ class BoggleGame:
         # These steps are one way to think about the design, although
         # you are free to do things differently if you prefer.
 
+        if self._log:
+            self._log.recordClick(point.getX(), point.getY())
+
+        # find what was clicked with one lookup
+        region, position = self._board.hitTest(point)
+
         # step 1: check for exit button and return False if clicked
-        if self._board.inExit(point):
+        if region == EXIT:
             return False
 
         # step 2: check for reset button and reset
-        elif self._board.inReset(point):
-            self._board.reset()
-            self._selectedLetters = []
-            self._foundWords = []
+        elif region == RESET:
+            self.newRound()
+            return True
+
+        # once time is up, only the buttons work
+        elif self._timer and self._timer.isExpired():
             return True
         
 
         # step 3: check if click is on a cell in the grid
-        elif self._board.inGrid(point):
+        elif region == GRID:
+
+            # a click abandons any word being typed
+            if self._typing.getWord():
+                self.__clearWord()
+
+            # after "!" the click rolls the tile's die again
+            if self._rerolling:
+                self.doReroll(*position)
+                return True
 
             # get BoggleLetter at point
-            boglet = self._board.getBoggleLetterAtPoint(point)
-            boglet.setFillColor('powder blue')
-            boglet.setTextColor('blue')
+            boglet = self._board.getBoggleLetter(*position)
+            boglet.setColors('blue', 'powder blue')
 
             # if this is the first letter in a word being constructed,
             # add letter and display it on lower text of board
@@ -68,16 +122,9 @@ class BoggleGame:
             
             # else if clicked on same letter as last time, end word and check for validity
             elif boglet == self._selectedLetters[-1]: 
-                bogletString = "".join([boglet.getLetter() for boglet in self._selectedLetters])
-                if bogletString in self._validWords and bogletString not in self._foundWords:
-                    self._foundWords.append(bogletString) # append to foundWords and side text of game
-                    self._board.addFoundWord(bogletString)
-                    # Add every valid word that is found gradually to the side text of game
-                    wordsString = '\n'.join(self._foundWords) 
-                    self._board.setStringToTextArea(wordsString)
-                self._board.resetColors() # clear lowertext, colors, and selectedLetters
-                self._board.setStringToLowerText('')
-                self._selectedLetters = []
+                bogletString = "".join([boglet.getLetter() for boglet in self._selectedLetters]).upper()
+                self.__addWord(bogletString)
+                self.__clearWord() # clear lowertext, colors, and selectedLetters
                     
             # else if adding a letter to a non-empty word, make sure it's adjacent
             # and update state
@@ -85,10 +132,8 @@ class BoggleGame:
                 self._selectedLetters.append(boglet)
                 self._board.setStringToLowerText(self._board.getStringFromLowerText() + boglet.getLetter())
                 # Set the last boggle letter clicked to green and set the current one clicked to blue
-                self._selectedLetters[-2].setFillColor('light green')
-                self._selectedLetters[-2].setTextColor('green')
-                boglet.setFillColor('powder blue')
-                boglet.setTextColor('blue')
+                self._selectedLetters[-2].setColors('green', 'light green')
+                boglet.setColors('blue', 'powder blue')
 
             # else if clicked anywhere else, reset the state to an empty word.
             else:
@@ -99,16 +144,323 @@ class BoggleGame:
         # return True to indicate we want to keep playing
         return True
 
-if __name__ == '__main__':
+    def newRound(self, rng=None):
+        """
+        Starts a new round, as the RESET button does: shakes the board
+        (with rng, a random.Random, if given; see brandom.boardRandom)
+        and forgets the words found.
+        """
+        self._board.reset(rng)
+        self._selectedLetters = []
+        self._foundWords = []
+        self._typing = PathFinder(self._board.getFaces(), self._board.getRows(),
+                                  self._board.getCols())
+        self._hints = HintIndex(self._board.getFaces(), self._board.getRows(),
+                                self._board.getCols(),
+                                feasibleLexicon(self._validWords, self._board.getCubes()))
+        if self._log:
+            self._log.recordShake(self._board.getFaces())
+        self._message = ''
+        self._wordIndex = None
+        self._rerolling = False
+        if self._timer:
+            self.__startRound()
+
+    def doOneKey(self, key):
+        """
+        Implements typed word entry for one key press (a Tk keysym such as
+        "a", "BackSpace" or "Return").  Letters extend the typed word and
+        highlight a path spelling it, BackSpace removes a letter, Return
+        submits the word and Escape abandons it.  "?" asks for a hint, and
+        "!" makes the next tile clicked roll its die again.
+        Up/Down scroll the found words a row, Prior/Next (Page Up/Down) a
+        page, and Tab changes the order they are listed in.
+        Returns True, as typing never ends the game.
+        """
+        if self._log:
+            self._log.recordKey(key)
+
+        # the found words can be browsed even after time is up
+        if key in _SCROLL_KEYS:
+            page = self._board.getWordList().getRows()
+            self._board.scrollWords(_SCROLL_KEYS[key] * page if key in ('Prior', 'Next')
+                                    else _SCROLL_KEYS[key])
+            return True
+        elif key == 'Tab':
+            sorts = list(SORTS)
+            current = self._board.getWordList().getSort()
+            self._board.setWordSort(sorts[(sorts.index(current) + 1) % len(sorts)])
+            return True
+        elif self._timer and self._timer.isExpired():
+            return True
+        elif len(key) == 1 and key.isalpha():
+            if self._selectedLetters:
+                self.__clearWord()
+            self._typing.typeLetter(key)
+        elif key == 'BackSpace':
+            self._typing.backspace()
+        elif key == 'Return':
+            # the word only counts if a path on the board spells it
+            if self._typing.getPath() is not None:
+                self.__addWord(self._typing.getWord())
+            self.__clearWord()
+            return True
+        elif key == 'Escape':
+            self.__clearWord()
+            return True
+        elif key == 'question':
+            self.doHint()
+            return True
+        elif key == 'exclam':
+            self.__clearWord()
+            self._rerolling = True
+            self.__showMessage('Click a tile to reroll it')
+            return True
+        else:
+            return True
+
+        self.__showTyped()
+        return True
+
+    def __showTyped(self):
+        """Shows the typed word and highlights the tiles spelling (a
+        prefix of) it."""
+        with self._board.batch():
+            self._board.setStringToLowerText(self._typing.getWord())
+            self._board.resetColors()
+            path = self._typing.getPartialPath()
+            rows = self._board.getRows()
+            for cell in path:
+                col, row = divmod(cell, rows)
+                boglet = self._board.getBoggleLetter(col, row)
+                if cell == path[-1]:
+                    boglet.setColors('blue', 'powder blue')
+                else:
+                    boglet.setColors('green', 'light green')
+
+    def doHint(self):
+        """
+        Gives a hint for a word not found yet: highlights its starting tile
+        and shows its first letters above the grid, one more letter each
+        time a hint is asked for the same word.
+        Returns the revealed letters, or None if every word has been found.
+        """
+        self.__clearWord()
+        hint = self._hints.nextHint()
+        if hint is None:
+            self.__showMessage('No words left!')
+            return None
+        prefix, path = hint
+        col, row = divmod(path[0], self._board.getRows())
+        start = self._board.getBoggleLetter(col, row)
+        start.setColors('black', 'khaki')
+        self.__showMessage('Hint: {}...'.format(prefix))
+        return prefix
+
+    def doReroll(self, col, row):
+        """
+        Rolls the die at (col, row) again.  Only the words through that
+        tile are searched for again (see bogglewordindex), and the hints
+        follow the new board.  Returns the new face, or None if the board
+        was not shaken (a restored game), whose dice are not known.
+        """
+        self._rerolling = False
+        self.__clearWord()
+        board = self._board
+        rows, cols = board.getRows(), board.getCols()
+        if self._wordIndex is None and board.getDice() is not None:
+            self._wordIndex = WordIndex(board.getFaces(), rows, cols,
+                                        feasibleLexicon(self._validWords, board.getCubes()))
+        face = board.rerollDie(col, row)
+        if face is None:
+            self.__showMessage('These dice cannot be rerolled')
+            return None
+        added, removed = self._wordIndex.setFace(col * rows + row, face)
+        faces = board.getFaces()
+        if self._log:
+            self._log.recordShake(faces)
+        self._typing = PathFinder(faces, rows, cols)
+        self._hints.update(faces, [word for word in added if word not in self._foundWords],
+                           removed)
+        self.__showMessage('Rerolled: {} words'.format(self._wordIndex.getCount()))
+        return face
+
+    def tick(self):
+        """
+        Advances the round timer; called by the game loop every frame.
+        Redraws the upper text only when the time shown changes, and ends
+        the round when time runs out.  Every LEXICON_POLL_SECONDS it also
+        picks up edits to the lexicon file.
+        >>> from boggletimer import RoundTimer
+        >>> from headlessboard import HeadlessBoard
+        >>> now = [0.0]
+        >>> def clock():      # time passes between any two readings
+        ...     now[0] += 0.5
+        ...     return now[0]
+        >>> game = BoggleGame(None, HeadlessBoard(), timer=RoundTimer(1, clock))
+        >>> game.tick(); game.tick(); game.getBoard().getStringFromUpperText()
+        "0:00  Time's up!"
+        """
+        now = time.monotonic()
+        if now >= self._nextPoll:
+            self._nextPoll = now + LEXICON_POLL_SECONDS
+            if self._validWords.poll():
+                self.__lexiconChanged()
+        if self._timer is None:
+            return
+        # the tick showing 0:00 ends the round
+        if self._timer.tick() is not None:
+            if self._timer.isExpired():
+                self.__clearWord()
+                self._message = "Time's up!"
+            self.__showMessage(self._message)
+
+    def setTimer(self, timer):
+        """Times the game with timer (a RoundTimer, or None for no time
+        limit), starting a new round now."""
+        self._timer = timer
+        if timer:
+            self.__startRound()
+
+    def __startRound(self):
+        self._timer.restart()
+        if self._log:
+            self._log.recordRound(self._timer.getSeconds())
+
+    def __lexiconChanged(self):
+        """Gives hints from the new word list; words already found stay."""
+        board = self._board
+        lexicon = self._validWords
+        if board.getDice() is not None:
+            lexicon = feasibleLexicon(lexicon, board.getCubes())
+        self._hints = HintIndex(board.getFaces(), board.getRows(), board.getCols(),
+                                lexicon, self._foundWords)
+        self._wordIndex = None
+
+    def __showMessage(self, message):
+        """Shows message above the grid, after the time left if timed."""
+        self._message = message
+        if self._timer:
+            message = '{}  {}'.format(self._timer.getText(), message).rstrip()
+        self._board.setStringToUpperText(message)
+
+    def __addWord(self, word):
+        """Adds word to the found words if it is valid and new."""
+        if isNewValidWord(word, self._validWords, self._foundWords):
+            self._hints.wordFound(word)
+            self._foundWords.append(word) # append to foundWords and side text of game
+            # the board shows it in the side text of the game
+            self._board.addFoundWord(word)
+
+    def __clearWord(self):
+        """Clears the clicked or typed word, its colors and the lower text."""
+        self._board.resetColors()
+        self._board.setStringToLowerText('')
+        self._selectedLetters = []
+        self._typing.clear()
+
+    def getBoard(self):
+        return self._board
+
+    def getFoundWords(self):
+        return self._foundWords
+
+    def getSelectedLetters(self):
+        return self._selectedLetters
+
+    def getTypedWord(self):
+        return self._typing.getWord()
+
+    def restoreState(self, state):
+        """
+        Puts the game in a saved state (a bogglesnapshot.GameState): the
+        board, found words, selected or typed word and scroll position.
+        The view is redrawn in one batch rather than by replaying moves.
+        """
+        board = self._board
+        rows, cols = board.getRows(), board.getCols()
+        if (state.rows, state.cols) != (rows, cols):
+            raise ValueError("snapshot is for a {}x{} board".format(state.rows, state.cols))
+        with board.batch():
+            board.setFaces(state.faces)
+            board.resetColors()
+            self._foundWords = list(state.foundWords)
+            board.setFoundWords(self._foundWords, state.scroll)
+            board.setStringToUpperText('')
+            self._message = ''
+            self._wordIndex = None
+            self._rerolling = False
+            self._typing = PathFinder(state.faces, rows, cols)
+            self._hints = HintIndex(state.faces, rows, cols, self._validWords, self._foundWords)
+
+            self._selectedLetters = [board.getBoggleLetter(*divmod(cell, rows))
+                                     for cell in state.path]
+            for boglet in self._selectedLetters[:-1]:
+                boglet.setColors('green', 'light green')
+            if self._selectedLetters:
+                self._selectedLetters[-1].setColors('blue', 'powder blue')
+            board.setStringToLowerText(''.join(boglet.getLetter()
+                                               for boglet in self._selectedLetters))
+            if state.typed:
+                for letter in state.typed:
+                    self._typing.typeLetter(letter)
+                self.__showTyped()
+
+def _playMain():
+    """Plays Boggle in a window (the default command)."""
+    import argparse
+    from graphics import GraphWin, update
+    from bogglelog import EventLog, randomizeAndRecord
+    from boggletimer import RoundTimer, ROUND_SECONDS
+
+    parser = argparse.ArgumentParser(description="Play Boggle")
+    parser.add_argument('--log', help="append a replayable event log to this file")
+    parser.add_argument('--seed', type=int, help="random seed (with --log)")
+    parser.add_argument('--sprites', action='store_true',
+                        help="draw tiles as cached sprite images")
+    parser.add_argument('--seconds', type=float, default=ROUND_SECONDS,
+                        help="length of a round (0 for an untimed game)")
+    parser.add_argument('--fps', type=int, default=30,
+                        help="frames per second of the game loop")
+    args = parser.parse_args()
 
     # When you are ready to run on different boards,
     # insert a call to randomize() here.  BUT you will
     # find it much easier to test your code without
     # randomizing things!
+    log = None
+    if args.log:
+        log = EventLog(args.log)
+        randomizeAndRecord(log, args.seed)
 
     win = GraphWin("Boggle", 400, 400)
-    game = BoggleGame(win)
+    board = None
+    if args.sprites:
+        from boggleboard import BoggleBoard
+        board = BoggleBoard(win, sprites=True)
+    timer = RoundTimer(args.seconds) if args.seconds > 0 else None
+    game = BoggleGame(win, board=board, log=log, timer=timer)
     keepGoing = True
     while keepGoing:
-        point = win.getMouse()
-        keepGoing = game.doOneClick(point)
+        # one frame: handle any click or key, advance the timer, then sleep
+        # until the next frame is due.  Input waits at most one frame, and
+        # an idle frame only polls Tk, so the loop barely uses the CPU.
+        point = win.checkMouse()
+        if point:
+            keepGoing = game.doOneClick(point)
+        key = win.checkKey()
+        if key:
+            game.doOneKey(key)
+        game.tick()
+        update(args.fps)
+    if log:
+        log.close()
+
+if __name__ == '__main__':
+    import sys
+    if sys.argv[1:2] == ['solve']:
+        # batch solving runs without a window and never imports Tk
+        from bogglebatch import main
+        main(sys.argv[2:])
+    else:
+        _playMain()
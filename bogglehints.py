@@ -0,0 +1,85 @@
+"""
+Hints for the words a player has not found yet.  The index is built once
+per shake from the board's full solution and updated as words are found,
+so asking for a hint never solves the board again.
+"""
+
+from bogglesolver import findPath, solveCached
+
+class HintIndex:
+    """A hint index has the following attributes:
+       *  _faces, _rows, _cols describe the board
+       *  _unfound maps every unfound word to None, shortest words first
+          (a dict keeps that order and removes found words in O(1))
+       *  _target is the word hints are currently given for
+       *  _revealed is how many letters of _target have been revealed
+    """
+
+    __slots__ = ['_faces', '_rows', '_cols', '_unfound', '_target', '_revealed']
+
+    def __init__(self, faces, rows=4, cols=4, lexicon=None, foundWords=()):
+        self._faces = list(faces)
+        self._rows = rows; self._cols = cols
+        words = sorted(solveCached(faces, rows, cols, lexicon), key=lambda w: (len(w), w))
+        self._unfound = dict.fromkeys(words)
+        for word in foundWords:
+            self._unfound.pop(word, None)
+        self._target = None
+        self._revealed = 0
+
+    def wordFound(self, word):
+        """Removes word from the words hints are given for."""
+        self._unfound.pop(word, None)
+        if word == self._target:
+            self._target = None
+
+    def update(self, faces, added=(), removed=()):
+        """
+        Follows a change of the board to faces: the words in removed are
+        no longer on it and those in added now are (and are not found).
+        >>> from bogglelexicon import Lexicon
+        >>> hints = HintIndex(['C', 'A', 'T', 'S'], 2, 2, Lexicon(['cat', 'act', 'bat']))
+        >>> hints.update(['B', 'A', 'T', 'S'], ['BAT'], ['ACT', 'CAT']); hints.nextHint()
+        ('B', [0, 1, 2])
+        """
+        self._faces = list(faces)
+        for word in removed:
+            self._unfound.pop(word, None)
+        if self._target not in self._unfound:
+            self._target = None
+        # keep shortest words first
+        words = sorted(list(self._unfound) + list(added), key=lambda w: (len(w), w))
+        self._unfound = dict.fromkeys(words)
+
+    def getUnfoundCount(self):
+        return len(self._unfound)
+
+    def nextHint(self):
+        """
+        Returns (prefix, path) for the next hint, or None once every word
+        has been found.  The first hint for a word reveals its first letter,
+        and every further hint one more letter, up to all but the last.
+        path is the list of cells spelling the word; path[0] is its
+        starting tile.
+        >>> from bogglelexicon import Lexicon
+        >>> hints = HintIndex(['C', 'A', 'T', 'S'], 2, 2, Lexicon(['cat', 'cats']))
+        >>> hints.nextHint(), hints.nextHint(), hints.nextHint()
+        (('C', [0, 1, 2]), ('CA', [0, 1, 2]), ('CA', [0, 1, 2]))
+        >>> hints.wordFound('CAT'); hints.nextHint()
+        ('C', [0, 1, 2, 3])
+        >>> hints.wordFound('CATS'); hints.nextHint() is None
+        True
+        """
+        if self._target is None:
+            if not self._unfound:
+                return None
+            self._target = next(iter(self._unfound))
+            self._revealed = 0
+        word = self._target
+        self._revealed = min(self._revealed + 1, len(word) - 1)
+        return (word[:self._revealed], findPath(self._faces, word, self._rows, self._cols))
+
+
+if __name__ == "__main__":
+    from doctest import testmod
+    testmod()
@@ -0,0 +1,77 @@
+"""
+Resolves a click to the board region under it in one lookup.  The map is
+built once when a board is drawn from the rectangles of its buttons and
+grid cells: the sorted left/right edges split the window into columns
+of x, the top/bottom edges into rows of y, and a table gives the region
+covering each (column, row) slab.  A click costs two binary searches and
+a table read, whatever the inset, tile size or grid dimensions.
+"""
+
+from bisect import bisect_right
+
+# the regions a click can land in
+EXIT = 'exit'
+RESET = 'reset'
+GRID = 'grid'
+
+# what a click outside every region resolves to
+MISS = (None, None)
+
+class HitMap:
+    """A hit map has the following attributes:
+       *  _xs, _ys are the sorted distinct x and y edges of all regions
+       *  _table[xi][yi] is the hit (region, position) for points with
+          _xs[xi] <= x < _xs[xi + 1] and _ys[yi] <= y < _ys[yi + 1]
+    """
+
+    __slots__ = ['_xs', '_ys', '_table']
+
+    def __init__(self, rects):
+        """
+        Builds the map from a list of (left, top, right, bottom, hit)
+        rectangles, each covering left <= x < right and top <= y < bottom.
+        Where rectangles overlap, the later one wins.
+        """
+        self._xs = sorted({x for rect in rects for x in (rect[0], rect[2])})
+        self._ys = sorted({y for rect in rects for y in (rect[1], rect[3])})
+        self._table = [[MISS] * max(len(self._ys) - 1, 0)
+                       for xi in range(len(self._xs) - 1)]
+        for left, top, right, bottom, hit in rects:
+            for xi in range(self._xs.index(left), self._xs.index(right)):
+                column = self._table[xi]
+                for yi in range(self._ys.index(top), self._ys.index(bottom)):
+                    column[yi] = hit
+
+    @classmethod
+    def forBoard(cls, xInset, yInset, rows, cols, size, resetRect, exitRect):
+        """
+        Returns the map of a board: one GRID region per tile, whose
+        position is its (col, row), and the RESET and EXIT buttons given
+        as (left, top, right, bottom).  Buttons win over tiles they cover.
+        >>> hits = HitMap.forBoard(10, 20, 2, 3, 40, (0, 100, 50, 120), (60, 100, 90, 120))
+        >>> hits.lookup(10, 20), hits.lookup(129.9, 99.9), hits.lookup(130, 50)
+        (('grid', (0, 0)), ('grid', (2, 1)), (None, None))
+        >>> hits.lookup(75, 110), hits.lookup(5, 119), hits.lookup(55, 110)
+        (('exit', None), ('reset', None), (None, None))
+        """
+        rects = [(xInset + size * col, yInset + size * row,
+                  xInset + size * (col + 1), yInset + size * (row + 1), (GRID, (col, row)))
+                 for col in range(cols) for row in range(rows)]
+        rects.append(tuple(resetRect) + ((RESET, None),))
+        rects.append(tuple(exitRect) + ((EXIT, None),))
+        return cls(rects)
+
+    def lookup(self, x, y):
+        """Returns the (region, position) hit at (x, y); position is the
+        (col, row) of a GRID hit and None otherwise.  Returns MISS if no
+        region covers the point."""
+        xi = bisect_right(self._xs, x) - 1
+        yi = bisect_right(self._ys, y) - 1
+        if 0 <= xi < len(self._table) and 0 <= yi < len(self._ys) - 1:
+            return self._table[xi][yi]
+        return MISS
+
+
+if __name__ == "__main__":
+    from doctest import testmod
+    testmod()
@@ -101,6 +101,13 @@ class BoggleLetter:
         """
         return self._rect.getFillColor()
 
+    def setColors(self, textColor, fillColor):
+        """
+        Sets the colors of the letter and of its square.
+        """
+        self.setTextColor(textColor)
+        self.setFillColor(fillColor)
+
     # test for adjacency
     def isAdjacent(self, other):
         """
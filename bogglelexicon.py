@@ -0,0 +1,334 @@
+"""
+Implements the Boggle lexicon: the set of valid words together with a
+prefix tree that the solver walks.  Lexicons are loaded once per process
+and shared by every game that asks for the same file.
+
+A Lexicon is never changed once built.  Word list updates during live
+events produce a new Lexicon that shares every untouched part of the
+prefix tree with the old one, and a LiveLexicon switches games over to
+the new version in a single step.
+"""
+
+import os
+import threading
+
+# key used inside a trie node to hold the word that ends at that node
+END = ''
+
+class Lexicon:
+    """A Lexicon has three attributes:
+       *  _root is the root node of a prefix tree: every node is a dict
+          mapping a letter to the child node, and a node at which a word
+          ends also maps END to that word (upper case str).  Membership
+          is answered by the tree, so versions share it all but the
+          changed paths.
+       *  _count is the number of words
+       *  _version counts the updates that led to this lexicon
+    """
+
+    __slots__ = ['_root', '_count', '_version']
+
+    def __init__(self, words=()):
+        """
+        Construct a new Lexicon from an iterable of words.
+        >>> lex = Lexicon(['cat', 'Cats', 'dog'])
+        >>> len(lex)
+        3
+        >>> 'CATS' in lex
+        True
+        >>> 'CA' in lex
+        False
+        """
+        self._root = {}
+        self._count = 0
+        self._version = 0
+        for word in words:
+            self.addWord(word)
+
+    def addWord(self, word):
+        """
+        Adds word (str) to the lexicon.  Only for use while building a new
+        lexicon; use withChanges to update one that may be in use.
+        """
+        word = word.strip().upper()
+        if not word:
+            return
+        node = self._root
+        for ch in word:
+            node = node.setdefault(ch, {})
+        if END not in node:
+            node[END] = word
+            self._count += 1
+
+    def getRoot(self):
+        """Returns the root node of the prefix tree."""
+        return self._root
+
+    def getVersion(self):
+        return self._version
+
+    def snapshot(self):
+        """Returns the Lexicon to use for one consistent lookup (itself)."""
+        return self
+
+    def withChanges(self, additions=(), removals=()):
+        """
+        Returns a new Lexicon with the words in additions added and those in
+        removals removed, leaving this one untouched.  Only the prefix tree
+        nodes on the paths of changed words are copied; the rest is shared.
+        >>> old = Lexicon(['cat', 'cats', 'dog'])
+        >>> new = old.withChanges(additions=['cow'], removals=['cats', 'dog'])
+        >>> sorted(new), sorted(old)
+        (['CAT', 'COW'], ['CAT', 'CATS', 'DOG'])
+        >>> new.hasPrefix('D'), old.hasPrefix('D'), new.getVersion()
+        (False, True, 1)
+        >>> new.getRoot()['C']['A'] is old.getRoot()['C']['A']
+        False
+        """
+        count = self._count
+        root = dict(self._root)
+        # ids of the nodes created by this update, which may be changed freely
+        fresh = {id(root)}
+        # the new version, answering membership from its tree as it is built
+        lexicon = Lexicon.__new__(Lexicon)
+        lexicon._root = root
+        lexicon._version = self._version + 1
+
+        def copyPath(word):
+            # returns [(parent, letter, node)] along word, copying shared nodes
+            path = []
+            node = root
+            for ch in word:
+                child = node.get(ch)
+                if child is None:
+                    child = {}
+                elif id(child) not in fresh:
+                    child = dict(child)
+                else:
+                    path.append((node, ch, child))
+                    node = child
+                    continue
+                fresh.add(id(child))
+                node[ch] = child
+                path.append((node, ch, child))
+                node = child
+            return path
+
+        for word in removals:
+            word = word.strip().upper()
+            if word not in lexicon:
+                continue
+            count -= 1
+            path = copyPath(word)
+            del path[-1][2][END]
+            # prune nodes that no longer lead to any word
+            for parent, ch, node in reversed(path):
+                if node:
+                    break
+                del parent[ch]
+        for word in additions:
+            word = word.strip().upper()
+            if not word or word in lexicon:
+                continue
+            count += 1
+            path = copyPath(word)
+            path[-1][2][END] = word
+
+        lexicon._count = count
+        return lexicon
+
+    def hasPrefix(self, prefix):
+        """
+        Returns True if some word in the lexicon starts with prefix.
+        >>> lex = Lexicon(['cat'])
+        >>> lex.hasPrefix('CA'), lex.hasPrefix('CO')
+        (True, False)
+        """
+        return self._find(prefix.upper()) is not None
+
+    def _find(self, prefix):
+        # Internal: the prefix tree node reached by prefix, or None
+        node = self._root
+        for ch in prefix:
+            node = node.get(ch)
+            if node is None:
+                return None
+        return node
+
+    def __contains__(self, word):
+        node = self._find(word)
+        return node is not None and END in node
+
+    def __iter__(self):
+        # every word, in alphabetical order
+        stack = [self._root]
+        while stack:
+            node = stack.pop()
+            if END in node:
+                yield node[END]
+            stack.extend(node[ch] for ch in sorted(node, reverse=True) if ch != END)
+
+    def __len__(self):
+        return self._count
+
+
+def parseDelta(lines):
+    """
+    Returns (additions, removals) from the lines of a delta file, where
+    "+word" adds a word, "-word" removes one, and blank lines and lines
+    starting with "#" are ignored.
+    >>> parseDelta(['+yeet', '-badword', '# comment', ''])
+    (['yeet'], ['badword'])
+    """
+    additions = []
+    removals = []
+    for line in lines:
+        line = line.strip()
+        if line.startswith('+'):
+            additions.append(line[1:])
+        elif line.startswith('-'):
+            removals.append(line[1:])
+        elif line and not line.startswith('#'):
+            raise ValueError("bad delta line: {!r}".format(line))
+    return (additions, removals)
+
+
+class LiveLexicon:
+    """A lexicon that can be updated while games are running.  Lookups go
+    to the current Lexicon version, which is replaced as a whole, so every
+    lookup sees either the old or the new word list, never a mix.
+    Attributes:
+       *  _current is the current Lexicon
+       *  _fileName is the watched word list file (or None)
+       *  _read is the (modification time, size) of that file when last
+          read, and _seen the one seen by the last poll
+       *  _lock serializes updates (lookups never take it)
+    """
+
+    __slots__ = ['_current', '_fileName', '_read', '_seen', '_lock']
+
+    def __init__(self, lexicon, fileName=None):
+        self._current = lexicon
+        self._fileName = fileName
+        self._read = self._seen = _fileStamp(fileName) if fileName else None
+        self._lock = threading.Lock()
+
+    def snapshot(self):
+        """Returns the current Lexicon; use it for lookups that must agree."""
+        return self._current
+
+    def getVersion(self):
+        return self._current.getVersion()
+
+    def getRoot(self):
+        return self._current.getRoot()
+
+    def hasPrefix(self, prefix):
+        return self._current.hasPrefix(prefix)
+
+    def __contains__(self, word):
+        return word in self._current
+
+    def __iter__(self):
+        return iter(self._current)
+
+    def __len__(self):
+        return len(self._current)
+
+    def applyChanges(self, additions=(), removals=()):
+        """Switches to a new version with the given words added and removed.
+        Returns the new Lexicon."""
+        with self._lock:
+            self._current = self._current.withChanges(additions, removals)
+            return self._current
+
+    def applyDeltaFile(self, deltaName):
+        """Applies a delta file (see parseDelta).  Returns the new Lexicon.
+        Write the delta under another name and rename it to deltaName, so
+        it is never read half written."""
+        with open(deltaName) as f:
+            additions, removals = parseDelta(f)
+        return self.applyChanges(additions, removals)
+
+    def poll(self):
+        """
+        If the watched word list file has changed since it was last read,
+        and not since the previous poll (so a file still being written is
+        never read), applies the difference as one update.  Returns True
+        if it did.  A file that cannot be read for now (an editor may be
+        replacing it) is tried again at the next poll.
+        >>> import tempfile
+        >>> name = os.path.join(tempfile.mkdtemp(), 'words.txt')
+        >>> with open(name, 'w') as f: f.write('cat\\n')
+        4
+        >>> live = LiveLexicon(Lexicon(['cat']), name)
+        >>> with open(name, 'a') as f: f.write('dog\\n')
+        4
+        >>> live.poll(), 'DOG' in live      # changed: wait a poll to be sure
+        (False, False)
+        >>> live.poll(), 'DOG' in live
+        (True, True)
+        >>> os.remove(name); live.poll(), 'DOG' in live
+        (False, True)
+        """
+        if self._fileName is None:
+            return False
+        with self._lock:
+            try:
+                stamp = _fileStamp(self._fileName)
+                if stamp == self._read or stamp != self._seen:
+                    self._seen = stamp
+                    return False
+                with open(self._fileName) as f:
+                    words = {line.strip().upper() for line in f} - {''}
+                # written to while being read: read it once it settles
+                if _fileStamp(self._fileName) != stamp:
+                    return False
+            except OSError:
+                self._seen = None
+                return False
+            current = self._current
+            self._current = current.withChanges(words.difference(current),
+                                                [w for w in current if w not in words])
+            self._read = stamp
+            return True
+
+
+def _fileStamp(fileName):
+    """Returns the (modification time, size) of a file."""
+    status = os.stat(fileName)
+    return (status.st_mtime_ns, status.st_size)
+
+
+# lexicons that have already been read, keyed by file name
+_lexicons = {}
+_liveLexicons = {}
+
+def readLexicon(lexiconName='bogwords.txt'):
+    """
+    Returns the Lexicon stored in the file lexiconName (one word per line).
+    The file is only read the first time; later calls share the same object.
+    """
+    lexicon = _lexicons.get(lexiconName)
+    if lexicon is None:
+        with open(lexiconName) as f:
+            lexicon = Lexicon(f)
+        _lexicons[lexiconName] = lexicon
+    return lexicon
+
+
+def watchLexicon(lexiconName='bogwords.txt'):
+    """
+    Returns the LiveLexicon for the file lexiconName, shared by every caller.
+    Call its poll method from time to time to pick up edits to the file.
+    """
+    live = _liveLexicons.get(lexiconName)
+    if live is None:
+        live = LiveLexicon(readLexicon(lexiconName), lexiconName)
+        _liveLexicons[lexiconName] = live
+    return live
+
+
+if __name__ == "__main__":
+    from doctest import testmod
+    testmod()
@@ -0,0 +1,79 @@
+"""
+A load-test client for boggleserver.  Each simulated client starts its own
+round, fetches the solution and then submits a mix of valid, repeated and
+bogus words, timing every SUBMIT round trip.  Reports p50/p99 latency.
+
+Run with:  python boggleloadtest.py --clients 1000 --submits 50
+"""
+
+import asyncio
+import math
+import random
+import time
+
+def percentile(samples, fraction):
+    """
+    Returns the sample at the given fraction of the sorted samples.
+    >>> percentile([5, 1, 4, 2, 3], 0.5)
+    3
+    >>> percentile(list(range(1, 101)), 0.99)
+    99
+    """
+    ordered = sorted(samples)
+    index = math.ceil(fraction * len(ordered)) - 1
+    return ordered[min(max(index, 0), len(ordered) - 1)]
+
+async def _request(reader, writer, line):
+    writer.write(line.encode('ascii') + b'\n')
+    await writer.drain()
+    return (await reader.readline()).decode('ascii').split()
+
+async def _runClient(host, port, submits, latencies, rng):
+    """Plays one round and appends SUBMIT latencies (seconds)."""
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        gameId = (await _request(reader, writer, 'NEW'))[1]
+        words = (await _request(reader, writer, 'SOLUTION ' + gameId))[2:]
+        player = 'p' + gameId
+        for i in range(submits):
+            if words and rng.random() < 0.7:
+                word = rng.choice(words)
+            else:
+                word = ''.join(rng.choice('ABCDEFGHIJKLMNOPRSTUVWY') for j in range(5))
+            start = time.perf_counter()
+            await _request(reader, writer, 'SUBMIT {} {} {}'.format(gameId, player, word))
+            latencies.append(time.perf_counter() - start)
+        await _request(reader, writer, 'END ' + gameId)
+        await _request(reader, writer, 'QUIT')
+    finally:
+        writer.close()
+
+async def runLoadTest(host='127.0.0.1', port=8765, clients=100, submits=50, seed=0):
+    """Runs clients concurrent rounds and returns the list of latencies."""
+    rng = random.Random(seed)
+    latencies = []
+    await asyncio.gather(*[_runClient(host, port, submits, latencies, rng)
+                           for i in range(clients)])
+    return latencies
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Load test a Boggle server")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--clients', type=int, default=100)
+    parser.add_argument('--submits', type=int, default=50)
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    latencies = asyncio.run(runLoadTest(args.host, args.port, args.clients, args.submits))
+    elapsed = time.perf_counter() - start
+    print("{} submits from {} clients in {:.2f}s ({:.0f}/s)".format(
+        len(latencies), args.clients, elapsed, len(latencies) / elapsed))
+    print("p50 {:.3f} ms   p99 {:.3f} ms".format(percentile(latencies, 0.50) * 1000,
+                                                percentile(latencies, 0.99) * 1000))
+
+
+if __name__ == "__main__":
+    main()
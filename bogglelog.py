@@ -0,0 +1,138 @@
+"""
+A compact append-only log of everything needed to reproduce a game: the
+random seed, the faces produced by every shake, the start of every timed
+round, and every click and key.
+
+Each record is a one byte tag followed by a fixed little-endian payload:
+
+    b'S'  seed      uint64                          (9 bytes)
+    b'B'  shake     uint8 count, one byte per face  (2 + count bytes)
+    b'C'  click     uint32 ms since seed, float32 x, float32 y  (13 bytes)
+    b'K'  key       uint32 ms since seed, uint8 length, keysym  (6 + length bytes)
+    b'R'  round     uint32 ms since seed, float32 seconds long  (9 bytes)
+
+A b'S' record starts a new session, so several sessions can share a file.
+"""
+
+import random
+import struct
+import time
+
+from boggledice import FACES, FACE_CODES
+from brandom import randomize
+
+SEED = b'S'
+SHAKE = b'B'
+CLICK = b'C'
+KEY = b'K'
+ROUND = b'R'
+
+_SEED = struct.Struct('<Q')
+_CLICK = struct.Struct('<Iff')
+_KEY = struct.Struct('<IB')
+_ROUND = struct.Struct('<If')
+
+class EventLog:
+    """An event log has the following attributes:
+       *  _file is the binary file records are appended to
+       *  _start is the time (seconds) of the last seed record
+    """
+
+    __slots__ = ['_file', '_start']
+
+    def __init__(self, fileName):
+        self._file = open(fileName, 'ab')
+        self._start = time.monotonic()
+
+    def recordSeed(self, seed):
+        """Starts a new session whose random numbers come from seed."""
+        self._start = time.monotonic()
+        self._file.write(SEED + _SEED.pack(seed))
+
+    def recordShake(self, faces):
+        """Records the faces (column by column) produced by a shake."""
+        self._file.write(SHAKE + bytes([len(faces)]) +
+                         bytes(FACE_CODES[face] for face in faces))
+
+    def __elapsed(self):
+        """Returns the ms since the seed record, as stored in records."""
+        return int((time.monotonic() - self._start) * 1000) & 0xFFFFFFFF
+
+    def recordClick(self, x, y):
+        """Records a click at window location (x, y)."""
+        self._file.write(CLICK + _CLICK.pack(self.__elapsed(), x, y))
+
+    def recordKey(self, key):
+        """Records a key press (a Tk keysym such as "a" or "Return")."""
+        keysym = key.encode('ascii', 'replace')[:255]
+        self._file.write(KEY + _KEY.pack(self.__elapsed(), len(keysym)) + keysym)
+
+    def recordRound(self, seconds):
+        """Records the start of a timed round lasting seconds, so a replay
+        ignores the input the game ignored once it ran out."""
+        self._file.write(ROUND + _ROUND.pack(self.__elapsed(), seconds))
+
+    def flush(self):
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
+
+
+def randomizeAndRecord(log, seed=None):
+    """
+    Seeds brandom like randomize(seed) and records the seed in log.  If
+    seed is None a fresh one is drawn so the session can be reproduced.
+    Returns the seed used.
+    """
+    if seed is None:
+        seed = random.SystemRandom().getrandbits(63)
+    randomize(seed)
+    log.recordSeed(seed)
+    return seed
+
+def readEvents(fileName):
+    """
+    Generates the records of a log as (tag, value) pairs: (SEED, seed),
+    (SHAKE, faces), (CLICK, (ms, x, y)), (KEY, (ms, keysym)) or (ROUND,
+    (ms, seconds)).  A truncated final record, as left by a crash
+    mid-write, is ignored.
+    """
+    with open(fileName, 'rb') as f:
+        data = f.read()
+    pos = 0
+    while pos < len(data):
+        tag = data[pos:pos + 1]
+        pos += 1
+        if tag == SEED:
+            if pos + _SEED.size > len(data):
+                return
+            yield (SEED, _SEED.unpack_from(data, pos)[0])
+            pos += _SEED.size
+        elif tag == SHAKE:
+            if pos >= len(data) or pos + 1 + data[pos] > len(data):
+                return
+            count = data[pos]
+            yield (SHAKE, [FACES[code] for code in data[pos + 1:pos + 1 + count]])
+            pos += 1 + count
+        elif tag == CLICK:
+            if pos + _CLICK.size > len(data):
+                return
+            yield (CLICK, _CLICK.unpack_from(data, pos))
+            pos += _CLICK.size
+        elif tag == KEY:
+            if pos + _KEY.size > len(data):
+                return
+            ms, length = _KEY.unpack_from(data, pos)
+            pos += _KEY.size
+            if pos + length > len(data):
+                return
+            yield (KEY, (ms, data[pos:pos + length].decode('ascii')))
+            pos += length
+        elif tag == ROUND:
+            if pos + _ROUND.size > len(data):
+                return
+            yield (ROUND, _ROUND.unpack_from(data, pos))
+            pos += _ROUND.size
+        else:
+            raise ValueError("corrupt event log at byte {}".format(pos - 1))
@@ -0,0 +1,166 @@
+"""
+A compact, hashable value for a Boggle board.  Each face is stored as its
+5 bit code (see boggledice.FACES, where "Qu" is a symbol of its own), so a
+4x4 board fits in one 80 bit integer, or 12 bytes with its dimensions.
+Boards can then be used as dict keys, stored in corpora or sent over the
+network without any of the graphical objects.
+"""
+
+from functools import lru_cache
+
+from boggledice import FACES, FACE_CODES, boardToText, boardFromText
+
+BITS = 5
+_MASK = (1 << BITS) - 1
+
+@lru_cache(maxsize=None)
+def symmetryMaps(rows=4, cols=4):
+    """
+    Returns the index maps of the rotations and reflections of a rows x
+    cols grid (8 for a square, 4 otherwise).  Applying map m to a list of
+    faces gives [faces[i] for i in m]; every map keeps adjacency intact,
+    so all the transformed boards have the same words.
+    >>> len(symmetryMaps(4, 4)), len(symmetryMaps(3, 5))
+    (8, 4)
+    >>> symmetryMaps(2, 2)[1]
+    (2, 3, 0, 1)
+    """
+    last_c, last_r = cols - 1, rows - 1
+    transforms = [lambda c, r: (c, r), lambda c, r: (last_c - c, r),
+                  lambda c, r: (c, last_r - r), lambda c, r: (last_c - c, last_r - r)]
+    if rows == cols:
+        transforms += [lambda c, r: (r, c), lambda c, r: (last_r - r, c),
+                       lambda c, r: (r, last_c - c), lambda c, r: (last_r - r, last_c - c)]
+    maps = []
+    for transform in transforms:
+        m = [0] * (rows * cols)
+        for c in range(cols):
+            for r in range(rows):
+                newC, newR = transform(c, r)
+                m[newC * rows + newR] = c * rows + r
+        maps.append(tuple(m))
+    return tuple(maps)
+
+class PackedBoard:
+    """A packed board has three attributes:
+       *  _value holds the face codes, face i in bits 5*i to 5*i + 4
+       *  _rows, _cols give the board dimensions
+    Faces are in boggledice order (column by column).
+    """
+
+    __slots__ = ['_value', '_rows', '_cols']
+
+    def __init__(self, value, rows=4, cols=4):
+        self._value = value
+        self._rows = rows
+        self._cols = cols
+
+    @classmethod
+    def fromFaces(cls, faces, rows=4, cols=4):
+        """
+        Packs a list of faces.
+        >>> PackedBoard.fromFaces(['Qu', 'A', 'B', 'C'], 2, 2)
+        PackedBoard.fromText('QuABC', 2, 2)
+        """
+        if len(faces) != rows * cols:
+            raise ValueError("expected {} faces, got {}".format(rows * cols, len(faces)))
+        value = 0
+        for face in reversed(faces):
+            value = (value << BITS) | FACE_CODES[face]
+        return cls(value, rows, cols)
+
+    @classmethod
+    def fromBoard(cls, board):
+        """Packs the faces of a BoggleBoard (or HeadlessBoard)."""
+        return cls.fromFaces(board.getFaces(), board.getRows(), board.getCols())
+
+    @classmethod
+    def fromText(cls, text, rows=4, cols=4):
+        """Packs a board in boggledice.boardToText form."""
+        return cls.fromFaces(boardFromText(text), rows, cols)
+
+    @classmethod
+    def fromBytes(cls, data):
+        """
+        Unpacks the result of toBytes.
+        >>> board = PackedBoard.fromText('QuABCDEFGHIJKLMNO')
+        >>> len(board.toBytes()), PackedBoard.fromBytes(board.toBytes()) == board
+        (12, True)
+        """
+        return cls(int.from_bytes(data[2:], 'little'), data[0], data[1])
+
+    def getRows(self):
+        return self._rows
+
+    def getCols(self):
+        return self._cols
+
+    def getValue(self):
+        """Returns the packed integer."""
+        return self._value
+
+    def getFaces(self):
+        """Returns the list of faces, column by column."""
+        value = self._value
+        faces = []
+        for i in range(self._rows * self._cols):
+            faces.append(FACES[value & _MASK])
+            value >>= BITS
+        return faces
+
+    def canonical(self):
+        """
+        Returns the PackedBoard with the smallest value among the rotations
+        and reflections of this board.  Boards that are symmetric images of
+        each other have the same canonical board.
+        >>> a = PackedBoard.fromText('ABCD', 2, 2)
+        >>> b = PackedBoard.fromText('DCBA', 2, 2)
+        >>> a.canonical() == b.canonical(), a == b
+        (True, False)
+        """
+        codes = []
+        value = self._value
+        for i in range(self._rows * self._cols):
+            codes.append(value & _MASK)
+            value >>= BITS
+        best = self._value
+        for m in symmetryMaps(self._rows, self._cols):
+            value = 0
+            for i in reversed(m):
+                value = (value << BITS) | codes[i]
+            if value < best:
+                best = value
+        if best == self._value:
+            return self
+        return PackedBoard(best, self._rows, self._cols)
+
+    def applyTo(self, board):
+        """Sets the letters of a BoggleBoard (or HeadlessBoard) to these faces."""
+        board.setFaces(self.getFaces())
+
+    def toBytes(self):
+        """Returns rows, cols and the packed faces as bytes."""
+        size = (self._rows * self._cols * BITS + 7) // 8
+        return bytes([self._rows, self._cols]) + self._value.to_bytes(size, 'little')
+
+    def __eq__(self, other):
+        if not isinstance(other, PackedBoard):
+            return NotImplemented
+        return (self._value == other._value and self._rows == other._rows
+                and self._cols == other._cols)
+
+    def __hash__(self):
+        return hash((self._value, self._rows, self._cols))
+
+    def __str__(self):
+        return boardToText(self.getFaces())
+
+    def __repr__(self):
+        if (self._rows, self._cols) == (4, 4):
+            return "PackedBoard.fromText('{}')".format(self)
+        return "PackedBoard.fromText('{}', {}, {})".format(self, self._rows, self._cols)
+
+
+if __name__ == "__main__":
+    from doctest import testmod
+    testmod()
@@ -0,0 +1,129 @@
+"""
+Solves one very large custom board (15x15 to 20x20 grids for showcase
+events) on several cores.  The search is split into tasks by starting
+cell, or by starting pair of adjacent cells (the first two letters), and
+the tasks are handed out to a process pool as workers become free.  The
+deduplicated words are merged and the work done by every worker reported.
+
+Run with:  python boggleparallel.py --size 20 --workers 4
+"""
+
+import os
+import time
+from multiprocessing import Pool
+
+from bogglelexicon import readLexicon
+from bogglesolver import neighbours, solveFrom
+
+# set in every worker process by _initWorker
+_board = None
+
+def _initWorker(faces, rows, cols, lexiconName):
+    global _board
+    _board = (faces, rows, cols, readLexicon(lexiconName))
+
+def _solveTask(starts):
+    """Solves one task in a worker; returns (pid, words, seconds, starts)."""
+    faces, rows, cols, lexicon = _board
+    begin = time.perf_counter()
+    words = solveFrom(faces, starts, rows, cols, lexicon)
+    return (os.getpid(), words, time.perf_counter() - begin, len(starts))
+
+def makeTasks(rows, cols, split='cell', perTask=1):
+    """
+    Returns the list of tasks (lists of start paths) covering every path
+    on a rows x cols board, split by starting 'cell' or starting 'pair'.
+    >>> len(makeTasks(3, 3)), len(makeTasks(3, 3, 'pair')), len(makeTasks(3, 3, 'pair', 8))
+    (9, 40, 5)
+    """
+    adjacent = neighbours(rows, cols)
+    if split == 'cell':
+        starts = [(cell,) for cell in range(rows * cols)]
+    elif split == 'pair':
+        starts = [(cell, nxt) for cell in range(rows * cols) for nxt in adjacent[cell]]
+    else:
+        raise ValueError("split must be 'cell' or 'pair'")
+    return [starts[i:i + perTask] for i in range(0, len(starts), perTask)]
+
+
+class LoadReport:
+    """How the work of one parallel solve was spread over the workers:
+       *  workers maps a worker pid to [tasks, starts, seconds]
+       *  wallSeconds is the elapsed time of the whole solve
+    """
+
+    __slots__ = ['workers', 'wallSeconds']
+
+    def __init__(self):
+        self.workers = {}
+        self.wallSeconds = 0.0
+
+    def addTask(self, pid, seconds, starts):
+        load = self.workers.setdefault(pid, [0, 0, 0.0])
+        load[0] += 1
+        load[1] += starts
+        load[2] += seconds
+
+    def imbalance(self):
+        """Returns the busiest worker's time over the mean (1.0 is perfect)."""
+        times = [load[2] for load in self.workers.values()]
+        if not times or not sum(times):
+            return 1.0
+        return max(times) / (sum(times) / len(times))
+
+    def __str__(self):
+        lines = ["worker {}: {} tasks, {} starts, {:.3f}s busy".format(pid, *load)
+                 for pid, load in sorted(self.workers.items())]
+        lines.append("wall {:.3f}s, imbalance {:.2f}".format(self.wallSeconds, self.imbalance()))
+        return '\n'.join(lines)
+
+
+def solveParallel(faces, rows, cols, workers=None, split='cell', perTask=1,
+                  lexiconName='bogwords.txt'):
+    """
+    Returns (sorted words, LoadReport) for the board, solved by a pool of
+    workers processes (one per core if None).
+    """
+    report = LoadReport()
+    found = set()
+    begin = time.perf_counter()
+    with Pool(workers, _initWorker, (list(faces), rows, cols, lexiconName)) as pool:
+        for pid, words, seconds, starts in pool.imap_unordered(
+                _solveTask, makeTasks(rows, cols, split, perTask)):
+            found |= words
+            report.addTask(pid, seconds, starts)
+    report.wallSeconds = time.perf_counter() - begin
+    return sorted(found), report
+
+
+def main(argv=None):
+    import argparse
+    from boggledice import CUBES, boardFromText, shakeFaces
+    from brandom import boardRandom
+    parser = argparse.ArgumentParser(description="Solve one large board on many cores")
+    parser.add_argument('--size', type=int, default=15, help="rows and columns of a random board")
+    parser.add_argument('--board', help="board text (see boggledice.boardToText), size x size faces")
+    parser.add_argument('--workers', type=int, default=None)
+    parser.add_argument('--split', choices=['cell', 'pair'], default='cell')
+    parser.add_argument('--per-task', type=int, default=1)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+
+    size = args.size
+    if args.board:
+        faces = boardFromText(args.board)
+    else:
+        # a large board rolls the standard dice as many times as needed
+        rng = boardRandom(0, args.seed)
+        faces = []
+        while len(faces) < size * size:
+            faces += shakeFaces(CUBES, rng)
+        faces = faces[:size * size]
+
+    words, report = solveParallel(faces, size, size, args.workers, args.split, args.per_task)
+    print("{} words on a {}x{} board".format(len(words), size, size))
+    print(report)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""
+Replays the sessions recorded in a bogglelog event log through the real
+BoggleGame click and key logic on a HeadlessBoard, as fast as the CPU allows.
+Every recorded shake is compared with the shake the replay produces, so a
+replay both reproduces bug reports and checks the game is deterministic.
+Timed rounds run on a clock set from the recorded times, so input that
+came after a round ran out is ignored just as it was in the live game.
+
+Run with:  python bogglereplay.py session.log [--repeat 100]
+"""
+
+import time
+
+from bogglegame import BoggleGame
+from bogglelog import SEED, SHAKE, CLICK, KEY, ROUND, readEvents
+from boggletimer import RoundTimer
+from brandom import randomize
+from headlessboard import HeadlessBoard, HeadlessPoint
+
+class ReplayResult:
+    """The outcome of replaying one session:
+       *  seed is the session's random seed
+       *  clicks is the number of clicks replayed
+       *  recordedMs is the session's recorded length in milliseconds
+       *  mismatches lists (shake number, recorded, replayed) faces
+       *  game is the BoggleGame left at the end of the session
+    """
+
+    __slots__ = ['seed', 'clicks', 'recordedMs', 'mismatches', 'game', '_shakes']
+
+    def __init__(self, seed, game):
+        self.seed = seed
+        self.game = game
+        self.clicks = 0
+        self.recordedMs = 0
+        self.mismatches = []
+        self._shakes = 0
+
+    def _clock(self):
+        """The replay's clock: the recorded time of the latest event."""
+        return self.recordedMs / 1000
+
+    def _checkShake(self, faces):
+        replayed = self.game.getBoard().getFaces()
+        if faces != replayed:
+            self.mismatches.append((self._shakes, faces, replayed))
+        self._shakes += 1
+
+    def __repr__(self):
+        return "ReplayResult(seed={}, clicks={}, mismatches={}, found={})".format(
+            self.seed, self.clicks, len(self.mismatches), self.game.getFoundWords())
+
+
+def replay(fileName):
+    """Replays every session in the log and returns a list of ReplayResults."""
+    results = []
+    result = None
+    for tag, value in readEvents(fileName):
+        if tag == SEED:
+            randomize(value)
+            result = ReplayResult(value, BoggleGame(None, board=HeadlessBoard()))
+            results.append(result)
+        elif result is None:
+            raise ValueError("event log does not start with a seed")
+        elif tag == SHAKE:
+            result._checkShake(value)
+        elif tag == ROUND:
+            ms, seconds = value
+            result.recordedMs = ms
+            result.game.setTimer(RoundTimer(seconds, result._clock))
+        elif tag == CLICK:
+            ms, x, y = value
+            result.clicks += 1
+            result.recordedMs = ms
+            # let the round run out first, as the game loop would have
+            result.game.tick()
+            result.game.doOneClick(HeadlessPoint(x, y))
+        elif tag == KEY:
+            ms, key = value
+            result.recordedMs = ms
+            result.game.tick()
+            result.game.doOneKey(key)
+    return results
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Replay a Boggle event log headlessly")
+    parser.add_argument('log')
+    parser.add_argument('--repeat', type=int, default=1,
+                        help="replay the log this many times and report the speed")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    for i in range(args.repeat):
+        results = replay(args.log)
+    elapsed = (time.perf_counter() - start) / args.repeat
+
+    clicks = sum(result.clicks for result in results)
+    recorded = sum(result.recordedMs for result in results) / 1000
+    for result in results:
+        print(result)
+        for shake, recorded_faces, replayed in result.mismatches:
+            print("  shake {} differs: recorded {} replayed {}".format(shake, recorded_faces, replayed))
+    print("{} sessions, {} clicks replayed in {:.3f} ms ({:.1f} us/click)".format(
+        len(results), clicks, elapsed * 1000, elapsed * 1e6 / max(clicks, 1)))
+    if recorded and elapsed:
+        print("{:.0f}x real time".format(recorded / elapsed))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Implements a headless round of Boggle: one shared board and the words
+each player has submitted, checked with the same rules as BoggleGame.
+"""
+
+from boggledice import CUBES, shakeFaces
+from bogglefeasible import diceIndex, feasibleLexicon
+from bogglelexicon import readLexicon
+from bogglesolver import solveCached, scoreWord
+
+# reasons a submitted word can be rejected
+NOT_A_WORD = 'unknown'
+ALREADY_FOUND = 'duplicate'
+NOT_ON_BOARD = 'offboard'
+IMPOSSIBLE = 'impossible'
+
+def isNewValidWord(word, validWords, foundWords):
+    """
+    The rule BoggleGame uses to accept a word: it must be in the lexicon
+    and not found before.
+    >>> isNewValidWord('CAT', {'CAT'}, []), isNewValidWord('CAT', {'CAT'}, ['CAT'])
+    (True, False)
+    """
+    return word in validWords and word not in foundWords
+
+class BoggleRound:
+    """A Boggle round has several attributes:
+       *  _faces is the list of faces on the shared board
+       *  _rows, _cols give the board dimensions
+       *  _lexicon is the (shared) Lexicon or LiveLexicon of valid words
+       *  _cubes is the list of dice the board was shaken with, or None if
+          the faces were given
+       *  _players maps a player name to the list of words they found
+    """
+
+    __slots__ = ['_faces', '_rows', '_cols', '_lexicon', '_cubes', '_players']
+
+    def __init__(self, faces=None, rows=4, cols=4, lexicon=None):
+        """
+        Construct a new round on the given board, or on a freshly shaken
+        board if faces is None.
+        """
+        self._cubes = None
+        if faces is None:
+            faces = shakeFaces()
+            self._cubes = CUBES
+        if lexicon is None:
+            lexicon = readLexicon()
+        self._faces = list(faces)
+        self._rows = rows; self._cols = cols
+        self._lexicon = lexicon
+        self._players = {}
+
+    def getFaces(self):
+        return self._faces
+
+    def getRows(self):
+        return self._rows
+
+    def getCols(self):
+        return self._cols
+
+    def __solve(self, lexicon):
+        # a board rolled from known dice only needs the words they can spell
+        if self._cubes is not None:
+            lexicon = feasibleLexicon(lexicon, self._cubes)
+        return solveCached(self._faces, self._rows, self._cols, lexicon)
+
+    def getSolution(self):
+        """Returns the frozenset of every word on the board."""
+        return self.__solve(self._lexicon)
+
+    def getPlayers(self):
+        """Returns the names of the players in the round."""
+        return list(self._players)
+
+    def addPlayer(self, player):
+        """Adds player (str) to the round if not already playing."""
+        self._players.setdefault(player, [])
+
+    def getFoundWords(self, player):
+        """Returns the list of words player has found so far."""
+        return self._players.get(player, [])
+
+    def getScore(self, player):
+        """Returns the total score of player."""
+        return sum(scoreWord(word) for word in self.getFoundWords(player))
+
+    def submit(self, player, word):
+        """
+        Checks word for player.  Returns (True, score) if it is accepted,
+        and otherwise (False, reason) with reason one of NOT_A_WORD,
+        ALREADY_FOUND, IMPOSSIBLE (no roll of the dice could spell it)
+        or NOT_ON_BOARD.
+        >>> from bogglelexicon import Lexicon
+        >>> rnd = BoggleRound(['C', 'A', 'T', 'S'], 2, 2, Lexicon(['cat', 'dog']))
+        >>> rnd.submit('ann', 'cat'), rnd.submit('ann', 'CAT')
+        ((True, 1), (False, 'duplicate'))
+        >>> rnd.submit('bob', 'CAT'), rnd.submit('bob', 'DOG'), rnd.submit('bob', 'CAB')
+        ((True, 1), (False, 'offboard'), (False, 'unknown'))
+        >>> BoggleRound(lexicon=Lexicon(['buzz'])).submit('ann', 'buzz')
+        (False, 'impossible')
+        """
+        word = word.upper()
+        self.addPlayer(player)
+        foundWords = self._players[player]
+        # check against one lexicon version even if it is updated meanwhile
+        lexicon = self._lexicon.snapshot()
+        if not isNewValidWord(word, lexicon, foundWords):
+            return (False, ALREADY_FOUND if word in foundWords else NOT_A_WORD)
+        if self._cubes is not None and not diceIndex(self._cubes).canSpell(word):
+            return (False, IMPOSSIBLE)
+        if word not in self.__solve(lexicon):
+            return (False, NOT_ON_BOARD)
+        foundWords.append(word)
+        return (True, scoreWord(word))
+
+
+if __name__ == "__main__":
+    from doctest import testmod
+    testmod()
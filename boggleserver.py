@@ -0,0 +1,212 @@
+"""
+A headless asyncio server hosting many concurrent Boggle rounds over a
+line-based TCP protocol.  Every round shares the process-wide lexicon and
+solve results; no graphics window is ever opened.
+
+Each request is one line of space separated tokens and gets one line back:
+
+    NEW                          ->  GAME <id> <board>
+    JOIN <id> <player>           ->  JOINED <id> <board>
+    SUBMIT <id> <player> <word>  ->  OK <word> <score>  or  NO <word> <reason>
+    SCORE <id> <player>          ->  SCORE <player> <points> <words found>
+    SOLUTION <id>                ->  SOLUTION <count> <word> <word> ...
+    END <id>                     ->  ENDED <id>
+    STATS                        ->  STATS <boards> <player rounds> <words per board>
+                                     <found ratio> <median score>
+    QUIT                         ->  BYE (and the connection is closed)
+
+Malformed requests, and lines that are not ASCII, are answered with
+ERR <message>.  Boards are sent in
+the text form of boggledice.boardToText.  Every ended round is added to
+the server's streaming statistics (see bogglestats).  Rounds a
+connection started with NEW and has not ended are dropped, without
+being counted, when it closes.
+
+The lexicon file is watched while the server runs: edits to it are
+applied as one update, and rounds switch to the new word list at once.
+
+Run with:  python boggleserver.py --port 8765
+"""
+
+import asyncio
+import itertools
+
+from boggledice import boardToText
+from bogglelexicon import readLexicon, watchLexicon
+from boggleround import BoggleRound
+from bogglestats import RoundStats
+
+class BoggleServer:
+    """A Boggle server has the following attributes:
+       *  _lexicon is the Lexicon (or LiveLexicon) shared by all rounds
+       *  _games maps a game id (str) to its BoggleRound
+       *  _ids generates new game ids
+       *  _stats is the RoundStats of every round ended so far
+    """
+
+    __slots__ = ['_lexicon', '_games', '_ids', '_stats']
+
+    def __init__(self, lexicon=None):
+        if lexicon is None:
+            lexicon = readLexicon()
+        self._lexicon = lexicon
+        self._games = {}
+        self._ids = itertools.count(1)
+        self._stats = RoundStats()
+
+    def getStats(self):
+        return self._stats
+
+    def getGameCount(self):
+        """Returns the number of rounds currently hosted."""
+        return len(self._games)
+
+    def newGame(self, faces=None):
+        """Starts a new round and returns its id."""
+        gameId = str(next(self._ids))
+        self._games[gameId] = BoggleRound(faces, lexicon=self._lexicon)
+        return gameId
+
+    def dropGames(self, gameIds):
+        """Drops the rounds in gameIds that have not ended, without adding
+        them to the statistics."""
+        for gameId in gameIds:
+            self._games.pop(gameId, None)
+
+    def handleLine(self, line, started=None):
+        """
+        Processes one request line and returns the reply line (without
+        the trailing newline).  If started is given, it is the set of ids
+        of the rounds the connection has started: NEW adds to it.
+        >>> from bogglelexicon import Lexicon
+        >>> server = BoggleServer(Lexicon(['cat']))
+        >>> server.newGame(['C', 'A', 'T', 'S'] * 4)
+        '1'
+        >>> server.handleLine('SUBMIT 1 ann cat')
+        'OK CAT 1'
+        >>> server.handleLine('SUBMIT 2 ann cat')
+        'ERR no such game'
+        >>> server.handleLine('SUBMIT 1 ann caf\u00e9')
+        'ERR request is not ASCII'
+        >>> server.handleLine('END 1'), server.handleLine('STATS')
+        ('ENDED 1', 'STATS 1 1 1.00 1.000 1')
+        >>> started = set()
+        >>> server.handleLine('NEW', started).split()[:2], started
+        (['GAME', '2'], {'2'})
+        >>> server.dropGames(started); server.getGameCount()
+        0
+        """
+        # words are echoed back, and replies must stay ASCII
+        if not line.isascii():
+            return 'ERR request is not ASCII'
+        tokens = line.split()
+        if not tokens:
+            return 'ERR empty request'
+        command, args = tokens[0].upper(), tokens[1:]
+
+        if command == 'NEW' and not args:
+            gameId = self.newGame()
+            if started is not None:
+                started.add(gameId)
+            return 'GAME {} {}'.format(gameId, boardToText(self._games[gameId].getFaces()))
+        elif command == 'QUIT':
+            return 'BYE'
+        elif command == 'STATS' and not args:
+            stats = self._stats
+            return 'STATS {} {} {:.2f} {:.3f} {}'.format(
+                stats.boards.count, stats.getPlayerRounds(), stats.boards.mean,
+                stats.foundRatio.mean, stats.scorePercentile(0.5))
+
+        game = self._games.get(args[0]) if args else None
+        if game is None:
+            return 'ERR no such game'
+
+        if command == 'JOIN' and len(args) == 2:
+            game.addPlayer(args[1])
+            return 'JOINED {} {}'.format(args[0], boardToText(game.getFaces()))
+        elif command == 'SUBMIT' and len(args) == 3:
+            accepted, result = game.submit(args[1], args[2])
+            return '{} {} {}'.format('OK' if accepted else 'NO', args[2].upper(), result)
+        elif command == 'SCORE' and len(args) == 2:
+            return 'SCORE {} {} {}'.format(args[1], game.getScore(args[1]),
+                                           len(game.getFoundWords(args[1])))
+        elif command == 'SOLUTION' and len(args) == 1:
+            words = sorted(game.getSolution())
+            return ' '.join(['SOLUTION', str(len(words))] + words)
+        elif command == 'END' and len(args) == 1:
+            del self._games[args[0]]
+            solution = game.getSolution()
+            self._stats.addSolve(solution)
+            for player in game.getPlayers():
+                self._stats.addPlayer(game.getFoundWords(player), solution)
+            return 'ENDED {}'.format(args[0])
+        return 'ERR bad request'
+
+    async def _serveClient(self, reader, writer):
+        """Answers request lines from one connection until QUIT or EOF,
+        then drops the rounds it started and did not end."""
+        started = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                reply = self.handleLine(line.decode('ascii', 'replace'), started)
+                writer.write(reply.encode('ascii', 'replace') + b'\n')
+                await writer.drain()
+                if reply == 'BYE':
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            self.dropGames(started)
+            writer.close()
+
+    async def _watchLexicon(self, interval):
+        """Picks up edits to the lexicon file every interval seconds."""
+        while True:
+            await asyncio.sleep(interval)
+            if await asyncio.to_thread(self._lexicon.poll):
+                print("Lexicon updated to version {} ({} words)".format(
+                    self._lexicon.getVersion(), len(self._lexicon)))
+
+    async def serve(self, host='127.0.0.1', port=8765, reloadInterval=None):
+        """Serves clients on host:port until cancelled.  If reloadInterval
+        is given and the lexicon is a LiveLexicon, its file is watched."""
+        server = await asyncio.start_server(self._serveClient, host, port)
+        watcher = None
+        if reloadInterval and hasattr(self._lexicon, 'poll'):
+            # keep a reference so the task is not garbage collected
+            watcher = asyncio.create_task(self._watchLexicon(reloadInterval))
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            if watcher is not None:
+                watcher.cancel()
+                try:
+                    await watcher
+                except asyncio.CancelledError:
+                    pass
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Headless Boggle game server")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--lexicon', default='bogwords.txt')
+    parser.add_argument('--reload-interval', type=float, default=5.0,
+                        help="seconds between checks of the lexicon file (0 to disable)")
+    args = parser.parse_args(argv)
+
+    server = BoggleServer(watchLexicon(args.lexicon))
+    print("Serving Boggle on {}:{}".format(args.host, args.port))
+    try:
+        asyncio.run(server.serve(args.host, args.port, args.reload_interval))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
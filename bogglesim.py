@@ -0,0 +1,258 @@
+"""
+Plays many rounds of Boggle with bots, headlessly, through the same
+BoggleGame.doOneClick logic a human uses.  Rounds are spread over a pool
+of worker processes and their statistics merged, so thousands of rounds
+a second can be played to tune board generation and scoring or to soak
+test the game logic.
+
+Run with:  python bogglesim.py --strategy greedy --rounds 10000 --workers 4
+"""
+
+import os
+import time
+from collections import Counter
+from multiprocessing import Pool
+
+from bogglefeasible import feasibleLexicon
+from bogglegame import BoggleGame
+from bogglelexicon import readLexicon
+from bogglesolver import findPath, neighbours, scoreWord, solveCached
+from bogglestats import RoundStats
+from brandom import boardRandom
+from headlessboard import HeadlessBoard, HeadlessPoint
+
+def clickCell(game, cell):
+    """Clicks the center of the tile at cell index (col * rows + row)."""
+    board = game.getBoard()
+    col, row = divmod(cell, board.getRows())
+    size = board.getSize()
+    return game.doOneClick(HeadlessPoint(board.getXInset() + size * (col + 0.5),
+                                         board.getYInset() + size * (row + 0.5)))
+
+def clickPath(game, path):
+    """Clicks every tile of path, then the last one again to end the word."""
+    for cell in path:
+        clickCell(game, cell)
+    clickCell(game, path[-1])
+    return len(path) + 1
+
+
+class RandomWalker:
+    """
+    Wanders between adjacent tiles, never revisiting one, and ends a word
+    at random once it has at least shortest letters (or is stuck).
+    >>> stats = simulate('random', 50)
+    >>> round(stats.found / stats.available, 3)
+    0.06
+    """
+
+    def __init__(self, clicks=200, stop=0.7, shortest=3):
+        self._clicks = clicks
+        self._stop = stop
+        self._shortest = shortest
+
+    def playRound(self, game, solution, rng):
+        board = game.getBoard()
+        adjacent = neighbours(board.getRows(), board.getCols())
+        clicks = 0
+        while clicks < self._clicks:
+            path = [rng.randrange(len(adjacent))]
+            while len(path) < self._shortest or rng.random() > self._stop:
+                # step to a neighbour not on the path yet, if there is one
+                choices = [nxt for nxt in adjacent[path[-1]] if nxt not in path]
+                if not choices:
+                    break
+                path.append(rng.choice(choices))
+            clicks += clickPath(game, path)
+        return clicks
+
+
+class GreedySolver:
+    """Enters every word on the board, longest first."""
+
+    def playRound(self, game, solution, rng):
+        board = game.getBoard()
+        faces = board.getFaces()
+        clicks = 0
+        for word in sorted(solution, key=len, reverse=True):
+            clicks += clickPath(game, findPath(faces, word, board.getRows(), board.getCols()))
+        return clicks
+
+
+class HumanModel:
+    """A skill-limited player: only spots a fraction of the words, less
+    often the longer they are, enters at most a budget of words in a round
+    and sometimes slips onto a wrong tile, losing the word."""
+
+    def __init__(self, recall=0.5, maxLength=7, budget=25, slip=0.05):
+        self._recall = recall
+        self._maxLength = maxLength
+        self._budget = budget
+        self._slip = slip
+
+    def playRound(self, game, solution, rng):
+        board = game.getBoard()
+        faces = board.getFaces()
+        rows, cols = board.getRows(), board.getCols()
+        words = sorted(solution)
+        rng.shuffle(words)
+        clicks = 0
+        entered = 0
+        for word in words:
+            if entered == self._budget:
+                break
+            if len(word) > self._maxLength or rng.random() > self._recall ** (len(word) - 2):
+                continue
+            entered += 1
+            path = findPath(faces, word, rows, cols)
+            if rng.random() < self._slip:
+                # a slip lands on some tile mid-word, which usually resets it
+                path = path[:rng.randrange(1, len(path))] + [rng.randrange(rows * cols)]
+            clicks += clickPath(game, path)
+        return clicks
+
+
+STRATEGIES = {'random': RandomWalker, 'greedy': GreedySolver, 'human': HumanModel}
+
+
+class SimStats:
+    """Running totals over simulated rounds; stats from different workers
+    are combined with merge.  words holds the streaming aggregates of
+    bogglestats (word frequencies, score histogram and so on)."""
+
+    __slots__ = ['rounds', 'clicks', 'found', 'score', 'available', 'availableScore',
+                 'scores', 'seconds', 'words']
+
+    def __init__(self):
+        self.rounds = 0
+        self.clicks = 0
+        self.found = 0
+        self.score = 0
+        self.available = 0
+        self.availableScore = 0
+        self.scores = Counter()
+        self.seconds = 0.0
+        self.words = RoundStats()
+
+    def addRound(self, clicks, foundWords, solution):
+        score = sum(scoreWord(word) for word in foundWords)
+        self.rounds += 1
+        self.clicks += clicks
+        self.found += len(foundWords)
+        self.score += score
+        self.available += len(solution)
+        self.availableScore += sum(scoreWord(word) for word in solution)
+        self.scores[score] += 1
+        self.words.addRound(foundWords, solution)
+
+    def merge(self, other):
+        for name in self.__slots__:
+            if name not in ('scores', 'words'):
+                setattr(self, name, getattr(self, name) + getattr(other, name))
+        self.scores.update(other.scores)
+        self.words.merge(other.words)
+        return self
+
+    def report(self, wallSeconds=None):
+        """Returns a multi-line summary of the statistics."""
+        rounds = max(self.rounds, 1)
+        lines = ["{} rounds, {} clicks".format(self.rounds, self.clicks),
+                 "words per board {:.1f}, found per round {:.1f} ({:.1%} of words, {:.1%} of points)".format(
+                     self.available / rounds, self.found / rounds,
+                     self.found / max(self.available, 1), self.score / max(self.availableScore, 1)),
+                 "mean score {:.2f}, median score {}".format(self.score / rounds, self.medianScore())]
+        if wallSeconds:
+            lines.append("{:.0f} rounds/s ({:.0f} rounds/s per worker-second)".format(
+                self.rounds / wallSeconds, self.rounds / max(self.seconds, 1e-9)))
+        return '\n'.join(lines)
+
+    def medianScore(self):
+        half = self.rounds / 2
+        seen = 0
+        for score in sorted(self.scores):
+            seen += self.scores[score]
+            if seen >= half:
+                return score
+        return 0
+
+
+def playRounds(strategyName, firstRound, rounds, seed, options=None):
+    """Plays rounds numbered firstRound onwards with one bot and returns
+    their SimStats.  Round n always gets the board brandom.boardRandom(n,
+    seed) produces, so results do not depend on how rounds are split up.
+    One game is reset between rounds, as the RESET button would."""
+    strategy = STRATEGIES[strategyName](**(options or {}))
+    # only words the dice can spell can be on a board
+    lexicon = feasibleLexicon(readLexicon())
+    stats = SimStats()
+    start = time.perf_counter()
+    game = None
+    for roundId in range(firstRound, firstRound + rounds):
+        rng = boardRandom(roundId, seed)
+        if game is None:
+            game = BoggleGame(None, board=HeadlessBoard(rng=rng))
+        else:
+            game.newRound(rng)
+        board = game.getBoard()
+        solution = solveCached(board.getFaces(), board.getRows(), board.getCols(), lexicon)
+        clicks = strategy.playRound(game, solution, rng)
+        stats.addRound(clicks, game.getFoundWords(), solution)
+    stats.seconds = time.perf_counter() - start
+    return stats
+
+def simulate(strategyName, rounds, workers=1, seed=0, options=None, firstRound=0):
+    """Plays rounds rounds, numbered firstRound onwards, split across
+    workers processes; returns SimStats."""
+    jobs = []
+    for i in range(workers):
+        share = rounds // workers + (1 if i < rounds % workers else 0)
+        if share:
+            jobs.append((strategyName, firstRound, share, seed, options))
+        firstRound += share
+    if workers == 1:
+        results = [playRounds(*job) for job in jobs]
+    else:
+        with Pool(workers) as pool:
+            results = pool.starmap(playRounds, jobs)
+    stats = SimStats()
+    for result in results:
+        stats.merge(result)
+    return stats
+
+
+def main(argv=None):
+    import argparse
+    parser = argparse.ArgumentParser(description="Simulate Boggle rounds with bots")
+    parser.add_argument('--strategy', choices=sorted(STRATEGIES), default='greedy')
+    parser.add_argument('--rounds', type=int, default=1000)
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--checkpoint', help="keep word statistics in this file, resuming from it")
+    parser.add_argument('--batch', type=int, default=10000,
+                        help="rounds between checkpoints")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    if not args.checkpoint:
+        stats = simulate(args.strategy, args.rounds, args.workers, args.seed)
+        print(stats.report(time.perf_counter() - start))
+        print(stats.words.report())
+        return
+
+    # round n always plays the same board, so a resumed run carries on
+    # with the first round the checkpoint has not seen
+    words = RoundStats.load(args.checkpoint) if os.path.exists(args.checkpoint) else RoundStats()
+    done = words.boards.count
+    while done < args.rounds:
+        batch = min(args.batch, args.rounds - done)
+        stats = simulate(args.strategy, batch, args.workers, args.seed, firstRound=done)
+        words.merge(stats.words)
+        words.save(args.checkpoint)
+        done += batch
+        print("{} rounds ({:.0f} rounds/s)".format(done, stats.rounds / (time.perf_counter() - start)))
+        start = time.perf_counter()
+    print(words.report())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,162 @@
+"""
+Saves a game in progress as a compact, versioned binary snapshot and
+restores it.  A snapshot holds what is needed to carry on playing: the
+board faces, the words found, the letters selected by clicking (or the
+word being typed) and the scroll position of the found words list.
+
+Layout (little endian), version 1:
+
+    'BGS' version:u8
+    rows:u8 cols:u8 faces    the board, as PackedBoard.toBytes
+    scroll:u16
+    path:u8 cell:u8 ...      clicked cells (col * rows + row), in order
+    typed:u8 ascii           the word being typed
+    found:u16 (len:u8 ascii) ...
+
+A 4x4 game with 30 words found takes about 200 bytes.
+"""
+
+import struct
+
+from bogglepacked import PackedBoard
+
+MAGIC = b'BGS'
+VERSION = 1
+
+class GameState:
+    """The saved state of one game:
+       *  faces, rows, cols describe the board
+       *  foundWords is the list of words found, in the order found
+       *  path is the list of clicked cells of the current word
+       *  typed is the word being typed at the keyboard ('' if none)
+       *  scroll is the scroll position of the found words list
+    """
+
+    __slots__ = ['faces', 'rows', 'cols', 'foundWords', 'path', 'typed', 'scroll']
+
+    def __init__(self, faces, rows=4, cols=4, foundWords=(), path=(), typed='', scroll=0):
+        self.faces = list(faces)
+        self.rows = rows
+        self.cols = cols
+        self.foundWords = list(foundWords)
+        self.path = list(path)
+        self.typed = typed
+        self.scroll = scroll
+
+    @classmethod
+    def fromGame(cls, game):
+        """Captures the state of a BoggleGame."""
+        board = game.getBoard()
+        rows = board.getRows()
+        path = [letter.getCol() * rows + letter.getRow()
+                for letter in game.getSelectedLetters()]
+        return cls(board.getFaces(), rows, board.getCols(), game.getFoundWords(),
+                   path, game.getTypedWord(), board.getScrollPosition())
+
+    def applyTo(self, game):
+        """Restores this state into a BoggleGame (see BoggleGame.restoreState)."""
+        game.restoreState(self)
+
+    def toBytes(self):
+        """
+        Returns the snapshot as bytes.
+        >>> state = GameState('ABCDEFGHIJKLMNOP', foundWords=['FAB', 'JAB'], path=[5, 1])
+        >>> data = state.toBytes()
+        >>> len(data), GameState.fromBytes(data) == state
+        (32, True)
+        """
+        if self.rows * self.cols > 256:
+            raise ValueError("snapshots hold boards of at most 256 cells")
+        parts = [MAGIC, bytes([VERSION]),
+                 PackedBoard.fromFaces(self.faces, self.rows, self.cols).toBytes(),
+                 struct.pack('<HB', self.scroll, len(self.path)), bytes(self.path),
+                 _packString(self.typed), struct.pack('<H', len(self.foundWords))]
+        parts += [_packString(word) for word in self.foundWords]
+        return b''.join(parts)
+
+    @classmethod
+    def fromBytes(cls, data):
+        """
+        Reads a snapshot made by toBytes.  Raises ValueError if data is
+        not a snapshot or was written by a newer version.
+        >>> GameState.fromBytes(b'BGS\\x09')
+        Traceback (most recent call last):
+        ...
+        ValueError: unsupported snapshot version 9
+        >>> GameState.fromBytes(b'BGS')
+        Traceback (most recent call last):
+        ...
+        ValueError: truncated game snapshot
+        >>> data = bytearray(GameState('CATS', 2, 2, path=[0, 1]).toBytes())
+        >>> data[13] = 4            # the second clicked cell, off the board
+        >>> GameState.fromBytes(bytes(data))
+        Traceback (most recent call last):
+        ...
+        ValueError: corrupt game snapshot
+        """
+        data = memoryview(data)
+        if bytes(data[:3]) != MAGIC:
+            raise ValueError("not a game snapshot")
+        if len(data) < 4:
+            raise ValueError("truncated game snapshot")
+        if data[3] != VERSION:
+            raise ValueError("unsupported snapshot version {}".format(data[3]))
+        try:
+            rows, cols = data[4], data[5]
+            end = 6 + (rows * cols * 5 + 7) // 8
+            faces = PackedBoard.fromBytes(data[4:end]).getFaces()
+            scroll, count = struct.unpack_from('<HB', data, end)
+            end += 3
+            path = list(data[end:end + count])
+            end += count
+            typed, end = _unpackString(data, end)
+            count, = struct.unpack_from('<H', data, end)
+            end += 2
+            foundWords = []
+            for i in range(count):
+                word, end = _unpackString(data, end)
+                foundWords.append(word)
+        except (IndexError, struct.error):
+            raise ValueError("truncated game snapshot")
+        if (end != len(data) or len(path) != len(set(path))
+                or any(cell >= rows * cols for cell in path)):
+            raise ValueError("corrupt game snapshot")
+        return cls(faces, rows, cols, foundWords, path, typed, scroll)
+
+    def __eq__(self, other):
+        if not isinstance(other, GameState):
+            return NotImplemented
+        return all(getattr(self, name) == getattr(other, name) for name in self.__slots__)
+
+    def __repr__(self):
+        return "GameState({!r}, {}, {}, {}, {}, {!r}, {})".format(
+            ''.join(self.faces), self.rows, self.cols, self.foundWords,
+            self.path, self.typed, self.scroll)
+
+
+def _packString(text):
+    data = text.encode('ascii')
+    if len(data) > 255:
+        raise ValueError("word too long for a snapshot: " + text)
+    return bytes([len(data)]) + data
+
+def _unpackString(data, start):
+    """Returns (string, end) for the length prefixed string at start."""
+    end = start + 1 + data[start]
+    if end > len(data):
+        raise IndexError(end)
+    return bytes(data[start + 1:end]).decode('ascii'), end
+
+
+def saveGame(game):
+    """Returns a snapshot of a BoggleGame as bytes."""
+    return GameState.fromGame(game).toBytes()
+
+def restoreGame(game, data):
+    """Restores a snapshot made by saveGame into a BoggleGame."""
+    GameState.fromBytes(data).applyTo(game)
+
+
+if __name__ == "__main__":
+    from doctest import testmod
+    testmod()
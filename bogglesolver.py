@@ -0,0 +1,334 @@
+"""
+Finds words on a Boggle board without any graphics, by walking the
+lexicon's prefix tree while exploring paths of adjacent faces.
+Boards are lists of faces as described in boggledice.
+"""
+
+import sys
+from collections import OrderedDict
+from functools import lru_cache
+
+from bogglelexicon import END, readLexicon
+from bogglepacked import PackedBoard
+
+@lru_cache(maxsize=None)
+def neighbours(rows=4, cols=4):
+    """
+    Returns a tuple that maps every cell index (col * rows + row) to the
+    tuple of indices of the adjacent cells.
+    >>> neighbours(2, 2)
+    ((1, 2, 3), (0, 2, 3), (0, 1, 3), (0, 1, 2))
+    """
+    adjacent = []
+    for col in range(cols):
+        for row in range(rows):
+            cells = []
+            for c in range(max(col - 1, 0), min(col + 2, cols)):
+                for r in range(max(row - 1, 0), min(row + 2, rows)):
+                    if (c, r) != (col, row):
+                        cells.append(c * rows + r)
+            adjacent.append(tuple(cells))
+    return tuple(adjacent)
+
+def scoreWord(word):
+    """
+    Returns the classic Boggle score of a word.
+    >>> [scoreWord(w) for w in ['CAT', 'CATS', 'TREES', 'STREET', 'STREETS', 'QUESTION']]
+    [1, 1, 2, 3, 5, 11]
+    """
+    length = len(word)
+    if length < 3:
+        return 0
+    elif length <= 4:
+        return 1
+    elif length <= 6:
+        return length - 3
+    elif length == 7:
+        return 5
+    else:
+        return 11
+
+def solve(faces, rows=4, cols=4, lexicon=None):
+    """
+    Returns the sorted list of lexicon words that can be spelled on the
+    board by a path of adjacent faces that uses every face at most once.
+    >>> from bogglelexicon import Lexicon
+    >>> solve(['C', 'A', 'T', 'S'], 2, 2, Lexicon(['cat', 'cats', 'act', 'tact']))
+    ['ACT', 'CAT', 'CATS']
+    """
+    return sorted(solveFrom(faces, [(cell,) for cell in range(len(faces))],
+                            rows, cols, lexicon))
+
+def solveFrom(faces, starts, rows=4, cols=4, lexicon=None):
+    """
+    Returns the set of words spelled by paths that begin with one of the
+    paths of adjacent cells in starts, so a solve can be split into parts.
+    >>> from bogglelexicon import Lexicon
+    >>> sorted(solveFrom(['C', 'A', 'T', 'S'], [(0, 1)], 2, 2, Lexicon(['cat', 'act'])))
+    ['CAT']
+    """
+    if lexicon is None:
+        lexicon = readLexicon()
+    adjacent = neighbours(rows, cols)
+    faces = [face.upper() for face in faces]
+    visited = [False] * len(faces)
+    found = set()
+
+    def extend(cell, node):
+        for ch in faces[cell]:
+            node = node.get(ch)
+            if node is None:
+                return
+        if END in node:
+            found.add(node[END])
+        visited[cell] = True
+        for nxt in adjacent[cell]:
+            if not visited[nxt]:
+                extend(nxt, node)
+        visited[cell] = False
+
+    root = lexicon.getRoot()
+    for start in starts:
+        # follow the fixed part of the path, then search onwards from its end
+        node = root
+        for cell in start[:-1]:
+            for ch in faces[cell]:
+                node = node.get(ch)
+                if node is None:
+                    break
+            if node is None:
+                break
+            if END in node:
+                found.add(node[END])
+            visited[cell] = True
+        if node is not None:
+            extend(start[-1], node)
+        for cell in start[:-1]:
+            visited[cell] = False
+    return found
+
+def findPath(faces, word, rows=4, cols=4):
+    """
+    Returns a list of cell indices spelling word on the board, or None
+    if the word cannot be made from adjacent faces.
+    >>> findPath(['C', 'A', 'T', 'Qu'], 'CAT', 2, 2)
+    [0, 1, 2]
+    >>> findPath(['C', 'A', 'T', 'Qu'], 'QUAT', 2, 2)
+    [3, 1, 2]
+    >>> findPath(['C', 'A', 'T', 'Qu'], 'CAC', 2, 2) is None
+    True
+    """
+    adjacent = neighbours(rows, cols)
+    faces = [face.upper() for face in faces]
+    word = word.upper()
+    path = []
+
+    def extend(cell, start):
+        face = faces[cell]
+        if not word.startswith(face, start):
+            return False
+        path.append(cell)
+        start += len(face)
+        if start == len(word):
+            return True
+        for nxt in adjacent[cell]:
+            if nxt not in path and extend(nxt, start):
+                return True
+        path.pop()
+        return False
+
+    for cell in range(len(faces)):
+        if extend(cell, 0):
+            return path
+    return None
+
+
+class PathFinder:
+    """Tracks the paths on one board that spell a word typed letter by
+    letter, so each keystroke only extends the paths found so far instead
+    of searching the board again.  Attributes:
+       *  _faces is the list of upper case faces
+       *  _adjacent is the neighbours table of the board
+       *  _cellsByLetter maps a letter to the cells whose face starts with it
+       *  _typed is the list of letters typed so far
+       *  _frontiers is a stack holding, after each letter, the paths that
+          spell the typed letters.  A path is (cells, rest) where rest is
+          the part of the last face ("U" of "QU") still to be typed.
+    """
+
+    __slots__ = ['_faces', '_adjacent', '_cellsByLetter', '_typed', '_frontiers']
+
+    def __init__(self, faces, rows=4, cols=4):
+        self._faces = [face.upper() for face in faces]
+        self._adjacent = neighbours(rows, cols)
+        self._cellsByLetter = {}
+        for cell, face in enumerate(self._faces):
+            self._cellsByLetter.setdefault(face[:1], []).append(cell)
+        self.clear()
+
+    def clear(self):
+        """Forgets the typed word."""
+        self._typed = []
+        self._frontiers = [[((), '')]]
+
+    def typeLetter(self, letter):
+        """
+        Adds letter to the typed word.  Returns True if the word typed so
+        far can still be spelled on the board.
+        >>> finder = PathFinder(['C', 'A', 'T', 'Qu'], 2, 2)
+        >>> [finder.typeLetter(ch) for ch in 'QUA'], finder.getPath()
+        ([True, True, True], [3, 1])
+        >>> finder.typeLetter('Q'), finder.getPath()
+        (False, None)
+        >>> finder.backspace(); finder.typeLetter('T'), finder.getPath()
+        (True, [3, 1, 2])
+        """
+        letter = letter.upper()
+        frontier = []
+        for cells, rest in self._frontiers[-1]:
+            if rest:
+                if rest[0] == letter:
+                    frontier.append((cells, rest[1:]))
+            else:
+                for cell in self._cellsByLetter.get(letter, ()):
+                    if not cells or (cell in self._adjacent[cells[-1]] and cell not in cells):
+                        frontier.append((cells + (cell,), self._faces[cell][1:]))
+        self._typed.append(letter)
+        self._frontiers.append(frontier)
+        return bool(frontier)
+
+    def backspace(self):
+        """Removes the last typed letter, if any."""
+        if self._typed:
+            self._typed.pop()
+            self._frontiers.pop()
+
+    def getWord(self):
+        """Returns the word typed so far (upper case)."""
+        return ''.join(self._typed)
+
+    def getPath(self):
+        """Returns a path (list of cells) spelling exactly the typed word,
+        or None if there is none."""
+        for cells, rest in self._frontiers[-1]:
+            if cells and not rest:
+                return list(cells)
+        return None
+
+    def getPartialPath(self):
+        """Returns the longest path spelling a prefix of the typed word."""
+        for frontier in reversed(self._frontiers):
+            if frontier:
+                return list(frontier[0][0])
+        return []
+
+
+class SolveCache:
+    """A least-recently-used cache of solve results, shared between games.
+    Boards are keyed by their canonical PackedBoard, so all rotations and
+    reflections of a board share one entry.  Attributes:
+       *  _entries maps (canonical board, Lexicon version) to the word
+          set, oldest use first; entries for a replaced lexicon version
+          are never looked up again and age out
+       *  _sizes maps the same keys to the estimated bytes of each entry
+       *  _maxBytes is the memory cap; the oldest entries are evicted
+          once the estimated total goes over it
+       *  hits, misses, evictions count cache traffic
+    """
+
+    __slots__ = ['_entries', '_sizes', '_bytes', '_maxBytes', 'hits', 'misses', 'evictions']
+
+    def __init__(self, maxBytes=64 << 20):
+        self._entries = OrderedDict()
+        self._sizes = {}
+        self._bytes = 0
+        self._maxBytes = maxBytes
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def solve(self, faces, rows=4, cols=4, lexicon=None):
+        """
+        Returns the frozenset of words on the board, solving it only if
+        no symmetric image of the board is cached.
+        >>> from bogglelexicon import Lexicon
+        >>> cache = SolveCache()
+        >>> lex = Lexicon(['cat', 'tac'])
+        >>> sorted(cache.solve(['C', 'A', 'T', 'S'], 2, 2, lex))
+        ['CAT', 'TAC']
+        >>> sorted(cache.solve(['S', 'T', 'A', 'C'], 2, 2, lex))
+        ['CAT', 'TAC']
+        >>> cache.hits, cache.misses, cache.hitRate()
+        (1, 1, 0.5)
+        """
+        if lexicon is None:
+            lexicon = readLexicon()
+        # pin one version of a LiveLexicon for both the key and the solve
+        lexicon = lexicon.snapshot()
+        key = (PackedBoard.fromFaces(faces, rows, cols).canonical(), lexicon)
+        entries = self._entries
+        words = entries.get(key)
+        if words is not None:
+            self.hits += 1
+            entries.move_to_end(key)
+            return words
+        self.misses += 1
+        words = frozenset(solve(faces, rows, cols, lexicon))
+        size = _ENTRY_OVERHEAD + sys.getsizeof(words)
+        entries[key] = words
+        self._sizes[key] = size
+        self._bytes += size
+        self._evict(self._maxBytes, keep=1)
+        return words
+
+    def _evict(self, maxBytes, keep=0):
+        """Drops the least recently used entries until the estimated size
+        is at most maxBytes or only keep entries are left."""
+        while self._bytes > maxBytes and len(self._entries) > keep:
+            oldKey, oldWords = self._entries.popitem(last=False)
+            self._bytes -= self._sizes.pop(oldKey)
+            self.evictions += 1
+
+    def hitRate(self):
+        """Returns the fraction of lookups answered from the cache."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def setMaxBytes(self, maxBytes):
+        """Changes the memory cap, evicting entries if needed."""
+        self._maxBytes = maxBytes
+        self._evict(maxBytes)
+
+    def getBytes(self):
+        """Returns the estimated memory used by the cached entries."""
+        return self._bytes
+
+    def clear(self):
+        self._entries.clear()
+        self._sizes.clear()
+        self._bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+
+# estimated bytes per cache entry besides the word set itself: the key,
+# its PackedBoard, and the dict and OrderedDict links (words are shared
+# with the lexicon and cost nothing extra)
+_ENTRY_OVERHEAD = 400
+
+# the cache shared by every game in the process
+solveCache = SolveCache()
+
+def solveCached(faces, rows=4, cols=4, lexicon=None):
+    """
+    Like solve, but returns a frozenset that is shared by every caller
+    asking about the same board (or a rotation or reflection of it) and
+    lexicon.  Results are kept in solveCache.
+    """
+    return solveCache.solve(faces, rows, cols, lexicon)
+
+
+if __name__ == "__main__":
+    from doctest import testmod
+    testmod()
@@ -0,0 +1,216 @@
+"""
+An optional way of drawing the Boggle tiles.  Instead of a Rectangle and a
+Text item per tile, each tile is one canvas image showing a sprite: an
+off-screen PhotoImage of a face in one style (text and fill color),
+rendered once and shared by every tile showing that face in that style.
+Recolouring or relettering a tile then swaps which sprite its image
+shows, a single Tk call, and sprites are never redrawn.
+
+Faces are drawn with a built-in 5x7 pixel font, scaled to the tile size,
+since Tk cannot draw text into a PhotoImage itself.
+"""
+
+from graphics import *
+
+# 5x7 pixel glyphs for the letters on the dice ('u' for the u of Qu)
+GLYPHS = {
+    'A': (" ### ", "#   #", "#   #", "#####", "#   #", "#   #", "#   #"),
+    'B': ("#### ", "#   #", "#   #", "#### ", "#   #", "#   #", "#### "),
+    'C': (" ### ", "#   #", "#    ", "#    ", "#    ", "#   #", " ### "),
+    'D': ("#### ", "#   #", "#   #", "#   #", "#   #", "#   #", "#### "),
+    'E': ("#####", "#    ", "#    ", "#### ", "#    ", "#    ", "#####"),
+    'F': ("#####", "#    ", "#    ", "#### ", "#    ", "#    ", "#    "),
+    'G': (" ### ", "#   #", "#    ", "# ###", "#   #", "#   #", " ####"),
+    'H': ("#   #", "#   #", "#   #", "#####", "#   #", "#   #", "#   #"),
+    'I': (" ### ", "  #  ", "  #  ", "  #  ", "  #  ", "  #  ", " ### "),
+    'J': ("  ###", "   # ", "   # ", "   # ", "   # ", "#  # ", " ##  "),
+    'K': ("#   #", "#  # ", "# #  ", "##   ", "# #  ", "#  # ", "#   #"),
+    'L': ("#    ", "#    ", "#    ", "#    ", "#    ", "#    ", "#####"),
+    'M': ("#   #", "## ##", "# # #", "# # #", "#   #", "#   #", "#   #"),
+    'N': ("#   #", "#   #", "##  #", "# # #", "#  ##", "#   #", "#   #"),
+    'O': (" ### ", "#   #", "#   #", "#   #", "#   #", "#   #", " ### "),
+    'P': ("#### ", "#   #", "#   #", "#### ", "#    ", "#    ", "#    "),
+    'Q': (" ### ", "#   #", "#   #", "#   #", "# # #", "#  # ", " ## #"),
+    'R': ("#### ", "#   #", "#   #", "#### ", "# #  ", "#  # ", "#   #"),
+    'S': (" ####", "#    ", "#    ", " ### ", "    #", "    #", "#### "),
+    'T': ("#####", "  #  ", "  #  ", "  #  ", "  #  ", "  #  ", "  #  "),
+    'U': ("#   #", "#   #", "#   #", "#   #", "#   #", "#   #", " ### "),
+    'V': ("#   #", "#   #", "#   #", "#   #", "#   #", " # # ", "  #  "),
+    'W': ("#   #", "#   #", "#   #", "# # #", "# # #", "# # #", " # # "),
+    'X': ("#   #", "#   #", " # # ", "  #  ", " # # ", "#   #", "#   #"),
+    'Y': ("#   #", "#   #", " # # ", "  #  ", "  #  ", "  #  ", "  #  "),
+    'Z': ("#####", "    #", "   # ", "  #  ", " #   ", "#    ", "#####"),
+    'u': ("     ", "     ", "#   #", "#   #", "#   #", "#  ##", " ## #"),
+}
+
+def spriteRows(face, size, ink, paper, border="black"):
+    """
+    Returns the pixels of a size x size sprite of face as a list of rows
+    of colors: face in ink on paper, inside a one pixel border.  Glyphs
+    are scaled by whole pixels to fit the tile.
+    >>> rows = spriteRows('L', 9, 'k', '.', 'b')
+    >>> print('\\n'.join(''.join(row) for row in rows))
+    bbbbbbbbb
+    b.k.....b
+    b.k.....b
+    b.k.....b
+    b.k.....b
+    b.k.....b
+    b.k.....b
+    b.kkkkk.b
+    bbbbbbbbb
+    """
+    glyphs = [GLYPHS[ch] for ch in face if ch in GLYPHS]
+    # glyphs sit side by side with a one pixel gap
+    width = 6 * len(glyphs) - 1 if glyphs else 0
+    scale = max(1, min((size - 4) // max(width, 1), (size - 4) // 7, size // 25))
+    left = (size - width * scale) // 2
+    top = (size - 7 * scale) // 2
+
+    rows = [[paper] * size for y in range(size)]
+    for i, glyph in enumerate(glyphs):
+        for gy, line in enumerate(glyph):
+            for gx, pixel in enumerate(line):
+                if pixel == '#':
+                    x0 = left + (6 * i + gx) * scale
+                    y0 = top + gy * scale
+                    for y in range(y0, y0 + scale):
+                        rows[y][x0:x0 + scale] = [ink] * scale
+    rows[0] = [border] * size
+    rows[-1] = [border] * size
+    for row in rows:
+        row[0] = row[-1] = border
+    return rows
+
+
+class SpriteCache:
+    """The sprites for the tiles of one window.  Attributes:
+       *  _win is the GraphWin the sprites are shown in
+       *  _size is the edge of a tile (and sprite) in pixels
+       *  _sprites maps (face, text color, fill color) to its PhotoImage
+       *  _colors maps Tk color names to #rrggbb strings
+    """
+
+    __slots__ = ['_win', '_size', '_sprites', '_colors']
+
+    def __init__(self, win, size):
+        self._win = win
+        self._size = size
+        self._sprites = {}
+        self._colors = {}
+
+    def getSize(self):
+        return self._size
+
+    def getSprite(self, face, textColor, fillColor):
+        """Returns the PhotoImage of face in the given colors, rendering
+        it the first time it is asked for."""
+        key = (face, textColor, fillColor)
+        sprite = self._sprites.get(key)
+        if sprite is None:
+            sprite = self._sprites[key] = self.__render(face, textColor, fillColor)
+        return sprite
+
+    def __rgb(self, color):
+        """Returns color as #rrggbb (PhotoImage data cannot hold names
+        with spaces such as "powder blue")."""
+        rgb = self._colors.get(color)
+        if rgb is None:
+            r, g, b = self._win.winfo_rgb(color)
+            rgb = self._colors[color] = color_rgb(r >> 8, g >> 8, b >> 8)
+        return rgb
+
+    def __render(self, face, textColor, fillColor):
+        rows = spriteRows(face, self._size, self.__rgb(textColor), self.__rgb(fillColor),
+                          self.__rgb("black"))
+        sprite = tk.PhotoImage(master=self._win, width=self._size, height=self._size)
+        # one put call sets every pixel
+        sprite.put(' '.join('{' + ' '.join(row) + '}' for row in rows))
+        return sprite
+
+    def __len__(self):
+        return len(self._sprites)
+
+
+class SpriteLetter:
+    """A tile drawn as one sprite, with the interface of BoggleLetter.
+    Attributes:
+       *  _row, _col coordinates indicate its position in the grid (ints)
+       *  _letter, _textColor, _fillColor are what the tile shows
+       *  _sprites is the board's SpriteCache
+       *  _image is the graphics Image showing the current sprite
+    """
+
+    __slots__ = ['_col', '_row', '_letter', '_textColor', '_fillColor', '_sprites', '_image']
+
+    def __init__(self, board, sprites, col=-1, row=-1, letter="", color="black"):
+        size = board.getSize()
+        self._col = col
+        self._row = row
+        self._letter = letter
+        self._textColor = color
+        self._fillColor = "white"
+        self._sprites = sprites
+        center = Point(board.getXInset() + size * (col + 0.5),
+                       board.getYInset() + size * (row + 0.5))
+        self._image = Image(center, self.__sprite())
+        self._image.draw(board.getWin())
+
+    def __sprite(self):
+        return self._sprites.getSprite(self._letter, self._textColor, self._fillColor)
+
+    def __redraw(self):
+        sprite = self.__sprite()
+        if sprite is not self._image.img:
+            self._image.setImage(sprite)
+
+    def getRow(self):
+        return self._row
+
+    def getCol(self):
+        return self._col
+
+    def setLetter(self, char):
+        self._letter = str(char)
+        self.__redraw()
+
+    def getLetter(self):
+        return self._letter
+
+    def setTextColor(self, color):
+        self._textColor = color
+        self.__redraw()
+
+    def getTextColor(self):
+        return self._textColor
+
+    def setFillColor(self, color):
+        self._fillColor = color
+        self.__redraw()
+
+    def getFillColor(self):
+        return self._fillColor
+
+    def setColors(self, textColor, fillColor):
+        """Restyles the tile with one sprite swap (or none if unchanged)."""
+        self._textColor = textColor
+        self._fillColor = fillColor
+        self.__redraw()
+
+    def isAdjacent(self, other):
+        """Same rule as BoggleLetter.isAdjacent."""
+        if other is self:
+            return False
+        return abs(self._row - other._row) <= 1 and abs(self._col - other._col) <= 1
+
+    def __str__(self):
+        return "BoggleLetter({}, {}, '{}', '{}')".format(self._col, self._row, \
+                                                self._letter, self._textColor)
+
+    def __repr__(self):
+        return str(self)
+
+
+if __name__ == "__main__":
+    from doctest import testmod
+    testmod()
@@ -0,0 +1,363 @@
+"""
+Streaming statistics over many rounds of Boggle, simulated or live.  Each
+round is folded into running aggregates as it ends and then forgotten, so
+memory stays fixed however many rounds are seen:
+
+    words per board    running mean and variance of the solution sizes
+    found ratio        running mean and variance of found / available
+    scores             a histogram of player scores
+    top words          the most frequent words on boards and the most
+                       frequently found ones, from count-min sketches
+
+Aggregates made by separate worker processes are combined with merge, and
+saved to and loaded from checkpoint files so long runs can be resumed.
+"""
+
+import math
+import os
+import struct
+import sys
+from array import array
+from hashlib import blake2b
+
+from bogglesolver import scoreWord
+
+class Moments:
+    """Running count, mean and variance (Welford's method), mergeable
+    across workers with Chan's formula."""
+
+    __slots__ = ['count', 'mean', '_m2']
+
+    def __init__(self, count=0, mean=0.0, m2=0.0):
+        self.count = count
+        self.mean = mean
+        self._m2 = m2
+
+    def add(self, value):
+        """
+        Adds one value.
+        >>> m = Moments()
+        >>> for x in [2, 4, 4, 4, 5, 5, 7, 9]: m.add(x)
+        >>> m.mean, m.variance()
+        (5.0, 4.0)
+        """
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+
+    def variance(self):
+        """Returns the population variance of the values added."""
+        return self._m2 / self.count if self.count else 0.0
+
+    def merge(self, other):
+        """
+        Adds the values summarized by other.
+        >>> a, b = Moments(), Moments()
+        >>> for x in [2, 4, 4, 4]: a.add(x)
+        >>> for x in [5, 5, 7, 9]: b.add(x)
+        >>> a.merge(b).mean, a.variance()
+        (5.0, 4.0)
+        """
+        count = self.count + other.count
+        if count:
+            delta = other.mean - self.mean
+            self._m2 += other._m2 + delta * delta * self.count * other.count / count
+            self.mean += delta * other.count / count
+            self.count = count
+        return self
+
+    def __str__(self):
+        return "{:.2f} (sd {:.2f})".format(self.mean, math.sqrt(self.variance()))
+
+
+class CountMinSketch:
+    """Approximate counts of strings in depth rows of width counters.  A
+    string's count is the smallest of its counters, which never under-
+    counts and over-counts by at most about total/width.  Sketches of the
+    same shape merge by adding their counters."""
+
+    __slots__ = ['_width', '_depth', '_table', 'total']
+
+    def __init__(self, width=4096, depth=4):
+        self._width = width
+        self._depth = depth
+        self._table = array('Q', bytes(8 * width * depth))
+        self.total = 0
+
+    def __cells(self, word):
+        # one stable hash (unlike hash(), the same in every process) gives
+        # a counter in every row
+        digest = blake2b(word.encode(), digest_size=4 * self._depth).digest()
+        width = self._width
+        return [row * width + index % width
+                for row, index in enumerate(struct.unpack('<{}I'.format(self._depth), digest))]
+
+    def add(self, word, count=1):
+        table = self._table
+        for cell in self.__cells(word):
+            table[cell] += count
+        self.total += count
+
+    def estimate(self, word):
+        """
+        Returns the estimated count of word.
+        >>> sketch = CountMinSketch(64, 3)
+        >>> for word in ['CAT'] * 5 + ['DOG'] * 2: sketch.add(word)
+        >>> sketch.estimate('CAT') >= 5, sketch.estimate('DOG') >= 2
+        (True, True)
+        """
+        table = self._table
+        return min(table[cell] for cell in self.__cells(word))
+
+    def merge(self, other):
+        if (self._width, self._depth) != (other._width, other._depth):
+            raise ValueError("cannot merge sketches of different shapes")
+        table = self._table
+        for i, count in enumerate(other._table):
+            if count:
+                table[i] += count
+        self.total += other.total
+        return self
+
+
+class TopWords:
+    """The k most frequent words of a stream: a count-min sketch of every
+    word plus the k words with the highest estimates seen so far."""
+
+    __slots__ = ['_k', '_sketch', '_top', '_floor']
+
+    def __init__(self, k=20, width=4096, depth=4):
+        self._k = k
+        self._sketch = CountMinSketch(width, depth)
+        self._top = {}
+        self._floor = 0
+
+    def add(self, word, count=1):
+        self._sketch.add(word, count)
+        estimate = self._sketch.estimate(word)
+        top = self._top
+        if word in top or len(top) < self._k:
+            top[word] = estimate
+        elif estimate > self._floor:
+            smallest = min(top, key=top.get)
+            if estimate > top[smallest]:
+                del top[smallest]
+                top[word] = estimate
+            self._floor = min(top.values())
+
+    def getTop(self):
+        """
+        Returns the top words as a list of (word, estimated count), most
+        frequent first.
+        >>> top = TopWords(2)
+        >>> for word in 'A B C A B A D A C C C'.split(): top.add(word)
+        >>> top.getTop()
+        [('A', 4), ('C', 4)]
+        """
+        return sorted(self._top.items(), key=lambda item: (-item[1], item[0]))
+
+    def getTotal(self):
+        return self._sketch.total
+
+    def merge(self, other):
+        """Adds the words counted by other (made with the same k and shape)."""
+        self._sketch.merge(other._sketch)
+        candidates = set(self._top) | set(other._top)
+        estimates = sorted(((self._sketch.estimate(word), word) for word in candidates),
+                           key=lambda item: (-item[0], item[1]))[:self._k]
+        self._top = {word: estimate for estimate, word in estimates}
+        self._floor = min(self._top.values()) if len(self._top) == self._k else 0
+        return self
+
+
+class RoundStats:
+    """Aggregates over a stream of rounds.  Attributes:
+       *  boards is the Moments of the number of words per board
+       *  foundRatio is the Moments of the fraction of words a player found
+       *  scores counts player scores: scores[s] is the number of player
+          rounds that scored s, the last bin counting every higher score
+       *  boardWords, foundWords are TopWords of the words available on
+          the boards and of the words players found
+    """
+
+    __slots__ = ['boards', 'foundRatio', 'scores', 'boardWords', 'foundWords']
+
+    def __init__(self, k=20, width=4096, depth=4, maxScore=1000):
+        self.boards = Moments()
+        self.foundRatio = Moments()
+        self.scores = array('Q', bytes(8 * (maxScore + 1)))
+        self.boardWords = TopWords(k, width, depth)
+        self.foundWords = TopWords(k, width, depth)
+
+    def addSolve(self, solution):
+        """Adds a solved board: the collection of every word on it."""
+        self.boards.add(len(solution))
+        for word in solution:
+            self.boardWords.add(word)
+
+    def addPlayer(self, foundWords, solution):
+        """Adds the words one player found on a board with this solution."""
+        if solution:
+            self.foundRatio.add(len(foundWords) / len(solution))
+        score = sum(scoreWord(word) for word in foundWords)
+        self.scores[min(score, len(self.scores) - 1)] += 1
+        for word in foundWords:
+            self.foundWords.add(word)
+
+    def addRound(self, foundWords, solution):
+        """
+        Adds a one player round.
+        >>> stats = RoundStats()
+        >>> stats.addRound(['CAT'], ['CAT', 'ACT'])
+        >>> stats.addRound(['CAT', 'DOGS'], ['CAT', 'DOGS'])
+        >>> stats.boards.mean, stats.foundRatio.mean, stats.scorePercentile(0.5)
+        (2.0, 0.75, 1)
+        >>> stats.boardWords.getTop()[0], stats.foundWords.getTop()[0]
+        (('CAT', 2), ('CAT', 2))
+        """
+        self.addSolve(solution)
+        self.addPlayer(foundWords, solution)
+
+    def getPlayerRounds(self):
+        return sum(self.scores)
+
+    def scorePercentile(self, fraction):
+        """Returns the score below or at which fraction of players scored."""
+        target = fraction * self.getPlayerRounds()
+        seen = 0
+        for score, count in enumerate(self.scores):
+            seen += count
+            if count and seen >= target:
+                return score
+        return 0
+
+    def merge(self, other):
+        """Adds the rounds aggregated by other, e.g. in another worker."""
+        if len(self.scores) != len(other.scores):
+            raise ValueError("cannot merge stats with different score ranges")
+        self.boards.merge(other.boards)
+        self.foundRatio.merge(other.foundRatio)
+        for score, count in enumerate(other.scores):
+            self.scores[score] += count
+        self.boardWords.merge(other.boardWords)
+        self.foundWords.merge(other.foundWords)
+        return self
+
+    def report(self):
+        """Returns a multi-line summary of the statistics."""
+        lines = ["{} boards, {} player rounds".format(self.boards.count, self.getPlayerRounds()),
+                 "words per board {}".format(self.boards),
+                 "found ratio {}".format(self.foundRatio),
+                 "score p10 {}, p50 {}, p90 {}, p99 {}".format(
+                     *[self.scorePercentile(f) for f in (0.1, 0.5, 0.9, 0.99)])]
+        for title, top in [("most common on boards", self.boardWords),
+                           ("most often found", self.foundWords)]:
+            lines.append("{}: {}".format(title, ', '.join(
+                "{} {:.1%}".format(word, count / max(self.boards.count, 1))
+                for word, count in top.getTop()[:10])))
+        return '\n'.join(lines)
+
+    def toBytes(self):
+        """
+        Returns the aggregates as bytes, for checkpoints.
+        >>> stats = RoundStats(k=2, width=8, depth=2, maxScore=10)
+        >>> stats.addRound(['CAT'], ['CAT', 'ACT'])
+        >>> copy = RoundStats.fromBytes(stats.toBytes())
+        >>> copy.report() == stats.report(), copy.toBytes() == stats.toBytes()
+        (True, True)
+        """
+        top = self.boardWords
+        parts = [_MAGIC, struct.pack('<BIIII', _VERSION, top._k, top._sketch._width,
+                                     top._sketch._depth, len(self.scores))]
+        for moments in (self.boards, self.foundRatio):
+            parts.append(struct.pack('<Qdd', moments.count, moments.mean, moments._m2))
+        parts.append(_arrayBytes(self.scores))
+        for top in (self.boardWords, self.foundWords):
+            parts.append(struct.pack('<QH', top._sketch.total, len(top._top)))
+            parts += [bytes([len(word)]) + word.encode('ascii') for word in top._top]
+            parts.append(_arrayBytes(top._sketch._table))
+        return b''.join(parts)
+
+    @classmethod
+    def fromBytes(cls, data):
+        """
+        Reads aggregates written by toBytes; raises ValueError if data
+        is not a checkpoint of this version.
+        >>> RoundStats.fromBytes(RoundStats().toBytes()[:20])
+        Traceback (most recent call last):
+        ...
+        ValueError: truncated stats checkpoint
+        """
+        if data[:len(_MAGIC)] != _MAGIC:
+            raise ValueError("not a stats checkpoint")
+        try:
+            offset = len(_MAGIC)
+            version, k, width, depth, bins = struct.unpack_from('<BIIII', data, offset)
+            if version != _VERSION:
+                raise ValueError("unsupported stats checkpoint version {}".format(version))
+            offset += struct.calcsize('<BIIII')
+            stats = cls(k, width, depth, bins - 1)
+            for moments in (stats.boards, stats.foundRatio):
+                moments.count, moments.mean, moments._m2 = struct.unpack_from('<Qdd', data, offset)
+                offset += struct.calcsize('<Qdd')
+            offset = _readArray(stats.scores, data, offset)
+            for top in (stats.boardWords, stats.foundWords):
+                top._sketch.total, count = struct.unpack_from('<QH', data, offset)
+                offset += struct.calcsize('<QH')
+                words = []
+                for i in range(count):
+                    end = offset + 1 + data[offset]
+                    if end > len(data):
+                        raise IndexError(end)
+                    words.append(data[offset + 1:end].decode('ascii'))
+                    offset = end
+                offset = _readArray(top._sketch._table, data, offset)
+                top._top = {word: top._sketch.estimate(word) for word in words}
+                top._floor = min(top._top.values()) if len(top._top) == k else 0
+        except (IndexError, struct.error):
+            raise ValueError("truncated stats checkpoint")
+        if offset != len(data):
+            raise ValueError("corrupt stats checkpoint")
+        return stats
+
+    def save(self, fileName):
+        """Writes a checkpoint; the old one is only replaced once the new
+        one is completely written and on disk."""
+        with open(fileName + '.tmp', 'wb') as checkpoint:
+            checkpoint.write(self.toBytes())
+            checkpoint.flush()
+            os.fsync(checkpoint.fileno())
+        os.replace(fileName + '.tmp', fileName)
+
+    @classmethod
+    def load(cls, fileName):
+        with open(fileName, 'rb') as checkpoint:
+            return cls.fromBytes(checkpoint.read())
+
+
+_MAGIC = b'BST'
+_VERSION = 1
+
+def _arrayBytes(counts):
+    """Returns an array('Q') as little endian bytes."""
+    if sys.byteorder == 'big':
+        counts = array('Q', counts)
+        counts.byteswap()
+    return counts.tobytes()
+
+def _readArray(counts, data, offset):
+    """Fills an array('Q') from little endian bytes at offset; returns the
+    offset after them."""
+    end = offset + 8 * len(counts)
+    if end > len(data):
+        raise ValueError("truncated stats checkpoint")
+    counts[:] = array('Q', data[offset:end])
+    if sys.byteorder == 'big':
+        counts.byteswap()
+    return end
+
+
+if __name__ == "__main__":
+    from doctest import testmod
+    testmod()
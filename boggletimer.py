@@ -0,0 +1,82 @@
+"""
+The countdown for a timed round of Boggle.  The game loop calls tick()
+every frame; the timer only reports a new display text when the shown
+second changes, so a frame where nothing happens costs no drawing.
+"""
+
+import math
+import time
+
+# a standard round lasts three minutes
+ROUND_SECONDS = 180
+
+class RoundTimer:
+    """A round timer has the following attributes:
+       *  _seconds is the length of a round
+       *  _clock returns the current time in seconds (time.monotonic,
+          or a fake clock when testing)
+       *  _start is the clock time the round started
+       *  _shown is the text last returned by tick
+    """
+
+    __slots__ = ['_seconds', '_clock', '_start', '_shown']
+
+    def __init__(self, seconds=ROUND_SECONDS, clock=time.monotonic):
+        self._seconds = seconds
+        self._clock = clock
+        self.restart()
+
+    def getSeconds(self):
+        """Returns the length of a round."""
+        return self._seconds
+
+    def restart(self):
+        """Starts a new round now."""
+        self._start = self._clock()
+        self._shown = None
+
+    def getRemaining(self):
+        """Returns the seconds left in the round (0 once it is over)."""
+        return max(0.0, self._seconds - (self._clock() - self._start))
+
+    def isExpired(self):
+        return self.getRemaining() == 0
+
+    def getText(self):
+        """
+        Returns the time left as m:ss, rounded up to a whole second.
+        >>> now = [0.0]
+        >>> timer = RoundTimer(180, lambda: now[0])
+        >>> timer.getText()
+        '3:00'
+        >>> now[0] = 0.5; timer.getText()
+        '3:00'
+        >>> now[0] = 120.25; timer.getText()
+        '1:00'
+        """
+        left = math.ceil(self.getRemaining())
+        return '{}:{:02d}'.format(left // 60, left % 60)
+
+    def tick(self):
+        """
+        Returns the display text if it changed since the last tick, and
+        None otherwise.
+        >>> now = [0.0]
+        >>> timer = RoundTimer(2, lambda: now[0])
+        >>> timer.tick(), timer.tick()
+        ('0:02', None)
+        >>> now[0] = 1.5; timer.tick(), timer.isExpired()
+        ('0:01', False)
+        >>> now[0] = 9; timer.tick(), timer.isExpired()
+        ('0:00', True)
+        """
+        text = self.getText()
+        if text == self._shown:
+            return None
+        self._shown = text
+        return text
+
+
+if __name__ == "__main__":
+    from doctest import testmod
+    testmod()
@@ -0,0 +1,156 @@
+"""
+Keeps the words on a board up to date while single tiles change (when a
+die is rolled again).  The index remembers every path on the board that
+spells the start of a lexicon word, with the prefix tree node it reaches,
+and for every cell the paths through it.  Changing a cell then only:
+
+    retracts the paths through the cell (and the words only they spelled)
+    extends the remembered paths that end next to the cell, and the cell
+    on its own, with the new face
+
+so the work depends on the paths around the cell, not the whole board.
+"""
+
+from bogglelexicon import END, readLexicon
+from bogglesolver import neighbours
+
+class WordIndex:
+    """A word index has the following attributes:
+       *  _faces is the list of upper case faces, _rows, _cols the shape
+       *  _root is the root of the lexicon's prefix tree
+       *  _adjacent is the neighbours table of the board
+       *  _nodes maps every path (tuple of cells) spelling a prefix of a
+          word to the prefix tree node it reaches
+       *  _byCell lists, for every cell, the set of those paths through it
+       *  _endingAt lists, for every cell, the set of those paths ending
+          at it
+       *  _paths maps every word on the board to the set of paths
+          spelling it
+    """
+
+    __slots__ = ['_faces', '_rows', '_cols', '_root', '_adjacent',
+                 '_nodes', '_byCell', '_endingAt', '_paths']
+
+    def __init__(self, faces, rows=4, cols=4, lexicon=None):
+        if lexicon is None:
+            lexicon = readLexicon()
+        self._faces = [face.upper() for face in faces]
+        self._rows = rows; self._cols = cols
+        self._root = lexicon.snapshot().getRoot()
+        self._adjacent = neighbours(rows, cols)
+        self._nodes = {}
+        self._byCell = [set() for face in faces]
+        self._endingAt = [set() for face in faces]
+        self._paths = {}
+        for cell in range(len(faces)):
+            self.__extend(cell, (), self._root)
+
+    def getWords(self):
+        """Returns the set of words on the board."""
+        return set(self._paths)
+
+    def getCount(self):
+        return len(self._paths)
+
+    def __contains__(self, word):
+        return word in self._paths
+
+    def getWordsAt(self, cell):
+        """Returns the set of words with a path through cell."""
+        nodes = self._nodes
+        return {nodes[path][END] for path in self._byCell[cell] if END in nodes[path]}
+
+    def getFaces(self):
+        return list(self._faces)
+
+    def __extend(self, cell, path, node):
+        """Remembers every path that starts with path (which reaches node),
+        continues to cell and spells a prefix; returns the set of words
+        that were not on the board before."""
+        faces = self._faces
+        adjacent = self._adjacent
+        nodes = self._nodes
+        byCell = self._byCell
+        endingAt = self._endingAt
+        paths = self._paths
+        added = set()
+        cells = list(path)
+        visited = [False] * len(faces)
+        for before in path:
+            visited[before] = True
+
+        def extend(cell, node):
+            for ch in faces[cell]:
+                node = node.get(ch)
+                if node is None:
+                    return
+            cells.append(cell)
+            prefix = tuple(cells)
+            nodes[prefix] = node
+            for on in prefix:
+                byCell[on].add(prefix)
+            endingAt[cell].add(prefix)
+            if END in node:
+                word = node[END]
+                if word not in paths:
+                    paths[word] = set()
+                    added.add(word)
+                paths[word].add(prefix)
+            visited[cell] = True
+            for nxt in adjacent[cell]:
+                if not visited[nxt]:
+                    extend(nxt, node)
+            visited[cell] = False
+            cells.pop()
+
+        extend(cell, node)
+        return added
+
+    def setFace(self, cell, face):
+        """
+        Changes the face at cell and updates the words.  Returns (added,
+        removed): the sets of words now on the board that were not, and
+        of words no longer on it.
+        >>> from bogglelexicon import Lexicon
+        >>> index = WordIndex(['C', 'A', 'T', 'S'], 2, 2, Lexicon(['cat', 'cats', 'act', 'bat']))
+        >>> sorted(index.getWords()), sorted(index.getWordsAt(3))
+        (['ACT', 'CAT', 'CATS'], ['CATS'])
+        >>> added, removed = index.setFace(0, 'B')
+        >>> sorted(added), sorted(removed)
+        (['BAT'], ['ACT', 'CAT', 'CATS'])
+        """
+        # retract every path through cell
+        lost = set()
+        for path in self._byCell[cell]:
+            node = self._nodes.pop(path)
+            for on in path:
+                if on != cell:
+                    self._byCell[on].discard(path)
+            self._endingAt[path[-1]].discard(path)
+            if END in node:
+                word = node[END]
+                paths = self._paths[word]
+                paths.discard(path)
+                if not paths:
+                    del self._paths[word]
+                    lost.add(word)
+        self._byCell[cell] = set()
+        self._faces[cell] = face.upper()
+
+        # extend the paths ending next to cell (and the empty path) onto
+        # it, if the new face can follow them; they are listed first, as
+        # extending adds more such paths
+        first = self._faces[cell][0]
+        nodes = self._nodes
+        starts = [path for nxt in self._adjacent[cell] for path in self._endingAt[nxt]
+                  if first in nodes[path]]
+        added = self.__extend(cell, (), self._root)
+        for path in starts:
+            added |= self.__extend(cell, path, nodes[path])
+        # a word can lose its paths through cell and gain new ones
+        return added - lost, lost - added
+
+
+if __name__ == "__main__":
+    from doctest import testmod
+    testmod()
@@ -0,0 +1,166 @@
+"""
+The model behind the found words list beside the grid.  The list can hold
+any number of words (every solution of a large board, say) but only a
+fixed number of rows are ever shown, so the board draws a fixed pool of
+row items and asks the view which words belong in them.  Scrolling only
+moves the first visible row; the sorted, filtered order of the words is
+rebuilt only when the words, the sort order or the filter change.
+"""
+
+from bogglesolver import scoreWord
+
+# the orders the list can be shown in; None keeps the order words were added
+SORTS = {
+    'found': None,
+    'alpha': lambda word: word,
+    'length': lambda word: (-len(word), word),
+    'score': lambda word: (-scoreWord(word), word),
+}
+
+def _insortBy(items, item, key):
+    """
+    Inserts item into items, which are sorted by key, after any equal
+    items (bisect.insort only takes key from Python 3.10 on).
+    >>> words = ['ANTS', 'CAT', 'EMU']
+    >>> _insortBy(words, 'DOG', SORTS['length']); words
+    ['ANTS', 'CAT', 'DOG', 'EMU']
+    """
+    low, high = 0, len(items)
+    itemKey = key(item)
+    while low < high:
+        middle = (low + high) // 2
+        if itemKey < key(items[middle]):
+            high = middle
+        else:
+            low = middle + 1
+    items.insert(low, item)
+
+class WordListView:
+    """A word list view has the following attributes:
+       *  _words is the list of every word, in the order added
+       *  _known is the set of those words, for membership tests
+       *  _rows is the number of rows shown at once
+       *  _top is the index (in the view) of the first row shown
+       *  _sort is the name of the sort order (a key of SORTS)
+       *  _filter is the text shown words must contain ('' for all)
+       *  _view is the sorted, filtered list of words, or None when it
+          would equal _words (found order, no filter)
+    """
+
+    __slots__ = ['_words', '_known', '_rows', '_top', '_sort', '_filter', '_view']
+
+    def __init__(self, rows=15, words=()):
+        self._words = list(words)
+        self._known = set(self._words)
+        self._rows = rows
+        self._top = 0
+        self._sort = 'found'
+        self._filter = ''
+        self._view = None
+
+    def getRows(self):
+        return self._rows
+
+    def getWords(self):
+        """Returns every word in the order added."""
+        return self._words
+
+    def __contains__(self, word):
+        return word in self._known
+
+    def __shown(self):
+        return self._words if self._view is None else self._view
+
+    def __rebuild(self):
+        if self._sort == 'found' and not self._filter:
+            self._view = None
+        else:
+            view = [word for word in self._words if self._filter in word]
+            if SORTS[self._sort]:
+                view.sort(key=SORTS[self._sort])
+            self._view = view
+        self.scrollTo(self._top)
+
+    def setWords(self, words, top=0):
+        """Replaces the words and scrolls to row top."""
+        self._words = list(words)
+        self._known = set(self._words)
+        self._top = top
+        self.__rebuild()
+
+    def addWord(self, word):
+        """
+        Adds word, keeping the view in order.  In found order the view
+        scrolls to show the newest word.
+        >>> view = WordListView(2, ['CAT', 'DOG'])
+        >>> view.addWord('EMU'); view.getVisible(), view.getTop()
+        (['DOG', 'EMU'], 1)
+        >>> view.setSort('alpha'); view.addWord('ANT'); view.getVisible(), view.getTop()
+        (['CAT', 'DOG'], 1)
+        """
+        self._words.append(word)
+        self._known.add(word)
+        if self._view is None:
+            self.scrollToEnd()
+        elif self._filter in word:
+            _insortBy(self._view, word, SORTS[self._sort])
+
+    def getCount(self):
+        """Returns the number of words in the view (after filtering)."""
+        return len(self.__shown())
+
+    def setSort(self, sort):
+        """Shows the words in the order named sort (see SORTS)."""
+        if sort not in SORTS:
+            raise ValueError("unknown sort order " + repr(sort))
+        self._sort = sort
+        self.__rebuild()
+
+    def getSort(self):
+        return self._sort
+
+    def setFilter(self, text):
+        """
+        Shows only the words containing text, from the top.
+        >>> view = WordListView(3, ['CAT', 'DOG', 'CATS', 'SCAT'])
+        >>> view.setFilter('cat'); view.getVisible(), view.getCount()
+        (['CAT', 'CATS', 'SCAT'], 3)
+        """
+        self._filter = text.upper()
+        self._top = 0
+        self.__rebuild()
+
+    def getFilter(self):
+        return self._filter
+
+    def getTop(self):
+        return self._top
+
+    def scrollTo(self, top):
+        """Makes row top the first shown, as far as the view allows.
+        Returns True if the shown rows changed."""
+        top = max(0, min(top, self.getCount() - self._rows))
+        changed = top != self._top
+        self._top = top
+        return changed
+
+    def scroll(self, steps):
+        """
+        Scrolls down by steps rows (up if negative).
+        >>> view = WordListView(2, ['A', 'B', 'C'])
+        >>> view.scroll(1), view.scroll(1), view.getVisible()
+        (True, False, ['B', 'C'])
+        """
+        return self.scrollTo(self._top + steps)
+
+    def scrollToEnd(self):
+        return self.scrollTo(self.getCount())
+
+    def getVisible(self):
+        """Returns the words in the shown rows (at most getRows())."""
+        return self.__shown()[self._top:self._top + self._rows]
+
+
+if __name__ == "__main__":
+    from doctest import testmod
+    testmod()
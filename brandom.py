@@ -4,11 +4,14 @@
 Functions to create random numbers and random permutations of lists.
 """
 
+import hashlib
 import random
 
-def randomInt(start, end):
+def randomInt(start, end, rng=None):
     """
     Returns an integer i such that start <= i <= end.
+    Numbers come from rng (a random.Random) if given, and otherwise
+    from the global generator seeded by randomize.
 
     >>> 0 <= randomInt(0,1) <= 1
     True
@@ -17,21 +20,37 @@ def randomInt(start, end):
     >>> randomInt(0,0)
     0
     """
-    return random.randint(start, end)
+    return (rng or random).randint(start, end)
 
-def shuffled(seq):
+def shuffled(seq, rng=None):
     """
-    Return a new list containing the shuffled elements of seq.
+    Return a new list containing the shuffled elements of seq,
+    using rng (a random.Random) if given.
 
     >>> shuffled([]) == []
     True
     >>> set(shuffled([1,2,3])) == set([1,2,3])
     True
     """
-    mixed = seq.copy()
-    random.shuffle(mixed)
+    mixed = list(seq)
+    (rng or random).shuffle(mixed)
     return mixed
 
+def boardRandom(boardId, seed=0):
+    """
+    Returns a new random.Random whose stream depends only on seed and
+    boardId (ints).  Streams for different boards are independent, so
+    boards can be generated in any order, on any thread or process, and
+    always come out the same.
+
+    >>> boardRandom(7, 1).random() == boardRandom(7, 1).random()
+    True
+    >>> boardRandom(7, 1).random() == boardRandom(8, 1).random()
+    False
+    """
+    digest = hashlib.blake2b(b'%d:%d' % (seed, boardId), digest_size=16).digest()
+    return random.Random(int.from_bytes(digest, 'little'))
+
 
 def randomize(seed = None):
     """
@@ -162,6 +162,7 @@ __version__ = "5.0"
 #     Added Entry boxes.
 
 import time, os, sys
+from contextlib import contextmanager
 
 try:  # import as appropriate for 2.x vs. 3.x
    import tkinter as tk
@@ -179,15 +180,28 @@ class GraphicsError(Exception):
 OBJ_ALREADY_DRAWN = "Object currently drawn"
 UNSUPPORTED_METHOD = "Object doesn't support operation"
 BAD_OPTION = "Illegal option value"
+NO_DISPLAY = "No display to draw on"
 
 ##########################################################################
 # global variables and funtions
 
-_root = tk.Tk()
-_root.withdraw()
+try:
+    _root = tk.Tk()
+    _root.withdraw()
+except tk.TclError:
+    # no display: objects can still be made and measured, but not drawn
+    _root = None
 
 _update_lasttime = time.time()
 
+# Tcl procedure applying a batch of item changes (see GraphWin.batch):
+#   its arguments are a canvas and pairs of item id, option list
+_BATCH_PROC = "graphicsItemconfigBatch"
+if _root is not None:
+    _root.tk.eval("proc " + _BATCH_PROC + """ {canvas args} {
+    foreach {id options} $args { $canvas itemconfigure $id {*}$options }
+}""")
+
 def update(rate=None):
     global _update_lasttime
     if rate:
@@ -211,6 +225,8 @@ class GraphWin(tk.Canvas):
     def __init__(self, title="Graphics Window",
                  width=200, height=200, autoflush=True):
         assert type(title) == type(""), "Title must be a string"
+        if _root is None:
+            raise GraphicsError(NO_DISPLAY)
         master = tk.Toplevel(_root)
         master.protocol("WM_DELETE_WINDOW", self.close)
         tk.Canvas.__init__(self, master, width=width, height=height,
@@ -232,6 +248,9 @@ class GraphWin(tk.Canvas):
         self.closed = False
         master.lift()
         self.lastKey = ""
+        # item options changed inside a batch, by item id (None if not
+        #   batching)
+        self._pending = None
         if autoflush: _root.update()
 
     def __repr__(self):
@@ -393,6 +412,61 @@ class GraphWin(tk.Canvas):
     def delItem(self, item):
         self.items.remove(item)
 
+    @contextmanager
+    def batch(self):
+        """Holds back the option changes of drawn objects (colors, text,
+        images) made in the body of a with block, then sends them all
+        to Tk in one call.  Batches can be nested; the outermost one
+        sends the changes."""
+        if self._pending is not None:
+            yield self
+            return
+        self._pending = {}
+        failed = True
+        try:
+            yield self
+            failed = False
+        finally:
+            pending = self._pending
+            self._pending = None
+            if pending and not self.closed:
+                args = []
+                for id, options in pending.items():
+                    args.append(id)
+                    args.append(tuple(part for option, value in options.items()
+                                      for part in ("-" + option, value)))
+                try:
+                    self._itemconfigBatch(args)
+                    self.__autoflush()
+                except tk.TclError:
+                    # never hide the error that ended the body
+                    if not failed:
+                        raise
+
+    def isBatching(self):
+        """Returns True inside a batch (see batch)."""
+        return self._pending is not None
+
+    def _itemconfigBatch(self, args):
+        # one round trip to Tcl for every change in a batch
+        self.tk.call(_BATCH_PROC, self._w, *args)
+
+    def _itemconfig(self, id, options):
+        """Changes the options of item id now, or at the end of the
+        current batch."""
+        if self._pending is None:
+            self.itemconfig(id, options)
+            self.__autoflush()
+        else:
+            self._pending.setdefault(id, {}).update(options)
+
+    def _deleteItem(self, id):
+        """Deletes the item id, dropping any changes to it held back
+        by a batch"""
+        self.delete(id)
+        if self._pending:
+            self._pending.pop(id, None)
+
     def redraw(self):
         for item in self.items[:]:
             item.undraw()
@@ -404,6 +478,8 @@ class Transform:
 
     """Internal class for 2-D coordinate transformations"""
 
+    __slots__ = ["xbase", "ybase", "xscale", "yscale"]
+
     def __init__(self, w, h, xlow, ylow, xhigh, yhigh):
         # w, h are width and height of window
         # (xlow,ylow) coordinates of lower-left [raw (0,h-1)]
@@ -444,6 +520,9 @@ class GraphicsObject:
     # A subclass of GraphicsObject should override _draw and
     #   and _move methods.
 
+    # slots keep the many small objects (Points especially) compact
+    __slots__ = ["canvas", "id", "config"]
+
     def __init__(self, options):
         # options is a list of strings indicating which options are
         # legal for this object.
@@ -496,7 +575,7 @@ class GraphicsObject:
 
         if not self.canvas: return
         if not self.canvas.isClosed():
-            self.canvas.delete(self.id)
+            self.canvas._deleteItem(self.id)
             self.canvas.delItem(self)
             if self.canvas.autoflush:
                 _root.update()
@@ -532,9 +611,7 @@ class GraphicsObject:
         options = self.config
         options[option] = setting
         if self.canvas and not self.canvas.isClosed():
-            self.canvas.itemconfig(self.id, options)
-            if self.canvas.autoflush:
-                _root.update()
+            self.canvas._itemconfig(self.id, {option: setting})
 
 
     def _draw(self, canvas, options):
@@ -548,19 +625,39 @@ class GraphicsObject:
         pass # must override in subclass
 
 
+# Default configuration shared by all Points until one is reconfigured,
+#   so creating a Point (e.g. for every mouse click) allocates no dict
+_POINT_CONFIG = {"outline": DEFAULT_CONFIG["outline"], "fill": DEFAULT_CONFIG["fill"]}
+
 class Point(GraphicsObject):
+
+    __slots__ = ["x", "y"]
+
     def __init__(self, x, y):
-        GraphicsObject.__init__(self, ["outline", "fill"])
-        self.setFill = self.setOutline
+        self.canvas = None
+        self.id = None
+        self.config = _POINT_CONFIG
         self.x = float(x)
         self.y = float(y)
 
+    def setFill(self, color):
+        self.setOutline(color)
+
+    def _reconfig(self, option, setting):
+        # copy the shared default configuration before changing it
+        if self.config is _POINT_CONFIG:
+            self.config = _POINT_CONFIG.copy()
+        GraphicsObject._reconfig(self, option, setting)
+
     def __repr__(self):
         return "Point({}, {})".format(self.x, self.y)
 
-    def _draw(self, canvas, options):
+    def _coords(self, canvas):
         x,y = canvas.toScreen(self.x,self.y)
-        return canvas.create_rectangle(x,y,x+1,y+1,options)
+        return x,y,x+1,y+1
+
+    def _draw(self, canvas, options):
+        return canvas.create_rectangle(*self._coords(canvas), options)
 
     def _move(self, dx, dy):
         self.x = self.x + dx
@@ -568,7 +665,8 @@ class Point(GraphicsObject):
 
     def clone(self):
         other = Point(self.x,self.y)
-        other.config = self.config.copy()
+        if self.config is not _POINT_CONFIG:
+            other.config = self.config.copy()
         return other
 
     def getX(self): return self.x
@@ -578,6 +676,8 @@ class _BBox(GraphicsObject):
     # Internal base class for objects represented by bounding box
     # (opposite corners) Line segment is a degenerate case.
 
+    __slots__ = ["p1", "p2"]
+
     def __init__(self, p1, p2, options=["outline","width","fill"]):
         GraphicsObject.__init__(self, options)
         self.p1 = p1.clone()
@@ -593,6 +693,19 @@ class _BBox(GraphicsObject):
 
     def getP2(self): return self.p2.clone()
 
+    def _coords(self, canvas):
+        p1 = self.p1
+        p2 = self.p2
+        x1,y1 = canvas.toScreen(p1.x,p1.y)
+        x2,y2 = canvas.toScreen(p2.x,p2.y)
+        return x1,y1,x2,y2
+
+    def _bounds(self):
+        # Internal: (x1, y1, x2, y2) of the corners without cloning Points
+        p1 = self.p1
+        p2 = self.p2
+        return p1.x, p1.y, p2.x, p2.y
+
     def getCenter(self):
         p1 = self.p1
         p2 = self.p2
@@ -601,6 +714,8 @@ class _BBox(GraphicsObject):
 
 class Rectangle(_BBox):
 
+    __slots__ = []
+
     def __init__(self, p1, p2, color=""):
         _BBox.__init__(self, p1, p2)  
         if color != "":
@@ -610,11 +725,7 @@ class Rectangle(_BBox):
         return "Rectangle({}, {})".format(str(self.p1), str(self.p2))
 
     def _draw(self, canvas, options):
-        p1 = self.p1
-        p2 = self.p2
-        x1,y1 = canvas.toScreen(p1.x,p1.y)
-        x2,y2 = canvas.toScreen(p2.x,p2.y)
-        return canvas.create_rectangle(x1,y1,x2,y2,options)
+        return canvas.create_rectangle(*self._coords(canvas), options)
 
     def clone(self):
         other = Rectangle(self.p1, self.p2)
@@ -629,6 +740,8 @@ class Rectangle(_BBox):
 
 class Oval(_BBox):
 
+    __slots__ = []
+
     def __init__(self, p1, p2):
         _BBox.__init__(self, p1, p2)
 
@@ -642,14 +755,12 @@ class Oval(_BBox):
         return other
 
     def _draw(self, canvas, options):
-        p1 = self.p1
-        p2 = self.p2
-        x1,y1 = canvas.toScreen(p1.x,p1.y)
-        x2,y2 = canvas.toScreen(p2.x,p2.y)
-        return canvas.create_oval(x1,y1,x2,y2,options)
+        return canvas.create_oval(*self._coords(canvas), options)
 
 class Circle(Oval):
 
+    __slots__ = ["radius"]
+
     def __init__(self, center, radius):
         p1 = Point(center.x-radius, center.y-radius)
         p2 = Point(center.x+radius, center.y+radius)
@@ -670,10 +781,14 @@ class Circle(Oval):
 
 class Line(_BBox):
 
+    __slots__ = []
+
     def __init__(self, p1, p2):
         _BBox.__init__(self, p1, p2, ["arrow","fill","width"])
         self.setFill(DEFAULT_CONFIG['outline'])
-        self.setOutline = self.setFill
+
+    def setOutline(self, color):
+        self.setFill(color)
 
     def __repr__(self):
         return "Line({}, {})".format(str(self.p1), str(self.p2))
@@ -684,11 +799,7 @@ class Line(_BBox):
         return other
 
     def _draw(self, canvas, options):
-        p1 = self.p1
-        p2 = self.p2
-        x1,y1 = canvas.toScreen(p1.x,p1.y)
-        x2,y2 = canvas.toScreen(p2.x,p2.y)
-        return canvas.create_line(x1,y1,x2,y2,options)
+        return canvas.create_line(*self._coords(canvas), options)
 
     def setArrow(self, option):
         if not option in ["first","last","both","none"]:
@@ -698,6 +809,8 @@ class Line(_BBox):
 
 class Polygon(GraphicsObject):
 
+    __slots__ = ["points"]
+
     def __init__(self, *points):
         # if points passed as a list, extract it
         if len(points) == 1 and type(points[0]) == type([]):
@@ -720,31 +833,39 @@ class Polygon(GraphicsObject):
         for p in self.points:
             p.move(dx,dy)
 
-    def _draw(self, canvas, options):
-        args = [canvas]
+    def _coords(self, canvas):
+        coords = []
         for p in self.points:
             x,y = canvas.toScreen(p.x,p.y)
-            args.append(x)
-            args.append(y)
-        args.append(options)
-        return GraphWin.create_polygon(*args)
+            coords.append(x)
+            coords.append(y)
+        return coords
+
+    def _draw(self, canvas, options):
+        return GraphWin.create_polygon(canvas, *self._coords(canvas), options)
 
 class Text(GraphicsObject):
 
+    __slots__ = ["anchor"]
+
     def __init__(self, p, text):
         GraphicsObject.__init__(self, ["justify","fill","text","font"])
         self.setText(text)
         self.anchor = p.clone()
         self.setFill(DEFAULT_CONFIG['outline'])
-        self.setOutline = self.setFill
+
+    def setOutline(self, color):
+        self.setFill(color)
 
     def __repr__(self):
         return "Text({}, '{}')".format(self.anchor, self.getText())
 
-    def _draw(self, canvas, options):
+    def _coords(self, canvas):
         p = self.anchor
-        x,y = canvas.toScreen(p.x,p.y)
-        return canvas.create_text(x,y,options)
+        return canvas.toScreen(p.x,p.y)
+
+    def _draw(self, canvas, options):
+        return canvas.create_text(*self._coords(canvas), options)
 
     def _move(self, dx, dy):
         self.anchor.move(dx,dy)
@@ -793,6 +914,8 @@ class Text(GraphicsObject):
 
 class Entry(GraphicsObject):
 
+    __slots__ = ["anchor", "width", "text", "fill", "color", "font", "entry"]
+
     def __init__(self, p, width):
         GraphicsObject.__init__(self, [])
         self.anchor = p.clone()
@@ -884,6 +1007,8 @@ class Entry(GraphicsObject):
 
 class Image(GraphicsObject):
 
+    __slots__ = ["anchor", "imageId", "img"]
+
     idCount = 0
     imageCache = {} # tk photoimages go here to avoid GC while drawn
 
@@ -892,7 +1017,9 @@ class Image(GraphicsObject):
         self.anchor = p.clone()
         self.imageId = Image.idCount
         Image.idCount = Image.idCount + 1
-        if len(pixmap) == 1: # file name provided
+        if len(pixmap) == 1 and isinstance(pixmap[0], tk.PhotoImage):
+            self.img = pixmap[0] # an image already made, shown as it is
+        elif len(pixmap) == 1: # file name provided
             self.img = tk.PhotoImage(file=pixmap[0], master=_root)
         else: # width and height provided
             width, height = pixmap
@@ -901,11 +1028,16 @@ class Image(GraphicsObject):
     def __repr__(self):
         return "Image({}, {}, {})".format(self.anchor, self.getWidth(), self.getHeight())
 
-    def _draw(self, canvas, options):
+    def _coords(self, canvas):
         p = self.anchor
-        x,y = canvas.toScreen(p.x,p.y)
+        return canvas.toScreen(p.x,p.y)
+
+    def draw(self, graphwin):
         self.imageCache[self.imageId] = self.img # save a reference
-        return canvas.create_image(x,y,image=self.img)
+        return GraphicsObject.draw(self, graphwin)
+
+    def _draw(self, canvas, options):
+        return canvas.create_image(*self._coords(canvas), image=self.img)
 
     def _move(self, dx, dy):
         self.anchor.move(dx,dy)
@@ -920,6 +1052,14 @@ class Image(GraphicsObject):
     def getAnchor(self):
         return self.anchor.clone()
 
+    def setImage(self, img):
+        """Shows the tk PhotoImage img instead of the current one.  The
+        image is shared, not copied, so many Images can show one img."""
+        self.img = img
+        if self.canvas and not self.canvas.isClosed():
+            self.imageCache[self.imageId] = img
+            self.canvas._itemconfig(self.id, {"image": img})
+
     def clone(self):
         other = Image(Point(0,0), 0, 0)
         other.img = self.img.copy()
@@ -1020,7 +1160,8 @@ def test():
 #tk.Toplevel(_root).destroy()
 
 # MacOS fix 1
-update()
+if _root is not None:
+    update()
 
 if __name__ == "__main__":
     test()
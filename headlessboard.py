@@ -0,0 +1,254 @@
+"""
+A stand-in for BoggleBoard that keeps the same state (letters, colors,
+text areas, found words) and the same click geometry as the graphical
+board, but never touches Tk.  BoggleGame can be driven with it to replay
+or simulate games far faster than real time.
+"""
+
+from contextlib import nullcontext
+
+from boggledice import CUBES, rollDie, shakeDice
+from bogglehitmap import HitMap, EXIT, RESET, GRID
+from bogglewordlist import WordListView
+
+class HeadlessPoint:
+    """A window location with the getX/getY interface of graphics.Point."""
+
+    __slots__ = ['_x', '_y']
+
+    def __init__(self, x, y):
+        self._x = float(x)
+        self._y = float(y)
+
+    def getX(self):
+        return self._x
+
+    def getY(self):
+        return self._y
+
+    def __repr__(self):
+        return "HeadlessPoint({}, {})".format(self._x, self._y)
+
+
+class HeadlessLetter:
+    """The state of one BoggleLetter: its grid position, letter and colors."""
+
+    __slots__ = ['_col', '_row', '_letter', '_textColor', '_fillColor']
+
+    def __init__(self, col=-1, row=-1, letter="", color="black"):
+        self._col = col
+        self._row = row
+        self._letter = letter
+        self._textColor = color
+        self._fillColor = "white"
+
+    def getRow(self):
+        return self._row
+
+    def getCol(self):
+        return self._col
+
+    def setLetter(self, char):
+        self._letter = str(char)
+
+    def getLetter(self):
+        return self._letter
+
+    def setTextColor(self, color):
+        self._textColor = color
+
+    def getTextColor(self):
+        return self._textColor
+
+    def setFillColor(self, color):
+        self._fillColor = color
+
+    def getFillColor(self):
+        return self._fillColor
+
+    def setColors(self, textColor, fillColor):
+        self._textColor = textColor
+        self._fillColor = fillColor
+
+    def isAdjacent(self, other):
+        """Same rule as BoggleLetter.isAdjacent."""
+        if other is self:
+            return False
+        return abs(self._row - other._row) <= 1 and abs(self._col - other._col) <= 1
+
+    def __str__(self):
+        return "BoggleLetter({}, {}, '{}', '{}')".format(self._col, self._row, \
+                                                self._letter, self._textColor)
+
+    def __repr__(self):
+        return str(self)
+
+
+class HeadlessBoard:
+    """Mirrors the attributes of Board/BoggleBoard that affect game play.
+    The buttons sit at the same fixed rectangles as Board.__drawButtons."""
+
+    __slots__ = ['_xInset', '_yInset', '_rows', '_cols', '_size', '_grid', '_cubes', '_dice',
+                 '_wordList', '_lowerWord', '_upperWord', '_hitMap']
+
+    _resetRect = (50, 300, 150, 350)
+    _exitRect = (170, 300, 250, 350)
+
+    def __init__(self, xInset=50, yInset=50, rows=4, cols=4, size=50, cubes=CUBES, rng=None):
+        self._xInset = xInset; self._yInset = yInset
+        self._rows = rows; self._cols = cols
+        self._size = size
+        self._cubes = cubes
+        self._dice = None
+        self._wordList = WordListView(15)
+        self._lowerWord = self._upperWord = ''
+        self._grid = [[HeadlessLetter(col, row) for row in range(rows)]
+                      for col in range(cols)]
+        self._hitMap = HitMap.forBoard(xInset, yInset, rows, cols, size,
+                                       self._resetRect, self._exitRect)
+        self.shakeCubes(rng)
+
+    def getXInset(self):
+        return self._xInset
+
+    def getYInset(self):
+        return self._yInset
+
+    def getRows(self):
+        return self._rows
+
+    def getCols(self):
+        return self._cols
+
+    def getSize(self):
+        return self._size
+
+    def getPosition(self, point):
+        """Same as Board.getPosition."""
+        pX = point.getX()
+        pY = point.getY()
+        row = -1 if pY < self._yInset else int((pY - self._yInset) / self._size)
+        col = -1 if pX < self._xInset else int((pX - self._xInset) / self._size)
+        return (col, row)
+
+    def hitTest(self, point):
+        """Same as Board.hitTest."""
+        return self._hitMap.lookup(point.getX(), point.getY())
+
+    def inGrid(self, point):
+        return self.hitTest(point)[0] == GRID
+
+    def inExit(self, point):
+        return self.hitTest(point)[0] == EXIT
+
+    def inReset(self, point):
+        return self.hitTest(point)[0] == RESET
+
+    def getStringFromTextArea(self):
+        return '\n'.join(self._wordList.getVisible())
+
+    def setStringToTextArea(self, text):
+        self._wordList.setWords(text.split('\n') if text else [])
+
+    def getWordList(self):
+        return self._wordList
+
+    def scrollWords(self, steps):
+        self._wordList.scroll(steps)
+
+    def scrollWordsUp(self):
+        self.scrollWords(-1)
+
+    def scrollWordsDown(self):
+        self.scrollWords(1)
+
+    def setWordSort(self, sort):
+        self._wordList.setSort(sort)
+
+    def setWordFilter(self, text):
+        self._wordList.setFilter(text)
+
+    def getStringFromLowerText(self):
+        return self._lowerWord
+
+    def setStringToLowerText(self, text):
+        self._lowerWord = text
+
+    def getStringFromUpperText(self):
+        return self._upperWord
+
+    def setStringToUpperText(self, text):
+        self._upperWord = text
+
+    def addFoundWord(self, word):
+        """Same bookkeeping as BoggleBoard.addFoundWord."""
+        if word not in self._wordList:
+            self._wordList.addWord(word)
+
+    def getFoundWords(self):
+        return self._wordList.getWords()
+
+    def getScrollPosition(self):
+        return self._wordList.getTop()
+
+    def setFoundWords(self, words, scrollPosition=0):
+        self._wordList.setWords(words, scrollPosition)
+
+    def batch(self):
+        """Nothing is drawn, so there is nothing to batch."""
+        return nullcontext(self)
+
+    def getBoggleLetterAtPoint(self, point):
+        region, position = self.hitTest(point)
+        if region == GRID:
+            return self._grid[position[0]][position[1]]
+        else:
+            return None
+
+    def getBoggleLetter(self, col, row):
+        return self._grid[col][row]
+
+    def getFaces(self):
+        """Returns the faces on the board, column by column."""
+        return [letter.getLetter() for column in self._grid for letter in column]
+
+    def getCubes(self):
+        return self._cubes
+
+    def getDice(self):
+        return self._dice
+
+    def resetColors(self):
+        for column in self._grid:
+            for letter in column:
+                letter.setColors('black', 'white')
+
+    def reset(self, rng=None):
+        """Same as BoggleBoard.reset."""
+        self.resetColors()
+        self._wordList.setWords([])
+        self._upperWord = self._lowerWord = ''
+        self.shakeCubes(rng)
+
+    def setFaces(self, faces):
+        """Same as BoggleBoard.setFaces."""
+        self._dice = None
+        x = 0
+        for col in range(self._cols):
+            for row in range(self._rows):
+                self._grid[col][row].setLetter(faces[x])
+                x += 1
+
+    def shakeCubes(self, rng=None):
+        """Makes the same random calls as BoggleBoard.shakeCubes."""
+        dice, faces = shakeDice(self._cubes, rng)
+        self.setFaces(faces)
+        self._dice = dice
+
+    def rerollDie(self, col, row, rng=None):
+        """Same as BoggleBoard.rerollDie."""
+        if self._dice is None:
+            return None
+        face = rollDie(self._cubes[self._dice[col * self._rows + row]], rng)
+        self._grid[col][row].setLetter(face)
+        return face